@@ -0,0 +1,51 @@
+"""Throughput benchmark for the compiled CIP-0108/CIP-0136 rule engine.
+
+Validates every document in the rationale archive (parsed once up front)
+repeatedly and reports documents per second, so the JSON parsing cost is
+excluded and only the rule engine is measured.
+
+Usage:
+    uv run python benchmarks/bench_rationale_validator.py [--archive rationales] [--seconds 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Ensure the project root is on the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.archive.layout import RATIONALES_DIR, iter_keys, key_kind, key_path
+from bot.rationale_validator import check_cc_vote_rationale, check_gov_action_rationale
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", type=Path, default=RATIONALES_DIR, help="archive directory")
+    parser.add_argument("--seconds", type=float, default=2.0, help="minimum measuring time (default: 2)")
+    args = parser.parse_args()
+
+    docs = []
+    for key in iter_keys(args.archive):
+        check = check_cc_vote_rationale if key_kind(key) == "cc_vote" else check_gov_action_rationale
+        docs.append((check, json.loads(key_path(args.archive, key).read_bytes())))
+    if not docs:
+        sys.exit(f"No documents found in {args.archive}")
+
+    validated = findings = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < args.seconds:
+        for check, doc in docs:
+            findings += len(check(doc))
+        validated += len(docs)
+
+    print(f"{validated} documents in {elapsed:.2f}s — {validated / elapsed:,.0f} docs/s ({len(docs)} unique)")
+    print(f"{findings / validated:.2f} findings per document")
+
+
+if __name__ == "__main__":
+    main()
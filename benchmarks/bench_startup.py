@@ -0,0 +1,115 @@
+"""Measure cold-start import time of the app with ``python -X importtime``.
+
+Imports ``bot.main`` (or ``--module``) in fresh interpreters, parses the
+importtime log and reports the median over ``--runs``: the total, the
+cumulative time of each ``bot.*`` module and the self time summed per
+top-level package (``fastapi``, ``pydantic``, ...). It also lists which of
+the dependencies that :mod:`bot.lazy` defers were imported anyway, which
+should be none.
+
+Usage:
+    uv run python benchmarks/bench_startup.py [--runs 7] [--top 15] [--output startup.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Dependencies bound with bot.lazy.lazy_import; none should be imported at startup.
+DEFERRED = ("xdk", "google.cloud.firestore", "psycopg", "requests", "tenacity", "pyld", "paramiko")
+
+_PROBE = "import sys, {module}; print(','.join(m for m in {deferred!r} if m in sys.modules))"
+
+
+def parse_importtime(log: str) -> list[tuple[str, int, int, int]]:
+    """``(module, depth, self_us, cumulative_us)`` per line of an ``-X importtime`` log."""
+    rows = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_once(module: str) -> tuple[list[tuple[str, int, int, int]], list[str]]:
+    env = {**os.environ, "DB_SYNC_URL": os.environ.get("DB_SYNC_URL", "postgresql://localhost/startup-bench")}
+    env.setdefault("LOG_LEVEL", "ERROR")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, deferred=DEFERRED)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return parse_importtime(result.stderr), loaded
+
+
+def _median_ms(values: list[int]) -> float:
+    return round(statistics.median(values) / 1000, 2)
+
+
+def summarise(runs: list[list[tuple[str, int, int, int]]], module: str) -> dict:
+    totals, bot_modules, packages = [], defaultdict(list), defaultdict(list)
+    for rows in runs:
+        per_package: dict[str, int] = defaultdict(int)
+        for name, depth, self_us, cumulative_us in rows:
+            if name == module and depth == 0:
+                totals.append(cumulative_us)
+            if name.startswith("bot."):
+                bot_modules[name].append(cumulative_us)
+            per_package[name.partition(".")[0]] += self_us
+        for package, us in per_package.items():
+            packages[package].append(us)
+    return {
+        "module": module,
+        "runs": len(runs),
+        "total_ms": _median_ms(totals),
+        "bot_modules_ms": dict(sorted(((k, _median_ms(v)) for k, v in bot_modules.items()), key=lambda kv: -kv[1])),
+        "packages_ms": dict(sorted(((k, _median_ms(v)) for k, v in packages.items()), key=lambda kv: -kv[1])),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="bot.main", help="module to import (default: bot.main)")
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters to sample (default: 7)")
+    parser.add_argument("--top", type=int, default=15, help="packages to list (default: 15)")
+    parser.add_argument("--output", type=Path, help="write the full report as JSON")
+    args = parser.parse_args()
+
+    runs, loaded = [], set()
+    for _ in range(args.runs):
+        rows, deferred_loaded = run_once(args.module)
+        runs.append(rows)
+        loaded.update(deferred_loaded)
+    report = summarise(runs, args.module)
+    report["deferred_loaded"] = sorted(loaded)
+
+    print(f"import {args.module}: {report['total_ms']:.1f} ms (median of {args.runs})")
+    print(f"{'package (self time)':<32}{'ms':>9}")
+    for name, value in list(report["packages_ms"].items())[: args.top]:
+        print(f"{name:<32}{value:>9.2f}")
+    print(f"{'bot module (cumulative)':<32}{'ms':>9}")
+    for name, value in report["bot_modules_ms"].items():
+        print(f"{name:<32}{value:>9.2f}")
+    print(f"deferred dependencies imported at startup: {', '.join(report['deferred_loaded']) or 'none'}")
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
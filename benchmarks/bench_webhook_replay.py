@@ -0,0 +1,586 @@
+"""Replay signed Blockfrost webhooks against the FastAPI app with local stand-ins.
+
+Builds a deterministic chain of synthetic blocks from the rationale archive
+(each gov action and CC vote in the archive lands in some block), then posts
+one signed webhook per block to ``bot.main.app`` at a fixed rate and reports
+throughput, end-to-end latency and p50/p95/p99 per pipeline stage (taken
+from the ``bot.tracing`` spans).
+
+External services are replaced locally:
+
+- DB-Sync: a Postgres database seeded with DB-Sync-shaped tables
+  (``seed --db-url``), or an in-memory stand-in when ``--db-url`` is omitted.
+- IPFS: an HTTP server serving the archived documents.
+- X: an HTTP server speaking the ``POST /2/tweets`` API, used through the
+  real ``xdk`` client.
+- Firestore: an in-memory document store.
+
+Usage:
+    uv run python benchmarks/bench_webhook_replay.py seed --db-url postgresql://localhost/replay [--reset]
+    uv run python benchmarks/bench_webhook_replay.py run [--db-url ...] [--blocks 200] [--rate 20]
+        [--ipfs-latency 0.05] [--x-latency 0.1] [--firestore-latency 0.01] [--output report.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Ensure the project root is on the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep per-item pipeline warnings out of the report (read when bot.config is first imported).
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from bot.archive.layout import RATIONALES_DIR, iter_keys, key_path  # noqa: E402
+
+WEBHOOK_SECRET = "replay-secret"
+FIRST_BLOCK_NO = 10_000_000
+EPOCH_NO = 500
+VOTES = ("Yes", "No", "Abstain")
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def _hash(*parts) -> str:
+    return hashlib.blake2b("/".join(map(str, parts)).encode(), digest_size=32).hexdigest()
+
+
+@dataclass
+class FixtureAction:
+    key: str
+    tx_hash: str
+    index: int
+
+
+@dataclass
+class FixtureVote:
+    key: str
+    ga_tx_hash: str
+    ga_index: int
+    voter_hash: str
+    vote: str
+    vote_tx_hash: str
+
+
+@dataclass
+class FixtureBlock:
+    block_no: int
+    hash: str
+    previous_hash: str
+    actions: list[FixtureAction] = field(default_factory=list)
+    votes: list[FixtureVote] = field(default_factory=list)
+
+    def payload(self) -> dict:
+        return {
+            "type": "block",
+            "payload": {
+                "height": self.block_no,
+                "hash": self.hash,
+                "epoch": EPOCH_NO,
+                "previous_block": self.previous_hash,
+            },
+        }
+
+
+def build_fixtures(archive: Path, blocks: int, documents: int | None = None) -> list[FixtureBlock]:
+    """Spread the archived actions and CC votes (the first ``documents``) over ``blocks`` consecutive blocks.
+
+    Actions are placed in the first half of the chain and votes after them, so
+    votes usually find their action's tweet to quote.
+    """
+    actions, votes = [], []
+    for key in itertools.islice(iter_keys(archive), documents):
+        action_key, _, voter = key.partition("/")
+        tx_hash, _, index = action_key.rpartition("_")
+        if voter:
+            i = len(votes)
+            votes.append(FixtureVote(key, tx_hash, int(index), voter, VOTES[i % 3], _hash("vote", key)))
+        else:
+            actions.append(FixtureAction(key, tx_hash, int(index)))
+
+    chain = []
+    previous = _hash("block", FIRST_BLOCK_NO - 1)
+    for i in range(blocks):
+        block_hash = _hash("block", FIRST_BLOCK_NO + i)
+        chain.append(FixtureBlock(FIRST_BLOCK_NO + i, block_hash, previous))
+        previous = block_hash
+
+    half = max(blocks // 2, 1)
+    for i, action in enumerate(actions):
+        chain[i * half // max(len(actions), 1)].actions.append(action)
+    for i, vote in enumerate(votes):
+        chain[min(half + i * (blocks - half) // max(len(votes), 1), blocks - 1)].votes.append(vote)
+    return chain
+
+
+# ---------------------------------------------------------------------------
+# DB-Sync: Postgres seeding and an in-memory stand-in
+# ---------------------------------------------------------------------------
+
+# The subset of the DB-Sync schema read by bot.db.queries.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS block (
+    id bigint PRIMARY KEY, hash bytea NOT NULL, block_no integer, epoch_no integer, previous_id bigint
+);
+CREATE TABLE IF NOT EXISTS tx (
+    id bigint PRIMARY KEY, hash bytea NOT NULL, block_id bigint NOT NULL, treasury_donation numeric NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS voting_anchor (id bigint PRIMARY KEY, url varchar NOT NULL);
+CREATE TABLE IF NOT EXISTS gov_action_proposal (
+    id bigint PRIMARY KEY, tx_id bigint NOT NULL, index bigint NOT NULL, type varchar NOT NULL,
+    voting_anchor_id bigint
+);
+CREATE TABLE IF NOT EXISTS committee_hash (id bigint PRIMARY KEY, raw bytea NOT NULL);
+CREATE TABLE IF NOT EXISTS committee_registration (
+    id bigint PRIMARY KEY, hot_key_id bigint NOT NULL, cold_key_id bigint NOT NULL
+);
+CREATE TABLE IF NOT EXISTS committee_member (
+    id bigint PRIMARY KEY, committee_id bigint NOT NULL, committee_hash_id bigint NOT NULL, expiration_epoch integer
+);
+CREATE TABLE IF NOT EXISTS epoch_state (id bigint PRIMARY KEY, committee_id bigint, epoch_no integer NOT NULL);
+CREATE TABLE IF NOT EXISTS voting_procedure (
+    id bigint PRIMARY KEY, tx_id bigint NOT NULL, gov_action_proposal_id bigint NOT NULL, voter_role varchar NOT NULL,
+    committee_voter bigint, vote varchar NOT NULL, voting_anchor_id bigint
+);
+CREATE INDEX IF NOT EXISTS idx_block_block_no ON block (block_no);
+CREATE INDEX IF NOT EXISTS idx_block_hash ON block (hash);
+CREATE INDEX IF NOT EXISTS idx_tx_block_id ON tx (block_id);
+CREATE INDEX IF NOT EXISTS idx_gap_tx_id ON gov_action_proposal (tx_id);
+CREATE INDEX IF NOT EXISTS idx_vp_tx_id ON voting_procedure (tx_id);
+CREATE INDEX IF NOT EXISTS idx_vp_gap_id ON voting_procedure (gov_action_proposal_id);
+"""
+
+_TABLES = (
+    "block",
+    "tx",
+    "voting_anchor",
+    "gov_action_proposal",
+    "committee_hash",
+    "committee_registration",
+    "committee_member",
+    "epoch_state",
+    "voting_procedure",
+)
+
+
+def seed_rows(chain: list[FixtureBlock]) -> dict[str, list[tuple]]:
+    """DB-Sync-shaped rows for ``chain`` (hashes as hex; the SQL decodes them)."""
+    rows: dict[str, list[tuple]] = {table: [] for table in _TABLES}
+    ids = itertools.count(1)
+    gap_ids: dict[tuple[str, int], int] = {}
+    cold_keys: dict[str, int] = {}
+
+    committee_id = 1
+    rows["epoch_state"].append((next(ids), committee_id, EPOCH_NO))
+    previous_id = next(ids)
+    rows["block"].append((previous_id, chain[0].previous_hash, chain[0].block_no - 1, EPOCH_NO, None))
+    for block in chain:
+        block_id = next(ids)
+        rows["block"].append((block_id, block.hash, block.block_no, EPOCH_NO, previous_id))
+        previous_id = block_id
+        for action in block.actions:
+            tx_id, anchor_id, gap_id = next(ids), next(ids), next(ids)
+            rows["tx"].append((tx_id, action.tx_hash, block_id))
+            rows["voting_anchor"].append((anchor_id, f"ipfs://{action.key}"))
+            rows["gov_action_proposal"].append((gap_id, tx_id, action.index, "InfoAction", anchor_id))
+            gap_ids[(action.tx_hash, action.index)] = gap_id
+        for vote in block.votes:
+            gap_id = gap_ids.get((vote.ga_tx_hash, vote.ga_index))
+            if gap_id is None:
+                continue
+            if vote.voter_hash not in cold_keys:
+                cold_id, hot_id = next(ids), next(ids)
+                rows["committee_hash"].append((cold_id, vote.voter_hash))
+                rows["committee_hash"].append((hot_id, _hash("hot", vote.voter_hash)[:56]))
+                rows["committee_registration"].append((next(ids), hot_id, cold_id))
+                rows["committee_member"].append((next(ids), committee_id, cold_id, EPOCH_NO + 73))
+                cold_keys[vote.voter_hash] = hot_id
+            tx_id, anchor_id = next(ids), next(ids)
+            rows["tx"].append((tx_id, vote.vote_tx_hash, block_id))
+            rows["voting_anchor"].append((anchor_id, f"ipfs://{vote.key}"))
+            rows["voting_procedure"].append(
+                (next(ids), tx_id, gap_id, "ConstitutionalCommittee", cold_keys[vote.voter_hash], vote.vote, anchor_id)
+            )
+    return rows
+
+
+_INSERTS = {
+    "block": "INSERT INTO block VALUES (%s, decode(%s, 'hex'), %s, %s, %s)",
+    "tx": "INSERT INTO tx (id, hash, block_id) VALUES (%s, decode(%s, 'hex'), %s)",
+    "voting_anchor": "INSERT INTO voting_anchor VALUES (%s, %s)",
+    "gov_action_proposal": "INSERT INTO gov_action_proposal VALUES (%s, %s, %s, %s, %s)",
+    "committee_hash": "INSERT INTO committee_hash VALUES (%s, decode(%s, 'hex'))",
+    "committee_registration": "INSERT INTO committee_registration VALUES (%s, %s, %s)",
+    "committee_member": "INSERT INTO committee_member VALUES (%s, %s, %s, %s)",
+    "epoch_state": "INSERT INTO epoch_state VALUES (%s, %s, %s)",
+    "voting_procedure": "INSERT INTO voting_procedure VALUES (%s, %s, %s, %s, %s, %s, %s)",
+}
+
+
+def seed_database(db_url: str, chain: list[FixtureBlock], *, reset: bool) -> None:
+    import psycopg
+
+    rows = seed_rows(chain)
+    with psycopg.connect(db_url) as conn:
+        conn.execute(SCHEMA)
+        existing = conn.execute("SELECT count(*) FROM block").fetchone()[0]
+        if existing and not reset:
+            sys.exit(f"{db_url} already has {existing} blocks; pass --reset to replace them")
+        conn.execute(f"TRUNCATE {', '.join(_TABLES)}")
+        with conn.cursor() as cur:
+            for table, table_rows in rows.items():
+                cur.executemany(_INSERTS[table], table_rows)
+    print(", ".join(f"{len(table_rows)} {table}" for table, table_rows in rows.items()))
+
+
+class MemoryDbSync:
+    """Answers the repository calls used by the block pipeline from the fixtures."""
+
+    def __init__(self, chain: list[FixtureBlock], latency: float) -> None:
+        from bot.models import CcVote, GovAction
+
+        self.latency = latency
+        self.epochs = {chain[0].previous_hash: EPOCH_NO, **{b.hash: EPOCH_NO for b in chain}}
+        self.actions = {
+            b.block_no: [GovAction(a.tx_hash, "InfoAction", a.index, f"ipfs://{a.key}") for a in b.actions]
+            for b in chain
+        }
+        self.votes = {
+            b.block_no: [
+                CcVote(v.ga_tx_hash, v.ga_index, v.vote_tx_hash, v.voter_hash, v.vote, f"ipfs://{v.key}")
+                for v in b.votes
+            ]
+            for b in chain
+        }
+
+    async def _wait(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def get_gov_actions(self, block_no: int):
+        await self._wait()
+        return self.actions.get(block_no, [])
+
+    async def get_cc_votes(self, block_no: int):
+        await self._wait()
+        return self.votes.get(block_no, [])
+
+    async def get_block_epoch(self, block_hash: str):
+        await self._wait()
+        return self.epochs.get(block_hash)
+
+    async def get_block_epoch_at_height(self, block_no: int):
+        await self._wait()
+        return EPOCH_NO
+
+    async def get_block_treasury_donation_summary(self, block_no: int):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# IPFS, X and Firestore stand-ins
+# ---------------------------------------------------------------------------
+
+
+def _serve(handler: type[BaseHTTPRequestHandler]) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _json_response(handler: BaseHTTPRequestHandler, status: int, body: bytes) -> None:
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def ipfs_server(archive: Path, latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            path = key_path(archive, self.path.removeprefix("/ipfs/"))
+            if path.is_file():
+                _json_response(self, 200, path.read_bytes())
+            else:
+                _json_response(self, 404, b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    return _serve(Handler)
+
+
+def x_api_server(latency: float) -> tuple[ThreadingHTTPServer, list]:
+    posted: list[dict] = []
+    ids = itertools.count(1)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            time.sleep(latency)
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            posted.append(body)
+            tweet = {"id": str(next(ids)), "text": body.get("text", "")}
+            _json_response(self, 201, json.dumps({"data": tweet}).encode())
+
+        def log_message(self, *args):
+            pass
+
+    return _serve(Handler), posted
+
+
+class _Doc:
+    def __init__(self, data: dict | None) -> None:
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> dict | None:
+        return dict(self._data) if self._data is not None else None
+
+
+class _DocRef:
+    def __init__(self, store: MemoryFirestore, path: tuple[str, str]) -> None:
+        self._store, self._path = store, path
+
+    def get(self) -> _Doc:
+        time.sleep(self._store.latency)
+        return _Doc(self._store.docs.get(self._path))
+
+    def set(self, payload: dict, merge: bool = False) -> None:
+        time.sleep(self._store.latency)
+        current = self._store.docs.get(self._path, {}) if merge else {}
+        self._store.docs[self._path] = {**current, **payload}
+
+
+class _Collection:
+    def __init__(self, store: MemoryFirestore, name: str) -> None:
+        self._store, self._name = store, name
+
+    def document(self, doc_id: str) -> _DocRef:
+        return _DocRef(self._store, (self._name, doc_id))
+
+
+class MemoryFirestore:
+    """The ``collection().document().get()/set()`` subset of the Firestore client used by bot.state_store."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.docs: dict[tuple[str, str], dict] = {}
+
+    def collection(self, name: str) -> _Collection:
+        return _Collection(self, name)
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+
+def sign(body: bytes, secret: str = WEBHOOK_SECRET) -> str:
+    timestamp = str(int(time.time()))
+    digest = hmac.new(secret.encode(), f"{timestamp}.{body.decode()}".encode(), hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"count": len(samples), "p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "count": len(samples),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+def _install_stand_ins(args, chain: list[FixtureBlock]) -> tuple[list, MemoryFirestore]:
+    """Point the bot at the local stand-ins. Must run before the pipeline handles a webhook."""
+    from xdk import Client
+    from xdk.oauth1_auth import OAuth1
+
+    from bot import main, state_store
+    from bot.config import config
+    from bot.twitter import client as twitter_client
+
+    # The config singleton is frozen and shared by every module; override it in place for the run.
+    overrides = {
+        "blockfrost_webhook_auth_token": WEBHOOK_SECRET,
+        "tweet_posting_enabled": True,
+        "confirmation_depth": 0,
+        "ingestion_mode": "webhook",
+        "treasury_donation_accumulator_enabled": False,
+    }
+    if args.db_url:
+        overrides["db_sync_url"] = args.db_url
+    for name, value in overrides.items():
+        object.__setattr__(config, name, value)
+
+    ipfs = ipfs_server(args.archive, args.ipfs_latency)
+    x_api, posted = x_api_server(args.x_latency)
+    firestore = MemoryFirestore(args.firestore_latency)
+
+    ipfs_base = f"http://127.0.0.1:{ipfs.server_port}/ipfs/"
+    main.sanitise_url = lambda url: url.replace("ipfs://", ipfs_base)
+    x_base = f"http://127.0.0.1:{x_api.server_port}"
+    twitter_client._get_client = lambda: Client(
+        base_url=x_base,
+        auth=OAuth1(api_key="k", api_secret="s", callback="oob", access_token="t", access_token_secret="ts"),
+    )
+    state_store._FIRESTORE_CLIENT = firestore
+
+    if not args.db_url:
+        db = MemoryDbSync(chain, args.db_latency)
+        for name in (
+            "get_gov_actions",
+            "get_cc_votes",
+            "get_block_epoch",
+            "get_block_epoch_at_height",
+            "get_block_treasury_donation_summary",
+        ):
+            setattr(main, name, getattr(db, name))
+    return posted, firestore
+
+
+async def replay(args, chain: list[FixtureBlock]) -> dict:
+    import httpx
+
+    from bot import main, tracing
+    from bot.db.repository import close_conn
+
+    posted, _ = _install_stand_ins(args, chain)
+
+    spans: list = []
+
+    class _Collect(tracing.Exporter):
+        def export(self, trace):
+            spans.extend(trace)
+
+    tracing.configure(_Collect(), sample_rate=1.0)
+
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bot") as client:
+
+        async def _send(block: FixtureBlock) -> None:
+            body = json.dumps(block.payload()).encode()
+            started = time.perf_counter()
+            response = await client.post(
+                "/", content=body, headers={"Blockfrost-Signature": sign(body), "Content-Type": "application/json"}
+            )
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        # Open-loop schedule: webhooks are sent at the target rate whether or not earlier ones finished.
+        interval = 1.0 / args.rate if args.rate > 0 else 0.0
+        started = time.perf_counter()
+        tasks = []
+        for i, block in enumerate(chain):
+            delay = started + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(_send(block)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    tracing.shutdown()
+    await close_conn()
+
+    stages: dict[str, list[float]] = {}
+    for span in spans:
+        stages.setdefault(span.name, []).append(span.duration_ms / 1000)
+
+    return {
+        "blocks": len(chain),
+        "gov_actions": sum(len(b.actions) for b in chain),
+        "cc_votes": sum(len(b.votes) for b in chain),
+        "target_rate": args.rate,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(chain) / elapsed, 2),
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        "tweets_posted": len(posted),
+        "request": _percentiles(latencies),
+        "stages": {name: _percentiles(samples) for name, samples in sorted(stages.items())},
+        "stand_ins": {
+            "db": "postgres" if args.db_url else "memory",
+            "db_latency_s": 0.0 if args.db_url else args.db_latency,
+            "ipfs_latency_s": args.ipfs_latency,
+            "x_latency_s": args.x_latency,
+            "firestore_latency_s": args.firestore_latency,
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['blocks']} webhooks ({report['gov_actions']} actions, {report['cc_votes']} CC votes) "
+        f"in {report['elapsed_s']}s — {report['throughput_per_s']} blocks/s at target {report['target_rate']}/s"
+    )
+    print(f"statuses: {report['statuses']}, tweets posted: {report['tweets_posted']}")
+    print(f"{'stage':<14}{'count':>8}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}")
+    for name, row in [("request", report["request"]), *report["stages"].items()]:
+        print(f"{name:<14}{row['count']:>8}{row['p50_ms']:>11.2f}{row['p95_ms']:>11.2f}{row['p99_ms']:>11.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", type=Path, default=RATIONALES_DIR, help="archive directory")
+    parser.add_argument("--blocks", type=int, default=200, help="synthetic blocks to generate (default: 200)")
+    parser.add_argument("--documents", type=int, help="use only the first N archived documents (default: all)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    seed = sub.add_parser("seed", help="create and fill DB-Sync-shaped tables in a local Postgres")
+    seed.add_argument("--db-url", required=True, help="Postgres URL (use a dedicated database)")
+    seed.add_argument("--reset", action="store_true", help="replace previously seeded rows")
+
+    run = sub.add_parser("run", help="replay the webhooks and report latencies")
+    run.add_argument("--db-url", help="seeded Postgres URL (default: in-memory DB-Sync stand-in)")
+    run.add_argument("--rate", type=float, default=20.0, help="webhooks per second; 0 sends all at once")
+    run.add_argument("--db-latency", type=float, default=0.002, help="in-memory DB-Sync query latency (s)")
+    run.add_argument("--ipfs-latency", type=float, default=0.05, help="stub IPFS response latency (s)")
+    run.add_argument("--x-latency", type=float, default=0.1, help="fake X API response latency (s)")
+    run.add_argument("--firestore-latency", type=float, default=0.01, help="in-memory Firestore latency (s)")
+    run.add_argument("--corpus", type=Path, help="also write the unsigned webhook bodies here (JSON lines)")
+    run.add_argument("--output", type=Path, help="write the report as JSON (the regression baseline)")
+    args = parser.parse_args()
+
+    chain = build_fixtures(args.archive, args.blocks, args.documents)
+    if not any(b.actions or b.votes for b in chain):
+        sys.exit(f"No documents found in {args.archive}")
+
+    if args.command == "seed":
+        seed_database(args.db_url, chain, reset=args.reset)
+        return
+
+    os.environ.setdefault("DB_SYNC_URL", args.db_url or "postgresql://replay.invalid/dbsync")
+    if args.corpus:
+        args.corpus.write_text("".join(json.dumps(b.payload()) + "\n" for b in chain), encoding="utf-8")
+
+    report = asyncio.run(replay(args, chain))
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Shared inputs for the micro-benchmarks, taken from the rationale archive."""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+# Ensure the project root is on the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("pytest_benchmark")
+
+from bot.archive.layout import RATIONALES_DIR, is_placeholder, iter_keys, key_path  # noqa: E402
+from bot.models import CcVote, GovAction  # noqa: E402
+
+_VOTES = ("YES", "NO", "ABSTAIN")
+
+
+@dataclass(frozen=True)
+class Corpus:
+    actions: list[tuple[GovAction, dict | None]]
+    votes: list[tuple[CcVote, dict | None]]
+
+    @property
+    def voter_hashes(self) -> list[str]:
+        return [vote.voter_hash for vote, _ in self.votes]
+
+
+def _load(path: Path) -> dict | None:
+    try:
+        doc = json.loads(path.read_bytes())
+    except ValueError:
+        return None
+    return None if not isinstance(doc, dict) or is_placeholder(doc) else doc
+
+
+@pytest.fixture(scope="session")
+def corpus() -> Corpus:
+    """Every archived document with the model it would arrive with from DB-Sync."""
+    actions, votes = [], []
+    for key in iter_keys(RATIONALES_DIR):
+        action_key, _, voter = key.partition("/")
+        tx_hash, _, index = action_key.rpartition("_")
+        doc = _load(key_path(RATIONALES_DIR, key))
+        if voter:
+            vote = CcVote(tx_hash, int(index), tx_hash, voter, _VOTES[len(votes) % 3], f"ipfs://{key}")
+            votes.append((vote, doc))
+        else:
+            actions.append((GovAction(tx_hash, "InfoAction", int(index), f"ipfs://{key}"), doc))
+    if not actions or not votes:
+        pytest.skip(f"No rationale archive at {RATIONALES_DIR}")
+    return Corpus(actions, votes)
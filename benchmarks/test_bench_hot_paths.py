@@ -0,0 +1,113 @@
+"""Micro-benchmarks for the pure-Python hot paths of the block pipeline.
+
+Each benchmark runs one function over the whole rationale archive per round,
+so results are per-corpus timings. Run, save a baseline and compare with:
+
+    uv run pytest benchmarks --benchmark-save=baseline
+    uv run pytest benchmarks --benchmark-compare --benchmark-compare-fail=median:15%
+
+The last command fails when any benchmark's median regresses by more than
+15% against the most recently saved run (stored under ``.benchmarks/``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import time
+from dataclasses import replace
+
+import pytest
+
+from bot import webhook_auth
+from bot.cc_profiles import get_x_handle_for_voter_hash, resolve_handles
+from bot.links import make_adastat_link, make_gov_tools_link, make_governance_action_link
+from bot.rationale_validator import validate_cc_vote_rationale, validate_gov_action_rationale
+from bot.twitter.formatter import format_cc_vote_tweet, format_gov_action_tweet
+from bot.twitter.text import weighted_length
+
+_SECRET = "benchmark-secret"
+
+
+def test_format_gov_action_tweet(benchmark, corpus):
+    def _run():
+        return [format_gov_action_tweet(action, doc) for action, doc in corpus.actions]
+
+    assert len(benchmark(_run)) == len(corpus.actions)
+
+
+def test_format_cc_vote_tweet(benchmark, corpus):
+    def _run():
+        return [
+            format_cc_vote_tweet(vote, doc, quote_tweet_id="1" if i % 2 else None)
+            for i, (vote, doc) in enumerate(corpus.votes)
+        ]
+
+    assert len(benchmark(_run)) == len(corpus.votes)
+
+
+def test_weighted_length(benchmark, corpus):
+    tweets = [format_gov_action_tweet(action, doc) for action, doc in corpus.actions]
+
+    def _run():
+        return [weighted_length(tweet) for tweet in tweets]
+
+    assert max(benchmark(_run)) <= 280
+
+
+def test_validate_gov_action_rationale(benchmark, corpus):
+    benchmark(lambda: [validate_gov_action_rationale(doc) for _, doc in corpus.actions])
+
+
+def test_validate_cc_vote_rationale(benchmark, corpus):
+    benchmark(lambda: [validate_cc_vote_rationale(doc) for _, doc in corpus.votes])
+
+
+def test_links(benchmark, corpus):
+    def _run():
+        for action, _ in corpus.actions:
+            make_governance_action_link(action.tx_hash, action.index)
+            make_adastat_link(action.tx_hash, action.index)
+            make_gov_tools_link(action.tx_hash, action.index)
+
+    benchmark(_run)
+
+
+def test_cc_profile_lookup(benchmark, corpus):
+    hashes = corpus.voter_hashes
+    get_x_handle_for_voter_hash(hashes[0])  # load the profile file outside the timed region
+    benchmark(lambda: [get_x_handle_for_voter_hash(h) for h in hashes])
+
+
+def test_cc_profile_bulk_resolve(benchmark, corpus):
+    hashes = corpus.voter_hashes
+    resolve_handles(hashes[:1])
+    benchmark(lambda: resolve_handles(hashes))
+
+
+@pytest.fixture
+def signed_webhooks(monkeypatch, corpus):
+    """Blockfrost-shaped block webhooks, one per archived action, signed with a test secret."""
+    monkeypatch.setattr(webhook_auth, "config", replace(webhook_auth.config, blockfrost_webhook_auth_token=_SECRET))
+    timestamp = str(int(time.time()))
+    webhooks = []
+    for i, (action, _) in enumerate(corpus.actions):
+        body = json.dumps(
+            {
+                "id": f"webhook-{i}",
+                "webhook_id": "bench",
+                "created": int(timestamp),
+                "api_version": 1,
+                "type": "block",
+                "payload": {"height": 11_000_000 + i, "hash": action.tx_hash, "epoch": 500, "tx_count": 12},
+            }
+        ).encode()
+        digest = hmac.new(_SECRET.encode(), f"{timestamp}.{body.decode()}".encode(), hashlib.sha256).hexdigest()
+        webhooks.append((f"t={timestamp},v1={digest}", body))
+    return webhooks
+
+
+def test_verify_webhook_signature(benchmark, signed_webhooks):
+    results = benchmark(lambda: [webhook_auth.verify_webhook_signature(sig, body) for sig, body in signed_webhooks])
+    assert all(results)
@@ -0,0 +1,186 @@
+"""Concurrent, resumable rationale backfill engine.
+
+A fixed pool of async workers fetches rationale documents (the blocking
+``fetch_metadata`` runs in worker threads) and writes them into the archive.
+Items may come from an async iterator (e.g. a server-side DB cursor); a
+bounded queue keeps memory flat and fetching starts with the first row.
+Progress is tracked in a :class:`~bot.archive.manifest.BackfillManifest`, so an
+interrupted run resumes where it stopped and failed fetches are retried on
+the next run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Sized
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from bot.archive.layout import key_path, placeholder, save_json
+from bot.archive.manifest import DONE, FAILED, PENDING, BackfillManifest
+from bot.logging import get_logger
+from bot.metadata.fetcher import fetch_metadata
+
+logger = get_logger("archive.backfill")
+
+_MANIFEST_SAVE_EVERY = 100
+
+
+@dataclass(frozen=True)
+class BackfillItem:
+    key: str
+    url: str
+    # DB-Sync row id the item came from, used to advance the high-water mark.
+    row_id: int | None = None
+
+
+@dataclass
+class BackfillStats:
+    total: int | None = None
+    fetched: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_written: int = 0
+    max_row_id: int | None = None
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        return self.fetched + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.monotonic() - self.started_at, 1e-9)
+
+    @property
+    def items_per_second(self) -> float:
+        return self.processed / self.elapsed
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_written / self.elapsed
+
+    def eta_seconds(self) -> float | None:
+        """Seconds left at the current rate, or None when unknown."""
+        if self.total is None or not self.processed:
+            return None
+        remaining = self.total - self.skipped - self.processed
+        return max(remaining, 0) / self.items_per_second
+
+    def progress_line(self) -> str:
+        eta = self.eta_seconds()
+        done = self.skipped + self.processed
+        of_total = f" / {self.total}" if self.total is not None else ""
+        eta_part = f", ETA {eta:.0f}s" if eta is not None else ""
+        return (
+            f"{done}{of_total} ({self.failed} failed) — "
+            f"{self.items_per_second:.1f} items/s, {self.bytes_per_second / 1024:.1f} KiB/s{eta_part}"
+        )
+
+
+def directory_writer(root: Path) -> Callable[[str, dict], int]:
+    """Writer storing documents in the ``rationales/`` directory layout."""
+    return lambda key, doc: save_json(key_path(root, key), doc)
+
+
+def _fetch_and_save(
+    item: BackfillItem, fetch: Callable[[str], dict | None], save: Callable[[str, dict], int]
+) -> tuple[bool, int]:
+    """Fetch one document and write it (or a placeholder). Runs in a worker thread."""
+    metadata = fetch(item.url)
+    if metadata:
+        return True, save(item.key, metadata)
+    return False, save(item.key, placeholder(item.url))
+
+
+async def _iterate(items: Iterable[BackfillItem] | AsyncIterable[BackfillItem]) -> AsyncIterator[BackfillItem]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def run_backfill(
+    items: Iterable[BackfillItem] | AsyncIterable[BackfillItem],
+    *,
+    root: Path,
+    manifest: BackfillManifest,
+    concurrency: int = 8,
+    fetch: Callable[[str], dict | None] = fetch_metadata,
+    label: str = "Backfill",
+    progress_interval: float = 10.0,
+    total: int | None = None,
+    save: Callable[[str, dict], int] | None = None,
+    owns: Callable[[str], bool] | None = None,
+) -> BackfillStats:
+    """Fetch every item not yet marked done in ``manifest``, ``concurrency`` at a time.
+
+    Documents are written with ``save(key, doc)`` (returning bytes written),
+    which defaults to the directory layout under ``root``; pass
+    :meth:`bot.archive.pack.PackArchive.put` to backfill into a pack.
+
+    With ``owns`` (e.g. a shard filter), items it rejects are left to another
+    worker but still count towards ``max_row_id``: the mark records how far the
+    source was scanned, so a shard with no new rows still moves it forward.
+    """
+    save = save or directory_writer(root)
+    if total is None and isinstance(items, Sized):
+        total = len(items)
+    stats = BackfillStats(total=total)
+    workers = max(concurrency, 1)
+    queue: asyncio.Queue[BackfillItem | None] = asyncio.Queue(maxsize=workers * 4)
+
+    since_save = 0
+    last_report = time.monotonic()
+
+    async def _produce() -> None:
+        try:
+            async for item in _iterate(items):
+                if item.row_id is not None and (stats.max_row_id is None or item.row_id > stats.max_row_id):
+                    stats.max_row_id = item.row_id
+                if owns is not None and not owns(item.key):
+                    continue
+                if manifest.status(item.key) == DONE:
+                    stats.skipped += 1
+                    continue
+                manifest.mark(item.key, PENDING, item.url)
+                await queue.put(item)
+        finally:
+            for _ in range(workers):
+                await queue.put(None)
+
+    async def _worker() -> None:
+        nonlocal since_save, last_report
+        while (item := await queue.get()) is not None:
+            try:
+                ok, nbytes = await asyncio.to_thread(_fetch_and_save, item, fetch, save)
+            except Exception:
+                logger.exception("Backfill failed for %s", item.key)
+                ok, nbytes = False, 0
+
+            stats.bytes_written += nbytes
+            if ok:
+                stats.fetched += 1
+                manifest.mark(item.key, DONE)
+            else:
+                stats.failed += 1
+                manifest.mark(item.key, FAILED)
+
+            since_save += 1
+            if since_save >= _MANIFEST_SAVE_EVERY:
+                manifest.save()
+                since_save = 0
+            if time.monotonic() - last_report >= progress_interval:
+                logger.info("%s progress: %s", label, stats.progress_line())
+                last_report = time.monotonic()
+
+    try:
+        await asyncio.gather(_produce(), *(_worker() for _ in range(workers)))
+    finally:
+        manifest.save()
+
+    logger.info("%s finished: %s", label, stats.progress_line())
+    return stats
@@ -0,0 +1,97 @@
+"""Rationale archive layout: keys, on-disk paths and placeholder documents.
+
+Every archived document has a key — ``<tx_hash>_<index>`` for a governance
+action and ``<tx_hash>_<index>/<voter_hash>`` for a CC vote — which maps onto
+the ``rationales/`` directory layout::
+
+    rationales/<tx_hash>_<index>/action.json
+    rationales/<tx_hash>_<index>/cc_votes/<voter_hash>.json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+RATIONALES_DIR = Path(__file__).resolve().parent.parent.parent / "rationales"
+
+PLACEHOLDER_ERROR = "Failed to fetch rationale"
+
+# Placeholders are ~120 bytes; anything larger is a real document.
+_PLACEHOLDER_MAX_BYTES = 1024
+
+
+def action_key(tx_hash: str, index: int) -> str:
+    return f"{tx_hash}_{index}"
+
+
+def cc_vote_key(ga_tx_hash: str, ga_index: int, voter_hash: str) -> str:
+    return f"{ga_tx_hash}_{ga_index}/{voter_hash}"
+
+
+def key_kind(key: str) -> str:
+    """Return ``"action"`` or ``"cc_vote"`` for an archive key."""
+    return "cc_vote" if "/" in key else "action"
+
+
+def key_path(root: Path, key: str) -> Path:
+    action, _, voter = key.partition("/")
+    if voter:
+        return root / action / "cc_votes" / f"{voter}.json"
+    return root / action / "action.json"
+
+
+def iter_keys(root: Path) -> Iterator[str]:
+    """Yield the key of every document in a directory archive."""
+    if not root.is_dir():
+        return
+    with os.scandir(root) as actions:
+        for action in actions:
+            if not action.is_dir():
+                continue
+            if os.path.exists(os.path.join(action.path, "action.json")):
+                yield action.name
+            votes_dir = os.path.join(action.path, "cc_votes")
+            if not os.path.isdir(votes_dir):
+                continue
+            with os.scandir(votes_dir) as votes:
+                for vote in votes:
+                    if vote.name.endswith(".json"):
+                        yield f"{action.name}/{vote.name[: -len('.json')]}"
+
+
+def placeholder(url: str) -> dict:
+    return {"error": PLACEHOLDER_ERROR, "url": url}
+
+
+def is_placeholder(doc: dict | None) -> bool:
+    return isinstance(doc, dict) and doc.get("error") == PLACEHOLDER_ERROR
+
+
+def is_placeholder_file(path: Path) -> bool:
+    """Cheap placeholder check that only parses suspiciously small files."""
+    try:
+        if path.stat().st_size > _PLACEHOLDER_MAX_BYTES:
+            return False
+        return is_placeholder(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return False
+
+
+def dump_json(data: dict) -> bytes:
+    """Serialise a document the way the archive stores it."""
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def save_json(path: Path, data: dict) -> int:
+    """Write a document and return the number of bytes written."""
+    raw = dump_json(data)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(raw)
+    return len(raw)
+
+
+def load_json(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -0,0 +1,113 @@
+"""Resumable backfill manifest.
+
+Records the status of every archive key the backfill has seen, so a rerun
+skips finished documents without touching the filesystem, retries failed
+ones and resumes pending ones after a crash. It also keeps a high-water
+mark per source (the highest DB-Sync row id fully processed), so incremental
+runs only query rows added since the last run. Manifests written by separate
+shards can be split from and merged back into a single manifest.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from bot.archive.layout import is_placeholder_file, iter_keys, key_path
+
+DONE = "done"
+FAILED = "failed"
+PENDING = "pending"
+
+# Merge precedence: a key finished by any shard stays finished.
+_STATUS_RANK = {PENDING: 0, FAILED: 1, DONE: 2}
+
+
+class BackfillManifest:
+    """JSON-backed map of archive key -> ``{"status": ..., "url": ...}``."""
+
+    def __init__(
+        self, path: Path, entries: dict[str, dict] | None = None, high_water: dict[str, int] | None = None
+    ) -> None:
+        self.path = path
+        self.entries: dict[str, dict] = entries or {}
+        self.high_water: dict[str, int] = high_water or {}
+
+    @classmethod
+    def load(cls, path: Path) -> BackfillManifest:
+        if not path.exists():
+            return cls(path)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(path, data.get("entries", {}), data.get("high_water", {}))
+
+    def bootstrap(self, root: Path) -> int:
+        """Seed a fresh manifest from an existing directory archive (one scan).
+
+        Returns the number of keys added.
+        """
+        added = 0
+        for key in iter_keys(root):
+            if key in self.entries:
+                continue
+            status = FAILED if is_placeholder_file(key_path(root, key)) else DONE
+            self.entries[key] = {"status": status}
+            added += 1
+        return added
+
+    def status(self, key: str) -> str | None:
+        entry = self.entries.get(key)
+        return entry["status"] if entry else None
+
+    def mark(self, key: str, status: str, url: str | None = None) -> None:
+        entry = self.entries.setdefault(key, {})
+        entry["status"] = status
+        if url is not None:
+            entry["url"] = url
+
+    def unfinished(self) -> Iterator[tuple[str, str]]:
+        """Yield ``(key, url)`` for failed or pending entries that can be retried."""
+        for key, entry in self.entries.items():
+            if entry["status"] != DONE and entry.get("url"):
+                yield key, entry["url"]
+
+    def counts(self) -> dict[str, int]:
+        counts = {DONE: 0, FAILED: 0, PENDING: 0}
+        for entry in self.entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def subset(self, path: Path, owns: Callable[[str], bool]) -> BackfillManifest:
+        """Return a new manifest at ``path`` holding the entries ``owns`` accepts."""
+        entries = {key: dict(entry) for key, entry in self.entries.items() if owns(key)}
+        return BackfillManifest(path, entries, dict(self.high_water))
+
+    def merge(self, parts: Iterable[BackfillManifest]) -> None:
+        """Fold shard manifests into this one.
+
+        Entries keep the most advanced status seen. A high-water mark only
+        moves forward to the lowest mark every part reached, since each part
+        only vouches for rows up to its own mark.
+        """
+        parts = list(parts)
+        for part in parts:
+            for key, entry in part.entries.items():
+                mine = self.entries.get(key)
+                if mine is None or _STATUS_RANK[entry["status"]] > _STATUS_RANK[mine["status"]]:
+                    self.entries[key] = {**(mine or {}), **entry}
+        if not parts:
+            return
+        for mark in set.intersection(*(set(part.high_water) for part in parts)):
+            reached = min(part.high_water[mark] for part in parts)
+            self.high_water[mark] = max(self.high_water.get(mark, 0), reached)
+
+    def save(self) -> None:
+        """Write the manifest atomically (temp file + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"entries": self.entries, "high_water": self.high_water}, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
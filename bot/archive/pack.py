@@ -0,0 +1,426 @@
+"""Packed rationale archive: one append-only pack file plus a hash index.
+
+The directory layout (:mod:`bot.archive.layout`) stores one pretty-printed
+JSON file per document. The packed format stores the same documents in a
+single append-only file::
+
+    rationales.pack   header, then records: <kind u8><key_len u32><data_len u32><key><data>
+    rationales.idx    header, then an open-addressing table of
+                      <key_hash u64><offset u64> slots, memory-mapped for reads
+
+Storage is content-addressed: a document is written once as a *blob* record
+keyed by ``sha256:<digest>`` of its compact JSON, and every archive key
+(``<tx_hash>_<index>[/<voter_hash>]``) gets a small *ref* record naming that
+digest. CC members often publish one rationale for several votes, so those
+votes share a blob. Blobs are compressed on their own (zstd when
+``zstandard`` is installed, zlib otherwise) so any document can be read
+without touching its neighbours. A read probes the mapped table for the ref
+and then for its blob: O(1) regardless of archive size. Rewriting a key
+appends a new ref (and blob, if the content is new) and repoints its slot;
+superseded records stay in the pack as dead space until it is repacked.
+
+Only JSON documents are packed; other files in ``rationales/`` (such as
+``tweet_id.txt``) are left alone by the converter.
+
+The index records how many pack bytes it covers. If the pack is longer (the
+process died between the two writes) or the index is missing, it is rebuilt
+from a single scan of the pack.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from bot.archive.layout import iter_keys, key_path, load_json, save_json
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+PACK_MAGIC = b"GABPACK1"
+INDEX_MAGIC = b"GABIDX01"
+
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+RECORD_BLOB = 1
+RECORD_REF = 2
+
+BLOB_PREFIX = "sha256:"
+
+# Pack header: magic, codec.
+_PACK_HEADER = struct.Struct("<8sB7x")
+# Record header: kind, key length, data length.
+_RECORD_HEADER = struct.Struct("<BII")
+# Index header: magic, capacity, indexed keys (refs + blobs), documents, pack bytes covered.
+_INDEX_HEADER = struct.Struct("<8sQQQQ")
+_SLOT = struct.Struct("<QQ")
+
+_MIN_CAPACITY = 1024
+_MAX_LOAD = 0.7
+
+
+def available_codec() -> int:
+    return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def _compressor(codec: int):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("pack is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdCompressor(level=9).compress, zstandard.ZstdDecompressor().decompress
+    if codec == CODEC_ZLIB:
+        return lambda data: zlib.compress(data, 9), zlib.decompress
+    raise ValueError(f"unknown pack codec {codec}")
+
+
+def key_hash(key: str) -> int:
+    """64-bit slot hash of an archive key; never 0 (0 marks an empty slot)."""
+    value = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+    return value or 1
+
+
+def encode_doc(doc: dict) -> bytes:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def blob_key(raw: bytes) -> str:
+    """Content address of an encoded document."""
+    return BLOB_PREFIX + hashlib.sha256(raw).hexdigest()
+
+
+@dataclass(frozen=True)
+class DedupStats:
+    documents: int
+    blobs: int
+    # Compressed bytes the documents would take stored one copy per key,
+    # versus the bytes actually stored once per unique blob.
+    logical_bytes: int
+    stored_bytes: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.logical_bytes - self.stored_bytes
+
+    @property
+    def ratio(self) -> float:
+        return self.logical_bytes / self.stored_bytes if self.stored_bytes else 1.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.documents} documents in {self.blobs} unique blobs — "
+            f"dedup ratio {self.ratio:.2f}x, {self.bytes_saved} bytes saved"
+        )
+
+
+class PackArchive:
+    """Read/write access to a packed rationale archive.
+
+    Use as a context manager, or call :meth:`close` to flush the index.
+    :meth:`put` is thread-safe so backfill worker threads can share a pack.
+    """
+
+    def __init__(self, path: Path, *, codec: int | None = None) -> None:
+        self.path = path
+        self.index_path = path.with_suffix(".idx")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if not path.exists() or path.stat().st_size == 0:
+            with path.open("wb") as f:
+                f.write(_PACK_HEADER.pack(PACK_MAGIC, codec or available_codec()))
+
+        self._pack = path.open("r+b")
+        magic, self.codec = _PACK_HEADER.unpack(self._pack.read(_PACK_HEADER.size))
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{path} is not a rationale pack")
+        self._compress, self._decompress = _compressor(self.codec)
+        self._pack_map: mmap.mmap | None = None
+
+        self._index_file = None
+        self._index: mmap.mmap | None = None
+        self._capacity = 0
+        self._count = 0
+        self._documents = 0
+        self._lock = threading.Lock()
+        self._open_index()
+
+    # -- context management --------------------------------------------------
+
+    def __enter__(self) -> PackArchive:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._write_index_header()
+            self._index.flush()
+            self._index.close()
+            self._index = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        if self._pack_map is not None:
+            self._pack_map.close()
+            self._pack_map = None
+        self._pack.close()
+
+    # -- index ---------------------------------------------------------------
+
+    def _pack_size(self) -> int:
+        return os.fstat(self._pack.fileno()).st_size
+
+    def _open_index(self) -> None:
+        pack_size = self._pack_size()
+        if self.index_path.exists():
+            with self.index_path.open("rb") as f:
+                header = f.read(_INDEX_HEADER.size)
+            if len(header) == _INDEX_HEADER.size:
+                magic, capacity, count, documents, covered = _INDEX_HEADER.unpack(header)
+                if magic == INDEX_MAGIC and covered == pack_size:
+                    self._map_index(capacity)
+                    self._count = count
+                    self._documents = documents
+                    return
+        self.rebuild_index()
+
+    def _map_index(self, capacity: int) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index_file.close()
+        self._index_file = self.index_path.open("r+b")
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        self._capacity = capacity
+
+    def _create_index(self, capacity: int) -> None:
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(_INDEX_HEADER.pack(INDEX_MAGIC, capacity, 0, 0, 0))
+            f.truncate(_INDEX_HEADER.size + capacity * _SLOT.size)
+        os.replace(tmp, self.index_path)
+        self._map_index(capacity)
+        self._count = 0
+
+    def _write_index_header(self) -> None:
+        self._index[: _INDEX_HEADER.size] = _INDEX_HEADER.pack(
+            INDEX_MAGIC, self._capacity, self._count, self._documents, self._pack_size()
+        )
+
+    def _slot(self, i: int) -> tuple[int, int]:
+        return _SLOT.unpack_from(self._index, _INDEX_HEADER.size + i * _SLOT.size)
+
+    def _set_slot(self, i: int, h: int, offset: int) -> None:
+        _SLOT.pack_into(self._index, _INDEX_HEADER.size + i * _SLOT.size, h, offset)
+
+    def _find(self, key: str, h: int) -> tuple[int, int | None]:
+        """Return ``(slot, offset)`` for ``key``, or the empty slot to use and None."""
+        i = h % self._capacity
+        while True:
+            slot_hash, offset = self._slot(i)
+            if slot_hash == 0:
+                return i, None
+            if slot_hash == h and self._read_key(offset) == key:
+                return i, offset
+            i = (i + 1) % self._capacity
+
+    def _insert(self, key: str, offset: int) -> None:
+        if (self._count + 1) > self._capacity * _MAX_LOAD:
+            self._grow()
+        h = key_hash(key)
+        i, existing = self._find(key, h)
+        if existing is None:
+            self._count += 1
+            if not key.startswith(BLOB_PREFIX):
+                self._documents += 1
+        self._set_slot(i, h, offset)
+
+    def _grow(self) -> None:
+        live = [self._slot(i) for i in range(self._capacity)]
+        documents = self._documents
+        self._create_index(self._capacity * 2)
+        self._documents = documents
+        for h, offset in live:
+            if h == 0:
+                continue
+            i = h % self._capacity
+            while self._slot(i)[0] != 0:
+                i = (i + 1) % self._capacity
+            self._set_slot(i, h, offset)
+            self._count += 1
+        self._write_index_header()
+
+    def rebuild_index(self) -> None:
+        """Recreate the index from one scan of the pack (latest record per key wins)."""
+        latest = {key: offset for _, key, offset in self._scan()}
+        capacity = _MIN_CAPACITY
+        while len(latest) > capacity * _MAX_LOAD:
+            capacity *= 2
+        self._create_index(capacity)
+        self._documents = 0
+        for key, offset in latest.items():
+            self._insert(key, offset)
+        self._write_index_header()
+
+    # -- records -------------------------------------------------------------
+
+    def _map_pack(self) -> mmap.mmap:
+        size = self._pack_size()
+        if self._pack_map is None or len(self._pack_map) < size:
+            if self._pack_map is not None:
+                self._pack_map.close()
+            self._pack_map = mmap.mmap(self._pack.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._pack_map
+
+    def _read_key(self, offset: int) -> str:
+        data = self._map_pack()
+        _, key_len, _ = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        return data[start : start + key_len].decode("utf-8")
+
+    def _read_record(self, offset: int) -> tuple[int, str, bytes]:
+        data = self._map_pack()
+        kind, key_len, data_len = _RECORD_HEADER.unpack_from(data, offset)
+        start = offset + _RECORD_HEADER.size
+        key = data[start : start + key_len].decode("utf-8")
+        return kind, key, data[start + key_len : start + key_len + data_len]
+
+    def _append(self, kind: int, key: str, payload: bytes) -> int:
+        raw_key = key.encode("utf-8")
+        self._pack.seek(0, os.SEEK_END)
+        offset = self._pack.tell()
+        self._pack.write(_RECORD_HEADER.pack(kind, len(raw_key), len(payload)) + raw_key + payload)
+        self._pack.flush()
+        self._insert(key, offset)
+        return offset
+
+    def blob_of(self, key: str) -> str | None:
+        """Content address (``sha256:<digest>``) of the document stored under ``key``, or None."""
+        _, offset = self._find(key, key_hash(key))
+        if offset is None:
+            return None
+        kind, _, data = self._read_record(offset)
+        return data.decode("ascii") if kind == RECORD_REF else None
+
+    def _scan(self) -> Iterator[tuple[int, str, int]]:
+        """Yield ``(kind, key, offset)`` for every complete record, in file order."""
+        size = self._pack_size()
+        if size <= _PACK_HEADER.size:
+            return
+        data = self._map_pack()
+        offset = _PACK_HEADER.size
+        while offset + _RECORD_HEADER.size <= size:
+            kind, key_len, data_len = _RECORD_HEADER.unpack_from(data, offset)
+            end = offset + _RECORD_HEADER.size + key_len + data_len
+            if end > size:
+                break  # torn trailing record from an interrupted append
+            start = offset + _RECORD_HEADER.size
+            yield kind, data[start : start + key_len].decode("utf-8"), offset
+            offset = end
+        if offset < size:
+            # Drop the torn tail so later appends start on a record boundary.
+            if self._pack_map is not None:
+                self._pack_map.close()
+                self._pack_map = None
+            self._pack.truncate(offset)
+
+    # -- public API ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        """Number of documents (archive keys), not counting blobs."""
+        return self._documents
+
+    def __contains__(self, key: str) -> bool:
+        return self.blob_of(key) is not None
+
+    def get_bytes(self, key: str) -> bytes | None:
+        """Return the stored (compact, uncompressed) JSON of ``key``, or None."""
+        target = self.blob_of(key)
+        if target is None:
+            return None
+        _, offset = self._find(target, key_hash(target))
+        if offset is None:
+            raise ValueError(f"{self.path}: {key} references missing blob {target}")
+        return self._decompress(self._read_record(offset)[2])
+
+    def get(self, key: str) -> dict | None:
+        raw = self.get_bytes(key)
+        return json.loads(raw) if raw is not None else None
+
+    def put(self, key: str, doc: dict) -> int:
+        """Store ``doc`` under ``key`` and return the bytes appended to the pack.
+
+        Content already in the pack is referenced rather than written again,
+        so storing a duplicate document costs only a small ref record.
+        """
+        if key.startswith(BLOB_PREFIX):
+            raise ValueError(f"archive keys may not start with {BLOB_PREFIX!r}")
+        raw = encode_doc(doc)
+        target = blob_key(raw)
+        with self._lock:
+            start = self._pack_size()
+            if self._find(target, key_hash(target))[1] is None:
+                self._append(RECORD_BLOB, target, self._compress(raw))
+            if self.blob_of(key) != target:
+                self._append(RECORD_REF, key, target.encode("ascii"))
+            return self._pack_size() - start
+
+    def keys(self) -> Iterator[str]:
+        """Yield every document key (slot order)."""
+        for i in range(self._capacity):
+            h, offset = self._slot(i)
+            if h:
+                key = self._read_key(offset)
+                if not key.startswith(BLOB_PREFIX):
+                    yield key
+
+    def dedup_stats(self) -> DedupStats:
+        """Count documents against unique blobs (one pass over the index)."""
+        refs: dict[str, int] = {}
+        sizes: dict[str, int] = {}
+        for i in range(self._capacity):
+            h, offset = self._slot(i)
+            if not h:
+                continue
+            kind, key, data = self._read_record(offset)
+            if kind == RECORD_REF:
+                target = data.decode("ascii")
+                refs[target] = refs.get(target, 0) + 1
+            else:
+                sizes[key] = len(data)
+        return DedupStats(
+            documents=sum(refs.values()),
+            blobs=len(refs),
+            logical_bytes=sum(sizes.get(target, 0) * count for target, count in refs.items()),
+            stored_bytes=sum(sizes.get(target, 0) for target in refs),
+        )
+
+
+def pack_directory(root: Path, pack_path: Path, *, codec: int | None = None) -> int:
+    """Copy every document of a directory archive into a pack; return the count."""
+    count = 0
+    with PackArchive(pack_path, codec=codec) as pack:
+        for key in iter_keys(root):
+            pack.put(key, load_json(key_path(root, key)))
+            count += 1
+    return count
+
+
+def unpack_to_directory(pack_path: Path, root: Path) -> int:
+    """Write every document of a pack back into the directory layout; return the count."""
+    count = 0
+    with PackArchive(pack_path) as pack:
+        for key in pack.keys():
+            save_json(key_path(root, key), pack.get(key))
+            count += 1
+    return count
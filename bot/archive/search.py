@@ -0,0 +1,224 @@
+"""Full-text search over archived rationales (SQLite FTS5).
+
+Indexes the CIP-0108 ``title``/``abstract``/``motivation``/``rationale`` and
+CIP-0136 ``summary``/``rationaleStatement`` fields of every archived document,
+plus reference labels and URIs, into a local SQLite database.
+
+Indexing is incremental. Each indexed document records a signature: file
+size and mtime for the directory layout, or the blob digest for a pack. A
+sync only re-reads documents whose signature changed, and drops documents
+that disappeared from the archive.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from bot.archive.layout import is_placeholder, iter_keys, key_kind, key_path, load_json
+from bot.archive.pack import PackArchive
+from bot.logging import get_logger
+
+logger = get_logger("archive.search")
+
+# Index file name, kept next to the archive it covers.
+INDEX_NAME = ".search_index.sqlite"
+
+# FTS column -> CIP body field.
+FIELDS = {
+    "title": "title",
+    "abstract": "abstract",
+    "motivation": "motivation",
+    "rationale": "rationale",
+    "summary": "summary",
+    "rationale_statement": "rationaleStatement",
+}
+# bm25 weights, in FTS column order (references last).
+_WEIGHTS = (4.0, 2.0, 1.0, 1.0, 2.0, 1.0, 0.5)
+
+# FTS rows share their rowid with ``documents.id``, so updates and deletes
+# touch a single row instead of scanning the FTS table.
+_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        key TEXT NOT NULL UNIQUE,
+        kind TEXT NOT NULL,
+        signature TEXT NOT NULL
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS rationale_fts USING fts5(
+        {", ".join(FIELDS)},
+        refs,
+        tokenize = 'porter unicode61'
+    );
+"""
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    key: str
+    kind: str
+    score: float
+    snippet: str
+
+
+@dataclass
+class SyncStats:
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+def _text(value) -> str:
+    """Flatten a CIP field (string, or JSON-LD ``@value`` / list of them) into text."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return _text(value.get("@value", ""))
+    if isinstance(value, list):
+        return "\n".join(filter(None, (_text(item) for item in value)))
+    return ""
+
+
+def _references(body: dict) -> str:
+    refs = body.get("references")
+    if not isinstance(refs, list):
+        return ""
+    parts = []
+    for ref in refs:
+        if isinstance(ref, dict):
+            parts.extend(_text(ref.get(field)) for field in ("label", "uri"))
+    return "\n".join(filter(None, parts))
+
+
+def extract_fields(doc: dict) -> dict[str, str] | None:
+    """Searchable text of a rationale document, or None if it has none (e.g. placeholders)."""
+    if is_placeholder(doc):
+        return None
+    body = doc.get("body") if isinstance(doc, dict) else None
+    if not isinstance(body, dict):
+        return None
+    fields = {column: _text(body.get(field)) for column, field in FIELDS.items()}
+    fields["refs"] = _references(body)
+    return fields if any(fields.values()) else None
+
+
+def _quote_terms(query: str) -> str:
+    """Quote every term so free text never trips FTS5 query syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class SearchIndex:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        try:
+            self._db.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self._db.close()
+            raise RuntimeError(f"SQLite FTS5 is not available: {e}") from e
+
+    def __enter__(self) -> SearchIndex:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM documents").fetchone()[0]
+
+    def _signatures(self) -> dict[str, str]:
+        return dict(self._db.execute("SELECT key, signature FROM documents"))
+
+    def _remove(self, key: str) -> None:
+        row = self._db.execute("SELECT id FROM documents WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._db.execute("DELETE FROM rationale_fts WHERE rowid = ?", row)
+            self._db.execute("DELETE FROM documents WHERE id = ?", row)
+
+    def update(self, key: str, doc: dict, signature: str) -> None:
+        """(Re)index one document. Documents without searchable text are still recorded."""
+        self._remove(key)
+        cur = self._db.execute(
+            "INSERT INTO documents (key, kind, signature) VALUES (?, ?, ?)", (key, key_kind(key), signature)
+        )
+        fields = extract_fields(doc)
+        if fields:
+            columns = ["rowid", *fields]
+            self._db.execute(
+                f"INSERT INTO rationale_fts ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                (cur.lastrowid, *fields.values()),
+            )
+
+    def _sync(self, current: Iterator[tuple[str, str]], load) -> SyncStats:
+        stats = SyncStats()
+        known = self._signatures()
+        with self._db:
+            for key, signature in current:
+                if known.pop(key, None) == signature:
+                    stats.unchanged += 1
+                    continue
+                try:
+                    doc = load(key)
+                except (OSError, ValueError):
+                    # Left unrecorded so the next sync retries it.
+                    logger.warning("Skipping unreadable document %s", key)
+                    continue
+                self.update(key, doc, signature)
+                stats.indexed += 1
+            for key in known:
+                self._remove(key)
+                stats.removed += 1
+        return stats
+
+    def sync_directory(self, root: Path) -> SyncStats:
+        """Bring the index up to date with a directory archive."""
+
+        def _current() -> Iterator[tuple[str, str]]:
+            for key in iter_keys(root):
+                st = key_path(root, key).stat()
+                yield key, f"{st.st_size}:{st.st_mtime_ns}"
+
+        return self._sync(_current(), lambda key: load_json(key_path(root, key)))
+
+    def sync_pack(self, pack: PackArchive) -> SyncStats:
+        """Bring the index up to date with a packed archive (signature = blob digest)."""
+
+        def _current() -> Iterator[tuple[str, str]]:
+            for key in pack.keys():
+                yield key, pack.blob_of(key)
+
+        return self._sync(_current(), pack.get)
+
+    def search(self, query: str, *, limit: int = 20, kind: str | None = None) -> list[SearchHit]:
+        """Return the best ``limit`` matches for ``query``, best first.
+
+        ``query`` uses FTS5 syntax (phrases, ``OR``, ``prefix*``); if it does
+        not parse, its terms are searched literally instead.
+        """
+        if not query.strip():
+            return []
+        sql = f"""
+            SELECT d.key, d.kind, bm25(rationale_fts, {", ".join(map(str, _WEIGHTS))}) AS score,
+                   snippet(rationale_fts, -1, '[', ']', '…', 16)
+            FROM rationale_fts
+            JOIN documents d ON d.id = rationale_fts.rowid
+            WHERE rationale_fts MATCH ?
+        """
+        params: list = [query]
+        if kind:
+            sql += " AND d.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        try:
+            rows = self._db.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            params[0] = _quote_terms(query)
+            rows = self._db.execute(sql, params).fetchall()
+        return [SearchHit(key, kind, -score, snippet) for key, kind, score, snippet in rows]
@@ -0,0 +1,70 @@
+"""Shard the rationale backfill across hosts and processes.
+
+Items are assigned to shards with jump consistent hashing on the governance
+action's ``tx_hash``, so an action and all of its CC votes land in the same
+shard and growing the shard count moves as few items as possible. Nested
+splits (hosts, then local worker processes) hash a different slice of the
+transaction hash at each level, keeping the sub-shards balanced.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# Hex characters of the tx hash consumed per nesting level (64 bits).
+_HEX_PER_LEVEL = 16
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Jump consistent hash (Lamping & Veach) of a 64-bit ``key`` into ``buckets``."""
+    if buckets < 1:
+        raise ValueError("buckets must be >= 1")
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return b
+
+
+def shard_of(tx_hash: str, count: int, *, level: int = 0) -> int:
+    """Return the shard (``0..count-1``) owning ``tx_hash`` at nesting ``level``."""
+    start = level * _HEX_PER_LEVEL
+    return jump_hash(int(tx_hash[start : start + _HEX_PER_LEVEL] or "0", 16), count)
+
+
+def key_tx_hash(key: str) -> str:
+    """Governance action tx hash of an archive key (``<tx_hash>_<index>[/<voter>]``)."""
+    return key.partition("_")[0]
+
+
+@dataclass(frozen=True)
+class Shard:
+    index: int
+    count: int
+    level: int = 0
+
+    def __post_init__(self) -> None:
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ValueError(f"invalid shard {self.index}/{self.count}")
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    @property
+    def label(self) -> str:
+        return f"shard-{self.index}-of-{self.count}"
+
+    def owns(self, key: str) -> bool:
+        return self.count == 1 or shard_of(key_tx_hash(key), self.count, level=self.level) == self.index
+
+
+def parse_shard(value: str) -> Shard:
+    """Parse ``"i/n"`` (as given to ``--shard``) into a :class:`Shard`."""
+    index, sep, count = value.partition("/")
+    try:
+        if not sep:
+            raise ValueError
+        return Shard(int(index), int(count))
+    except ValueError:
+        raise ValueError(f"expected a shard as i/n with 0 <= i < n, got {value!r}") from None
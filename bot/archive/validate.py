@@ -0,0 +1,236 @@
+"""Bulk CIP-0108 / CIP-0136 validation of the rationale archive.
+
+Runs the compiled CIP rules from :mod:`bot.rationale_schema` over every
+archived document and records structured findings, spreading JSON parsing
+and validation across a process pool. As inline, only error-severity
+findings make a document non-compliant. Results are cached by content hash
+(and by a hash of the rule sources, so changing a rule invalidates the
+cache), so re-runs only validate documents whose content changed.
+
+Author witnesses are verified in the same worker batches (see
+:mod:`bot.metadata.witness`); bad or unverifiable signatures are warnings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from bot import rationale_schema, rationale_validator
+from bot.archive.layout import is_placeholder, iter_keys, key_kind, key_path
+from bot.archive.pack import PackArchive
+from bot.metadata import witness
+from bot.rationale_schema import ERROR, WARNING, Finding
+from bot.rationale_validator import check_cc_vote_rationale, check_gov_action_rationale
+
+CACHE_NAME = ".validation_cache.json"
+REPORT_NAME = ".validation_report.json"
+
+_CHUNK_SIZE = 64
+
+
+def validator_version() -> str:
+    """Fingerprint of the validation rules; cached results from other versions are ignored."""
+    digest = hashlib.sha256()
+    for module in (rationale_schema, rationale_validator, witness):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+_WITNESS_FINDINGS = {
+    witness.INVALID: ("witness_invalid", "Author witness signature does not verify"),
+    witness.UNSUPPORTED: ("witness_unsupported", "Author witness algorithm is not supported"),
+    witness.UNVERIFIABLE: ("witness_unverifiable", "Author witness could not be verified"),
+}
+
+
+def check_witnesses(metadata: dict | None) -> list[Finding]:
+    """Warnings for author witnesses that do not verify (missing witnesses are schema findings)."""
+    findings = []
+    for result in witness.verify_authors(metadata):
+        if result.status in _WITNESS_FINDINGS:
+            code, message = _WITNESS_FINDINGS[result.status]
+            name = f" ({result.name})" if result.name else ""
+            findings.append(Finding(WARNING, f"authors[{result.index}].witness", code, f"{message}{name}"))
+    return findings
+
+
+def validate_document(key: str, metadata: dict | None) -> list[Finding]:
+    """Validate one archived document with the rules for its kind, then its author witnesses."""
+    if is_placeholder(metadata):
+        metadata = None
+    if key_kind(key) == "cc_vote":
+        findings = check_cc_vote_rationale(metadata)
+    else:
+        findings = check_gov_action_rationale(metadata)
+    return findings + check_witnesses(metadata)
+
+
+def _validate_raw(key: str, raw: bytes) -> list[dict]:
+    try:
+        doc = json.loads(raw)
+    except ValueError:
+        return [Finding(ERROR, "", "invalid_json", "Document is not valid JSON").as_dict()]
+    return [finding.as_dict() for finding in validate_document(key, doc if isinstance(doc, dict) else None)]
+
+
+def _validate_chunk(chunk: list[tuple[str, bytes]]) -> list[tuple[str, list[dict]]]:
+    """Process-pool task: validate a batch of raw documents."""
+    return [(key, _validate_raw(key, raw)) for key, raw in chunk]
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    key: str
+    digest: str
+    findings: list[dict]
+    cached: bool
+
+    @property
+    def errors(self) -> list[str]:
+        return [f["message"] for f in self.findings if f["severity"] == ERROR]
+
+    @property
+    def compliant(self) -> bool:
+        return not self.errors
+
+
+class ValidationCache:
+    """JSON-backed map of ``<kind>:<content digest>`` -> findings."""
+
+    def __init__(self, path: Path, version: str, results: dict[str, list[dict]] | None = None) -> None:
+        self.path = path
+        self.version = version
+        self.results = results or {}
+        self._used: set[str] = set()
+
+    @classmethod
+    def load(cls, path: Path, version: str | None = None) -> ValidationCache:
+        version = version or validator_version()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path, version)
+        if data.get("version") != version:
+            return cls(path, version)
+        return cls(path, version, data.get("results", {}))
+
+    @staticmethod
+    def _entry(key: str, digest: str) -> str:
+        # The same bytes validate differently as an action or as a CC vote.
+        return f"{key_kind(key)}:{digest}"
+
+    def get(self, key: str, digest: str) -> list[dict] | None:
+        entry = self._entry(key, digest)
+        findings = self.results.get(entry)
+        if findings is not None:
+            self._used.add(entry)
+        return findings
+
+    def put(self, key: str, digest: str, findings: list[dict]) -> None:
+        entry = self._entry(key, digest)
+        self.results[entry] = findings
+        self._used.add(entry)
+
+    def save(self) -> None:
+        """Write the cache atomically, keeping only entries used since it was loaded."""
+        results = {entry: self.results[entry] for entry in sorted(self._used)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"version": self.version, "results": results}) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# A source entry: archive key, content digest, and a loader for the raw JSON.
+SourceEntry = tuple[str, str, Callable[[], bytes]]
+
+
+def directory_source(root: Path) -> Iterator[SourceEntry]:
+    for key in iter_keys(root):
+        raw = key_path(root, key).read_bytes()
+        yield key, hashlib.sha256(raw).hexdigest(), lambda raw=raw: raw
+
+
+def pack_source(pack: PackArchive) -> Iterator[SourceEntry]:
+    """Entries of a pack; the digest is the blob address, so cache hits read nothing."""
+    for key in pack.keys():
+        yield key, pack.blob_of(key), lambda key=key: pack.get_bytes(key)
+
+
+def validate_archive(
+    entries: Iterable[SourceEntry], cache: ValidationCache, *, workers: int | None = None
+) -> list[ValidationResult]:
+    """Validate every entry not already in ``cache``, ``workers`` processes at a time."""
+    results: list[ValidationResult] = []
+    digests: dict[str, str] = {}
+    pending: list[tuple[str, bytes]] = []
+    futures = []
+
+    workers = workers or os.cpu_count() or 1
+    pool: Executor | None = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def _flush() -> None:
+        if not pending:
+            return
+        chunk = pending.copy()
+        pending.clear()
+        if pool is None:
+            futures.append(_validate_chunk(chunk))
+        else:
+            futures.append(pool.submit(_validate_chunk, chunk))
+
+    try:
+        for key, digest, load in entries:
+            findings = cache.get(key, digest)
+            if findings is not None:
+                results.append(ValidationResult(key, digest, findings, cached=True))
+                continue
+            digests[key] = digest
+            pending.append((key, load()))
+            if len(pending) >= _CHUNK_SIZE:
+                _flush()
+        _flush()
+
+        for future in futures:
+            for key, findings in future if pool is None else future.result():
+                cache.put(key, digests[key], findings)
+                results.append(ValidationResult(key, digests[key], findings, cached=False))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    results.sort(key=lambda result: result.key)
+    return results
+
+
+def build_report(results: Iterable[ValidationResult], *, version: str | None = None) -> dict:
+    """Machine-readable compliance report grouped by action, then CC voter."""
+    actions: dict[str, dict] = {}
+    summary = {"documents": 0, "compliant": 0, "non_compliant": 0, "validated": 0, "cached": 0, ERROR: 0, WARNING: 0}
+    for result in results:
+        action, _, voter = result.key.partition("/")
+        entry = actions.setdefault(action, {"action": None, "cc_votes": {}})
+        record = {"compliant": result.compliant, "findings": result.findings, "digest": result.digest}
+        if voter:
+            entry["cc_votes"][voter] = record
+        else:
+            entry["action"] = record
+
+        summary["documents"] += 1
+        summary["compliant" if result.compliant else "non_compliant"] += 1
+        summary["cached" if result.cached else "validated"] += 1
+        for finding in result.findings:
+            summary[finding["severity"]] += 1
+
+    return {
+        "generated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "validator_version": version or validator_version(),
+        "summary": summary,
+        "actions": actions,
+    }
@@ -0,0 +1,48 @@
+"""Bounded in-memory cache of recently seen blocks.
+
+Blockfrost delivers blocks in order, so the ``previous_block`` of one webhook
+is almost always the block of the webhook before it. Remembering the last few
+``(block_hash, block_no, epoch)`` entries lets epoch-transition checks skip the
+DB-Sync round trip except after a restart.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class BlockRef:
+    block_hash: str
+    block_no: int | None
+    epoch_no: int
+
+
+class BlockEpochCache:
+    """Ring of the most recent blocks, keyed by lower-case hex hash."""
+
+    def __init__(self, maxlen: int = 256) -> None:
+        self._maxlen = maxlen
+        self._entries: OrderedDict[str, BlockRef] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, block_hash: str, block_no: int | None, epoch_no: int) -> None:
+        """Remember a block, evicting the oldest entry once the ring is full."""
+        key = block_hash.lower()
+        self._entries.pop(key, None)
+        self._entries[key] = BlockRef(block_hash=key, block_no=block_no, epoch_no=epoch_no)
+        while len(self._entries) > self._maxlen:
+            self._entries.popitem(last=False)
+
+    def get(self, block_hash: str) -> BlockRef | None:
+        return self._entries.get(block_hash.lower())
+
+    def get_epoch(self, block_hash: str) -> int | None:
+        ref = self.get(block_hash)
+        return ref.epoch_no if ref is not None else None
+
+    def clear(self) -> None:
+        self._entries.clear()
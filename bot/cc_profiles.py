@@ -1,13 +1,51 @@
+"""CC member profiles keyed by voter hash.
+
+Profiles come from ``data/cc_profiles.yaml`` (or ``CC_PROFILES_SOURCE``, a
+path or an http(s) URL) and are compiled into a plain ``voter_hash ->
+CcProfile`` dict, so a lookup is one dict access. :meth:`CcProfileIndex.watch`
+re-checks the source in the background (file signature, or ``ETag`` for a
+URL) and swaps a freshly built table in with a single assignment, so
+readers always see either the old or the new table, never a partial one.
+
+A local file is read on the first lookup if nothing loaded it yet. A URL is
+only fetched by the warm-up and the watch task (both off the event loop);
+until then lookups see an empty table rather than block on the network.
+"""
+
 from __future__ import annotations
 
-from functools import lru_cache
+import asyncio
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
 from pathlib import Path
 
+from bot.config import config
+from bot.lazy import lazy_import
 from bot.logging import get_logger
 
+requests = lazy_import("requests")
+
 logger = get_logger("cc_profiles")
 
 _DEFAULT_PROFILE_PATH = Path(__file__).resolve().parent.parent / "data" / "cc_profiles.yaml"
+_DEFAULT_SOURCE = config.cc_profiles_source or str(_DEFAULT_PROFILE_PATH)
+
+_SCALAR_FIELDS = ("display_name", "voter_hash", "x_handle", "confidence", "status")
+_LIST_FIELDS = ("sources", "witness_keys")
+
+
+@dataclass(frozen=True)
+class CcProfile:
+    voter_hash: str
+    member_id: str = ""
+    display_name: str = ""
+    x_handle: str | None = None
+    confidence: str = ""
+    status: str = ""
+    sources: tuple[str, ...] = ()
+    # Ed25519 public keys (hex) the member signs CIP-100 rationales with; they back the ✓ in tweets.
+    witness_keys: tuple[str, ...] = ()
 
 
 def _strip_quotes(value: str) -> str:
@@ -23,18 +61,33 @@ def _normalise_handle(handle: str) -> str:
     return handle if handle.startswith("@") else f"@{handle}"
 
 
-def _parse_hash_to_handle(text: str) -> dict[str, str]:
-    """Parse a narrow YAML shape and return voter_hash -> X handle map."""
-    mappings: dict[str, str] = {}
-    current_hash: str | None = None
-    current_handle: str | None = None
+def _build_profile(fields: dict) -> CcProfile | None:
+    voter_hash = fields.get("voter_hash", "")
+    if not voter_hash or voter_hash.lower() == "null":
+        return None
+    return CcProfile(
+        voter_hash=voter_hash.lower(),
+        member_id=fields.get("member_id", ""),
+        display_name=fields.get("display_name", ""),
+        x_handle=_normalise_handle(fields.get("x_handle", "")) or None,
+        confidence=fields.get("confidence", ""),
+        status=fields.get("status", ""),
+        sources=tuple(fields.get("sources", ())),
+        witness_keys=tuple(key.lower() for key in fields.get("witness_keys", ()) if key),
+    )
+
+
+def _parse_profiles(text: str) -> list[CcProfile]:
+    """Parse the narrow YAML shape of ``cc_profiles.yaml`` (a ``members`` list of flat records)."""
+    profiles: list[CcProfile] = []
+    current: dict | None = None
+    list_field: str | None = None
 
     def _flush() -> None:
-        nonlocal current_hash, current_handle
-        if current_hash and current_handle:
-            mappings[current_hash] = current_handle
-        current_hash = None
-        current_handle = None
+        nonlocal current
+        if current is not None and (profile := _build_profile(current)) is not None:
+            profiles.append(profile)
+        current = None
 
     for raw_line in text.splitlines():
         line = raw_line.strip()
@@ -42,43 +95,202 @@ def _parse_hash_to_handle(text: str) -> dict[str, str]:
             continue
 
         if line.startswith("- member_id:"):
+            _flush()
+            current = {"member_id": _strip_quotes(line.split(":", 1)[1].strip()), "sources": [], "witness_keys": []}
+            list_field = None
+            continue
+
+        if not raw_line[0].isspace():
+            # A new top-level key ends the members list.
             _flush()
             continue
 
-        if line.startswith("voter_hash:"):
-            value = _strip_quotes(line.split(":", 1)[1].strip())
-            if value and value.lower() != "null":
-                current_hash = value.lower()
+        if current is None:
             continue
 
-        if line.startswith("x_handle:"):
-            value = _strip_quotes(line.split(":", 1)[1].strip())
-            current_handle = _normalise_handle(value)
+        if line.startswith("- "):
+            if list_field is not None:
+                current[list_field].append(_strip_quotes(line[2:].strip()))
             continue
 
+        key, _, value = line.partition(":")
+        list_field = key if key in _LIST_FIELDS else None
+        if key in _SCALAR_FIELDS:
+            current[key] = _strip_quotes(value.strip())
+
     _flush()
-    return mappings
+    return profiles
+
+
+class _FileSource:
+    loads_on_lookup = True
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._signature: tuple | None = None
+
+    def read_if_changed(self) -> str | None:
+        """The file's text if it changed since the last read, else None (also while it is missing).
+
+        A missing file (e.g. mid non-atomic rewrite) is not an empty one, so the last good table is kept.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._signature != ("missing",):
+                logger.warning("CC profile file not found: %s", self.path)
+                self._signature = ("missing",)
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return None
+        text = self.path.read_text(encoding="utf-8")
+        self._signature = signature
+        return text
+
+
+class _HttpSource:
+    # A blocking GET must not run inside a lookup on the event loop.
+    loads_on_lookup = False
+
+    def __init__(self, url: str, *, timeout: float = 10.0) -> None:
+        self.url = url
+        self.timeout = timeout
+        self._etag: str | None = None
+
+    def read_if_changed(self) -> str | None:
+        """The document if it changed (conditional GET on the last ``ETag``), else None."""
+        headers = {"If-None-Match": self._etag} if self._etag else {}
+        response = requests.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        self._etag = response.headers.get("ETag")
+        return response.text
+
 
+class CcProfileIndex:
+    """Compiled ``voter_hash -> CcProfile`` table over a profile source, rebuilt when the source changes."""
 
-@lru_cache(maxsize=4)
-def _load_hash_to_handle(path: str) -> dict[str, str]:
-    profile_path = Path(path)
-    if not profile_path.exists():
-        logger.warning("CC profile file not found: %s", profile_path)
-        return {}
+    def __init__(self, source: str | Path) -> None:
+        self.source = str(source)
+        if self.source.startswith(("http://", "https://")):
+            self._reader = _HttpSource(self.source)
+        else:
+            self._reader = _FileSource(Path(source))
+        self._profiles: dict[str, CcProfile] | None = None
+        self._witness_keys: dict[str, str] = {}
+        self._refresh_lock = threading.Lock()
 
-    try:
-        return _parse_hash_to_handle(profile_path.read_text(encoding="utf-8"))
-    except Exception:
-        logger.exception("Failed to load CC profile file: %s", profile_path)
-        return {}
+    def _table(self) -> dict[str, CcProfile]:
+        table = self._profiles
+        if table is None:
+            if not self._reader.loads_on_lookup:
+                return {}
+            self.refresh()
+            table = self._profiles
+        return table
+
+    def __len__(self) -> int:
+        return len(self._table())
+
+    def get(self, voter_hash: str) -> CcProfile | None:
+        return self._table().get(voter_hash.lower())
+
+    def handle(self, voter_hash: str) -> str | None:
+        profile = self._table().get(voter_hash.lower())
+        return profile.x_handle if profile is not None else None
+
+    def resolve(self, voter_hashes: Iterable[str]) -> dict[str, CcProfile | None]:
+        """Look up many voters against one table snapshot (e.g. every CC vote in a block)."""
+        table = self._table()
+        return {voter_hash: table.get(voter_hash.lower()) for voter_hash in voter_hashes}
+
+    def witness_keys(self) -> dict[str, str]:
+        """Witness public key -> the display name it is bound to, for every profile that lists keys."""
+        self._table()
+        return self._witness_keys
+
+    def refresh(self) -> bool:
+        """Rebuild the table if the source changed; True when a new table was swapped in.
+
+        A source that cannot be read keeps the current table (an empty one on first load).
+        """
+        with self._refresh_lock:
+            try:
+                text = self._reader.read_if_changed()
+            except Exception:
+                logger.warning("Failed to read CC profiles from %s", self.source, exc_info=True)
+                text = None
+            if text is None:
+                if self._profiles is None:
+                    self._profiles = {}
+                return False
+
+            profiles = _parse_profiles(text)
+            self._witness_keys = {
+                key: profile.display_name
+                for profile in profiles
+                if profile.display_name
+                for key in profile.witness_keys
+            }
+            self._profiles = {profile.voter_hash: profile for profile in profiles}
+        logger.info("Loaded %d CC profiles from %s", len(self._profiles), self.source)
+        return True
+
+    async def watch(self, interval: float) -> None:
+        """Re-check the source every ``interval`` seconds, rebuilding off the event loop.
+
+        A table nothing has loaded yet (e.g. the warm-up timed out) is loaded straight away.
+        """
+        while True:
+            if self._profiles is not None:
+                await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.warning("CC profile refresh failed", exc_info=True)
+
+
+_INDEXES: dict[str, CcProfileIndex] = {}
+
+
+def profile_index(path: str | Path | None = None) -> CcProfileIndex:
+    """The shared index for ``path`` (default: ``CC_PROFILES_SOURCE`` or ``data/cc_profiles.yaml``)."""
+    source = _DEFAULT_SOURCE if path is None else str(path)
+    index = _INDEXES.get(source)
+    if index is None:
+        index = _INDEXES.setdefault(source, CcProfileIndex(source))
+    return index
+
+
+def get_profile(voter_hash: str, *, path: Path | None = None) -> CcProfile | None:
+    return profile_index(path).get(voter_hash)
 
 
 def get_x_handle_for_voter_hash(voter_hash: str, *, path: Path | None = None) -> str | None:
-    profile_path = path or _DEFAULT_PROFILE_PATH
-    mappings = _load_hash_to_handle(str(profile_path))
-    return mappings.get(voter_hash.lower())
+    return profile_index(path).handle(voter_hash)
+
+
+def resolve_handles(voter_hashes: Iterable[str], *, path: Path | None = None) -> dict[str, str | None]:
+    """X handle (or None) for each voter hash, resolved against one table snapshot."""
+    return {
+        voter_hash: profile.x_handle if profile is not None else None
+        for voter_hash, profile in profile_index(path).resolve(voter_hashes).items()
+    }
+
+
+def trusted_witness_keys(*, path: Path | None = None) -> dict[str, str]:
+    """Witness public keys bound to a CC member's name (see :func:`bot.metadata.witness.trusted_author_indexes`)."""
+    return profile_index(path).witness_keys()
+
+
+def preload_profiles(*, path: Path | None = None) -> int:
+    """Build the index now (blocking; the warm-up runs it in a thread); returns the number of profiles."""
+    index = profile_index(path)
+    index.refresh()
+    return len(index)
 
 
 def clear_profile_cache() -> None:
-    _load_hash_to_handle.cache_clear()
+    _INDEXES.clear()
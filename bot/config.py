@@ -1,9 +1,11 @@
+import logging
 import os
 from dataclasses import dataclass, field
 
 from dotenv import load_dotenv
 
-from bot.logging import get_logger
+from bot.logging import LOG_FORMATS, get_logger, parse_levels
+from bot.rollback import ROLLBACK_WINDOW
 
 # Load .env if present — values override system env vars.
 load_dotenv(override=True)
@@ -15,6 +17,10 @@ class ConfigError(Exception):
     """Raised when required configuration is missing."""
 
 
+INGESTION_MODES = ("webhook", "polling", "both")
+TRACE_EXPORTERS = ("", "jsonl", "otlp")
+
+
 def _parse_bool(value: str | None, default: bool = False) -> bool:
     """Parse a boolean from an environment variable string."""
     if value is None:
@@ -22,6 +28,14 @@ def _parse_bool(value: str | None, default: bool = False) -> bool:
     return value.strip().lower() in ("1", "true", "yes")
 
 
+def _parse_log_levels(spec: str) -> dict[str, str]:
+    """Parse ``LOG_LEVELS``, reporting an unknown level as a configuration error."""
+    try:
+        return parse_levels(spec)
+    except ValueError as e:
+        raise ConfigError(f"LOG_LEVELS: {e}") from None
+
+
 @dataclass(frozen=True)
 class TwitterConfig:
     api_key: str = ""
@@ -45,11 +59,43 @@ class Config:
 
     # Feature flags
     tweet_posting_enabled: bool = False
+    treasury_donation_accumulator_enabled: bool = False
+
+    # Blocks to wait before querying DB-Sync for a height (0 = process the tip).
+    confirmation_depth: int = 0
+
+    # Block ingestion: Blockfrost webhooks, DB-Sync polling, or both (deduplicated).
+    ingestion_mode: str = "webhook"
+    poll_batch_size: int = 100
+    poll_min_interval_seconds: float = 2.0
+    poll_max_interval_seconds: float = 20.0
+
+    # LISTEN/NOTIFY push from DB-Sync (requires polling; the poller is the fallback)
+    dbsync_listen_enabled: bool = False
+    listen_poll_interval_seconds: float = 60.0
+
+    # CC profiles: file path or http(s) URL (empty = data/cc_profiles.yaml), re-checked every N seconds (0 = never)
+    cc_profiles_source: str = ""
+    cc_profiles_reload_seconds: float = 60.0
 
     # Firestore integration (for persistent runtime state)
     firestore_project_id: str = ""
     firestore_database: str = "(default)"
 
+    # Logging: root level, output format and per-logger level overrides
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_levels: dict[str, str] = field(default_factory=dict)
+
+    # Pipeline tracing (disabled unless an exporter is chosen)
+    trace_exporter: str = ""
+    trace_sample_rate: float = 1.0
+    trace_jsonl_path: str = "traces.jsonl"
+    trace_otlp_endpoint: str = "http://localhost:4318"
+
+    # Startup warm-up: per-step limit before /ready reports the step as timed out
+    warmup_timeout_seconds: float = 30.0
+
     # SSH tunnel (optional — only used when ssh_host is set)
     ssh_host: str = ""
     ssh_port: int = 22
@@ -68,14 +114,47 @@ class Config:
             ),
             blockfrost_webhook_auth_token=os.environ.get("BLOCKFROST_WEBHOOK_AUTH_TOKEN", ""),
             tweet_posting_enabled=_parse_bool(os.environ.get("TWEET_POSTING_ENABLED"), default=False),
+            treasury_donation_accumulator_enabled=_parse_bool(
+                os.environ.get("TREASURY_DONATION_ACCUMULATOR_ENABLED"), default=False
+            ),
+            confirmation_depth=int(os.environ.get("CONFIRMATION_DEPTH", "0")),
+            ingestion_mode=os.environ.get("INGESTION_MODE", "webhook").strip().lower(),
+            poll_batch_size=int(os.environ.get("POLL_BATCH_SIZE", "100")),
+            poll_min_interval_seconds=float(os.environ.get("POLL_MIN_INTERVAL_SECONDS", "2")),
+            poll_max_interval_seconds=float(os.environ.get("POLL_MAX_INTERVAL_SECONDS", "20")),
+            dbsync_listen_enabled=_parse_bool(os.environ.get("DBSYNC_LISTEN_ENABLED"), default=False),
+            listen_poll_interval_seconds=float(os.environ.get("LISTEN_POLL_INTERVAL_SECONDS", "60")),
+            cc_profiles_source=os.environ.get("CC_PROFILES_SOURCE", "").strip(),
+            cc_profiles_reload_seconds=float(os.environ.get("CC_PROFILES_RELOAD_SECONDS", "60")),
             firestore_project_id=os.environ.get("FIRESTORE_PROJECT_ID", ""),
             firestore_database=os.environ.get("FIRESTORE_DATABASE", "(default)"),
+            log_level=os.environ.get("LOG_LEVEL", "INFO").strip().upper(),
+            log_format=os.environ.get("LOG_FORMAT", "json").strip().lower(),
+            log_levels=_parse_log_levels(os.environ.get("LOG_LEVELS", "")),
+            trace_exporter=os.environ.get("TRACE_EXPORTER", "").strip().lower(),
+            trace_sample_rate=float(os.environ.get("TRACE_SAMPLE_RATE", "1")),
+            trace_jsonl_path=os.environ.get("TRACE_JSONL_PATH", "traces.jsonl"),
+            trace_otlp_endpoint=os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318"),
+            warmup_timeout_seconds=float(os.environ.get("WARMUP_TIMEOUT_SECONDS", "30")),
             ssh_host=os.environ.get("SSH_HOST", ""),
             ssh_port=int(os.environ.get("SSH_PORT", "22")),
             ssh_user=os.environ.get("SSH_USER", ""),
             ssh_key_path=os.environ.get("SSH_KEY_PATH", ""),
         )
 
+    @property
+    def gcp_project(self) -> str:
+        """Project used for Cloud Logging trace links."""
+        return self.firestore_project_id or os.environ.get("GOOGLE_CLOUD_PROJECT", "")
+
+    @property
+    def webhook_ingestion_enabled(self) -> bool:
+        return self.ingestion_mode in ("webhook", "both")
+
+    @property
+    def polling_ingestion_enabled(self) -> bool:
+        return self.ingestion_mode in ("polling", "both")
+
     def validate(self) -> None:
         """Check that all required config is present. Call at startup."""
         missing = []
@@ -93,6 +172,39 @@ class Config:
                 if not getattr(self.twitter, field_name):
                     missing.append(env_name)
 
+        if not 0 <= self.confirmation_depth < ROLLBACK_WINDOW:
+            raise ConfigError(f"CONFIRMATION_DEPTH must be between 0 and {ROLLBACK_WINDOW - 1}")
+
+        if self.ingestion_mode not in INGESTION_MODES:
+            raise ConfigError(f"INGESTION_MODE must be one of: {', '.join(INGESTION_MODES)}")
+
+        if self.poll_batch_size < 1:
+            raise ConfigError("POLL_BATCH_SIZE must be positive")
+
+        if not 0 < self.poll_min_interval_seconds <= self.poll_max_interval_seconds:
+            raise ConfigError("POLL_MIN_INTERVAL_SECONDS must be positive and <= POLL_MAX_INTERVAL_SECONDS")
+
+        if self.dbsync_listen_enabled and not self.polling_ingestion_enabled:
+            raise ConfigError("DBSYNC_LISTEN_ENABLED requires INGESTION_MODE=polling or both")
+
+        if self.cc_profiles_reload_seconds < 0:
+            raise ConfigError("CC_PROFILES_RELOAD_SECONDS must be >= 0 (0 disables reloading)")
+
+        if not isinstance(logging.getLevelName(self.log_level), int):
+            raise ConfigError(f"LOG_LEVEL must be a logging level name, got {self.log_level!r}")
+
+        if self.log_format not in LOG_FORMATS:
+            raise ConfigError(f"LOG_FORMAT must be one of: {', '.join(LOG_FORMATS)}")
+
+        if self.trace_exporter not in TRACE_EXPORTERS:
+            raise ConfigError("TRACE_EXPORTER must be one of: jsonl, otlp (or empty to disable)")
+
+        if not 0 <= self.trace_sample_rate <= 1:
+            raise ConfigError("TRACE_SAMPLE_RATE must be between 0 and 1")
+
+        if self.warmup_timeout_seconds <= 0:
+            raise ConfigError("WARMUP_TIMEOUT_SECONDS must be positive")
+
         if not self.blockfrost_webhook_auth_token:
             logger.warning("BLOCKFROST_WEBHOOK_AUTH_TOKEN not set — webhook signature verification disabled")
 
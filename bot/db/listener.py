@@ -0,0 +1,136 @@
+"""LISTEN/NOTIFY push ingestion from DB-Sync.
+
+``scripts/install_dbsync_notify.py`` installs triggers that ``pg_notify`` on
+every ``gov_action_proposal`` and CC ``voting_procedure`` insert. The listener
+keeps a dedicated connection subscribed to that channel and wakes the
+DB-Sync poller as soon as DB-Sync commits a block carrying governance
+activity. While subscribed, the poller only runs a slow safety-net poll;
+if the connection drops, the regular polling interval is restored until
+the listener reconnects.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable
+
+from bot.lazy import lazy_import
+from bot.logging import get_logger
+from bot.poller import DbSyncPoller
+
+psycopg = lazy_import("psycopg")
+
+logger = get_logger("db_listener")
+
+NOTIFY_CHANNEL = "gov_actions_bot"
+
+INSTALL_NOTIFY_TRIGGERS = f"""
+    CREATE OR REPLACE FUNCTION gov_actions_bot_notify() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify(
+            '{NOTIFY_CHANNEL}',
+            json_build_object('table', TG_TABLE_NAME, 'tx_id', NEW.tx_id)::text
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS gov_actions_bot_notify ON gov_action_proposal;
+    CREATE TRIGGER gov_actions_bot_notify
+        AFTER INSERT ON gov_action_proposal
+        FOR EACH ROW EXECUTE FUNCTION gov_actions_bot_notify();
+
+    DROP TRIGGER IF EXISTS gov_actions_bot_notify ON voting_procedure;
+    CREATE TRIGGER gov_actions_bot_notify
+        AFTER INSERT ON voting_procedure
+        FOR EACH ROW
+        WHEN (NEW.voter_role = 'ConstitutionalCommittee')
+        EXECUTE FUNCTION gov_actions_bot_notify();
+"""
+
+UNINSTALL_NOTIFY_TRIGGERS = """
+    DROP TRIGGER IF EXISTS gov_actions_bot_notify ON gov_action_proposal;
+    DROP TRIGGER IF EXISTS gov_actions_bot_notify ON voting_procedure;
+    DROP FUNCTION IF EXISTS gov_actions_bot_notify();
+"""
+
+
+def parse_notify_payload(payload: str) -> tuple[str, int] | None:
+    """Return ``(table, tx_id)`` from a trigger notification, or None if malformed."""
+    try:
+        data = json.loads(payload)
+        return str(data["table"]), int(data["tx_id"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class DbSyncListener:
+    """Subscribe to DB-Sync insert notifications and wake the poller."""
+
+    def __init__(
+        self,
+        poller: DbSyncPoller,
+        db_url_provider: Callable[[], str],
+        *,
+        listen_poll_interval: float = 60.0,
+        fallback_poll_interval: float = 20.0,
+        reconnect_max_delay: float = 60.0,
+    ) -> None:
+        self._poller = poller
+        self._db_url_provider = db_url_provider
+        self._listen_poll_interval = listen_poll_interval
+        self._fallback_poll_interval = fallback_poll_interval
+        self._reconnect_max_delay = reconnect_max_delay
+        self.connected = False
+
+    def _on_connected(self) -> None:
+        self.connected = True
+        self._poller.set_max_interval(self._listen_poll_interval)
+        # Catch up on anything committed while we were not subscribed.
+        self._poller.wake()
+        logger.info("Listening for DB-Sync notifications on channel %r", NOTIFY_CHANNEL)
+
+    def _on_disconnected(self) -> None:
+        if self.connected:
+            logger.warning("DB-Sync listener disconnected — falling back to polling")
+        self.connected = False
+        self._poller.set_max_interval(self._fallback_poll_interval)
+        self._poller.wake()
+
+    def handle_notify(self, payload: str) -> None:
+        parsed = parse_notify_payload(payload)
+        if parsed is None:
+            logger.warning("Ignoring malformed DB-Sync notification: %r", payload)
+            return
+        table, tx_id = parsed
+        logger.info("DB-Sync notification: %s insert in tx_id %s", table, tx_id)
+        self._poller.wake()
+
+    async def listen_once(self) -> None:
+        """Subscribe and dispatch notifications until the connection drops."""
+        conn = await psycopg.AsyncConnection.connect(conninfo=self._db_url_provider(), autocommit=True)
+        try:
+            await conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            self._on_connected()
+            async for notify in conn.notifies():
+                self.handle_notify(notify.payload)
+        finally:
+            await conn.close()
+
+    async def run(self) -> None:
+        """Listen until cancelled, reconnecting with exponential backoff."""
+        delay = 0.0
+        while True:
+            try:
+                await self.listen_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("DB-Sync listener connection failed", exc_info=True)
+
+            # Reset the backoff after a connection that actually subscribed.
+            delay = 1.0 if self.connected else min(max(delay * 2, 1.0), self._reconnect_max_delay)
+            self._on_disconnected()
+            logger.info("Reconnecting DB-Sync listener in %.0fs", delay)
+            await asyncio.sleep(delay)
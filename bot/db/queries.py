@@ -11,19 +11,19 @@ QUERY_GOV_ACTIONS = """
     WHERE b.block_no = %s
 """
 
+# Per-block CC votes carry the voter's hot key id; the repository maps it to the
+# cold credential through the epoch's committee (QUERY_EPOCH_COMMITTEE).
 QUERY_CC_VOTES = """
     SELECT DISTINCT
         encode(t1.hash, 'hex') AS ga_tx_hash,
         gap.index AS ga_index,
         encode(t2.hash, 'hex') AS vote_tx_hash,
-        encode(cold_ch.raw, 'hex') AS voter_hash,
+        vp.committee_voter AS hot_key_id,
         vp."vote",
-        va.url
+        va.url,
+        b.epoch_no
     FROM gov_action_proposal gap
     JOIN voting_procedure vp ON gap.id = vp.gov_action_proposal_id
-    JOIN committee_hash ch ON vp.committee_voter = ch.id
-    JOIN committee_registration cr ON cr.hot_key_id = ch.id
-    JOIN committee_hash cold_ch ON cr.cold_key_id = cold_ch.id
     JOIN voting_anchor va ON vp.voting_anchor_id = va.id
     JOIN tx t1 ON gap.tx_id = t1.id
     JOIN tx t2 ON vp.tx_id = t2.id
@@ -32,25 +32,95 @@ QUERY_CC_VOTES = """
     AND b.block_no = %s
 """
 
-QUERY_TREASURY_DONATIONS = """
+# Members of the committee in force for an epoch, with every hot key each has
+# authorised (latest registration last, so it wins for a re-used hot key).
+QUERY_EPOCH_COMMITTEE = """
     SELECT
-        b.block_no,
-        encode(t.hash, 'hex') AS tx_hash,
-        t.treasury_donation
+        encode(cold_ch.raw, 'hex') AS cold_hash,
+        cr.hot_key_id
+    FROM epoch_state es
+    JOIN committee_member cm ON cm.committee_id = es.committee_id
+    JOIN committee_hash cold_ch ON cm.committee_hash_id = cold_ch.id
+    LEFT JOIN committee_registration cr ON cr.cold_key_id = cold_ch.id
+    WHERE es.epoch_no = %s
+    ORDER BY cr.id NULLS FIRST
+"""
+
+# Hot keys the epoch committee does not know (authorised after it was loaded).
+QUERY_COLD_KEYS_FOR_HOT_KEYS = """
+    SELECT
+        cr.hot_key_id,
+        encode(cold_ch.raw, 'hex') AS cold_hash
+    FROM committee_registration cr
+    JOIN committee_hash cold_ch ON cr.cold_key_id = cold_ch.id
+    WHERE cr.hot_key_id = ANY(%s)
+    ORDER BY cr.id
+"""
+
+QUERY_TREASURY_DONATION_SUMMARY = """
+    SELECT
+        COUNT(*),
+        COALESCE(SUM(t.treasury_donation), 0)
     FROM tx t
     JOIN block b ON t.block_id = b.id
     WHERE t.treasury_donation > 0
     AND b.epoch_no = %s
 """
 
+QUERY_BLOCK_TREASURY_DONATION_SUMMARY = """
+    SELECT
+        b.epoch_no,
+        COUNT(t.id),
+        COALESCE(SUM(t.treasury_donation), 0)
+    FROM block b
+    LEFT JOIN tx t ON t.block_id = b.id AND t.treasury_donation > 0
+    WHERE b.block_no = %s
+    GROUP BY b.epoch_no
+"""
+
+QUERY_EPOCH_BLOCK_RANGE = """
+    SELECT MIN(b.block_no), MAX(b.block_no)
+    FROM block b
+    WHERE b.epoch_no = %s
+"""
+
 QUERY_BLOCK_EPOCH = """
     SELECT b.epoch_no
     FROM block b
     WHERE b.hash = decode(%s, 'hex')
 """
 
-QUERY_ALL_GOV_ACTIONS = """
+QUERY_BLOCK_EPOCH_AT_HEIGHT = """
+    SELECT b.epoch_no
+    FROM block b
+    WHERE b.block_no = %s
+"""
+
+QUERY_BLOCKS_AFTER_ID = """
+    SELECT
+        b.id,
+        encode(b.hash, 'hex') AS block_hash,
+        b.block_no,
+        b.epoch_no,
+        encode(pb.hash, 'hex') AS previous_hash
+    FROM block b
+    LEFT JOIN block pb ON b.previous_id = pb.id
+    WHERE b.id > %s
+    AND b.block_no IS NOT NULL
+    ORDER BY b.id
+    LIMIT %s
+"""
+
+QUERY_LATEST_BLOCK_ID = """
+    SELECT max(b.id)
+    FROM block b
+"""
+
+# Incremental backfill: rows above a high-water mark, in id order so the
+# mark can be advanced to the last id seen.
+QUERY_GOV_ACTIONS_AFTER_TX_ID = """
     SELECT
+        gap.tx_id,
         encode(t.hash, 'hex') AS tx_hash,
         gap."type",
         gap.index,
@@ -58,23 +128,37 @@ QUERY_ALL_GOV_ACTIONS = """
     FROM gov_action_proposal gap
     JOIN voting_anchor va ON gap.voting_anchor_id = va.id
     JOIN tx t ON gap.tx_id = t.id
+    WHERE gap.tx_id > %s
+    ORDER BY gap.tx_id, gap.index
 """
 
-QUERY_ALL_CC_VOTES = """
+# Backfilled votes are attributed to the cold credential whose registration of
+# the hot key was in force when the vote was cast, so a hot key registered by
+# more than one cold credential still yields one row per vote.
+QUERY_CC_VOTES_AFTER_ID = """
     SELECT DISTINCT
+        vp.id,
         encode(t1.hash, 'hex') AS ga_tx_hash,
         gap.index AS ga_index,
         encode(t2.hash, 'hex') AS vote_tx_hash,
         encode(cold_ch.raw, 'hex') AS voter_hash,
         vp."vote",
         va.url
-    FROM gov_action_proposal gap
-    JOIN voting_procedure vp ON gap.id = vp.gov_action_proposal_id
-    JOIN committee_hash ch ON vp.committee_voter = ch.id
-    JOIN committee_registration cr ON cr.hot_key_id = ch.id
-    JOIN committee_hash cold_ch ON cr.cold_key_id = cold_ch.id
+    FROM voting_procedure vp
+    JOIN gov_action_proposal gap ON gap.id = vp.gov_action_proposal_id
+    JOIN LATERAL (
+        SELECT cr.cold_key_id
+        FROM committee_registration cr
+        WHERE cr.hot_key_id = vp.committee_voter
+        AND cr.tx_id <= vp.tx_id
+        ORDER BY cr.tx_id DESC, cr.cert_index DESC
+        LIMIT 1
+    ) reg ON TRUE
+    JOIN committee_hash cold_ch ON reg.cold_key_id = cold_ch.id
     JOIN voting_anchor va ON vp.voting_anchor_id = va.id
     JOIN tx t1 ON gap.tx_id = t1.id
     JOIN tx t2 ON vp.tx_id = t2.id
     WHERE vp.voter_role = 'ConstitutionalCommittee'
+    AND vp.id > %s
+    ORDER BY vp.id
 """
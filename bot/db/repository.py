@@ -1,21 +1,31 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
-
-import psycopg
+from collections.abc import AsyncIterator, Callable
+from dataclasses import replace
 
+from bot import metrics
 from bot.config import config
 from bot.db.queries import (
-    QUERY_ALL_CC_VOTES,
-    QUERY_ALL_GOV_ACTIONS,
     QUERY_BLOCK_EPOCH,
+    QUERY_BLOCK_EPOCH_AT_HEIGHT,
+    QUERY_BLOCK_TREASURY_DONATION_SUMMARY,
+    QUERY_BLOCKS_AFTER_ID,
     QUERY_CC_VOTES,
+    QUERY_CC_VOTES_AFTER_ID,
+    QUERY_COLD_KEYS_FOR_HOT_KEYS,
+    QUERY_EPOCH_BLOCK_RANGE,
+    QUERY_EPOCH_COMMITTEE,
     QUERY_GOV_ACTIONS,
-    QUERY_TREASURY_DONATIONS,
+    QUERY_GOV_ACTIONS_AFTER_TX_ID,
+    QUERY_LATEST_BLOCK_ID,
+    QUERY_TREASURY_DONATION_SUMMARY,
 )
+from bot.lazy import lazy_import
 from bot.logging import get_logger
-from bot.models import CcVote, GovAction, TreasuryDonation
+from bot.models import Block, CcVote, EpochCommittee, GovAction, TreasuryDonationSummary
+
+psycopg = lazy_import("psycopg")
 
 logger = get_logger("db_repository")
 
@@ -24,6 +34,11 @@ _lock = asyncio.Lock()
 _effective_db_url: str = config.db_sync_url
 _db_url_provider: Callable[[], str] | None = None
 _conn_db_url: str | None = None
+_committee: EpochCommittee | None = None
+_committee_listener: Callable[[EpochCommittee], None] | None = None
+
+# Rows fetched per round trip when streaming full-table scans.
+DEFAULT_STREAM_ITERSIZE = 2000
 
 
 def set_db_url(url: str) -> None:
@@ -38,6 +53,12 @@ def set_db_url_provider(provider: Callable[[], str] | None) -> None:
     _db_url_provider = provider
 
 
+def set_committee_listener(listener: Callable[[EpochCommittee], None] | None) -> None:
+    """Set a callable invoked with each newly loaded epoch committee."""
+    global _committee_listener
+    _committee_listener = listener
+
+
 def _resolve_db_url() -> str:
     """Return the current DB URL, consulting the provider when configured."""
     global _effective_db_url
@@ -46,6 +67,11 @@ def _resolve_db_url() -> str:
     return _effective_db_url
 
 
+def get_db_url() -> str:
+    """Return the effective DB URL (tunnelled when SSH is configured)."""
+    return _resolve_db_url()
+
+
 async def _reset_conn() -> None:
     """Close and clear the shared connection, ignoring close errors."""
     global _conn, _conn_db_url
@@ -78,6 +104,12 @@ async def _get_conn() -> psycopg.AsyncConnection:
     return _conn
 
 
+async def connect() -> None:
+    """Open the shared connection ahead of the first query (startup warm-up)."""
+    async with _lock:
+        await _get_conn()
+
+
 async def close_conn() -> None:
     """Close the shared connection, if open."""
     async with _lock:
@@ -107,6 +139,7 @@ async def _query(sql: str, params: tuple) -> list[tuple]:
                 await _reset_conn()
                 if attempt == 0:
                     logger.warning("Database query failed; resetting connection and retrying once", exc_info=True)
+                    metrics.RETRIES.inc("db_query")
                     continue
                 raise
             except Exception:
@@ -115,6 +148,25 @@ async def _query(sql: str, params: tuple) -> list[tuple]:
     raise RuntimeError("Database query retry loop exited unexpectedly")
 
 
+async def _stream(sql: str, params: tuple, *, name: str, itersize: int) -> AsyncIterator[tuple]:
+    """Yield rows from a named server-side cursor, ``itersize`` rows per round trip.
+
+    Uses a dedicated connection so a long scan neither holds the shared lock
+    nor materialises the full result set client-side.
+    """
+    conn = await psycopg.AsyncConnection.connect(conninfo=_resolve_db_url())
+    try:
+        # Named (server-side) cursors live inside a transaction.
+        async with conn.transaction():
+            async with conn.cursor(name=name) as cur:
+                cur.itersize = itersize
+                await cur.execute(sql, params)
+                async for row in cur:
+                    yield row
+    finally:
+        await conn.close()
+
+
 async def get_gov_actions(block_no: int) -> list[GovAction]:
     rows = await _query(QUERY_GOV_ACTIONS, (block_no,))
     return [
@@ -128,31 +180,92 @@ async def get_gov_actions(block_no: int) -> list[GovAction]:
     ]
 
 
+async def get_epoch_committee(epoch_no: int) -> EpochCommittee:
+    """Return the committee in force for ``epoch_no``, querying DB-Sync only when the epoch changes."""
+    global _committee
+    committee = _committee
+    if committee is not None and committee.epoch_no == epoch_no:
+        return committee
+
+    rows = await _query(QUERY_EPOCH_COMMITTEE, (epoch_no,))
+    committee = EpochCommittee(
+        epoch_no=epoch_no,
+        members=frozenset(cold_hash for cold_hash, _ in rows),
+        cold_by_hot={hot_key_id: cold_hash for cold_hash, hot_key_id in rows if hot_key_id is not None},
+    )
+    _committee = committee
+    logger.info(
+        "Loaded committee for epoch %s: %d members, %d hot keys",
+        epoch_no,
+        len(committee.members),
+        len(committee.cold_by_hot),
+    )
+    if _committee_listener is not None and committee.members:
+        try:
+            _committee_listener(committee)
+        except Exception:
+            logger.warning("Committee listener failed", exc_info=True)
+    return committee
+
+
 async def get_cc_votes(block_no: int) -> list[CcVote]:
+    global _committee
     rows = await _query(QUERY_CC_VOTES, (block_no,))
-    return [
-        CcVote(
-            ga_tx_hash=row[0],
-            ga_index=row[1],
-            vote_tx_hash=row[2],
-            voter_hash=row[3],
-            vote=row[4],
-            raw_url=row[5],
+    if not rows:
+        return []
+
+    committee = await get_epoch_committee(rows[0][6])
+    cold_by_hot = committee.cold_by_hot
+    unknown = {row[3] for row in rows} - cold_by_hot.keys()
+    if unknown:
+        # Hot keys authorised since the committee was loaded. The committee is frozen and shared
+        # (e.g. with the listener), so cache a copy that remembers them for the rest of the epoch.
+        found = await _query(QUERY_COLD_KEYS_FOR_HOT_KEYS, (sorted(unknown),))
+        cold_by_hot = {**cold_by_hot, **dict(found)}
+        if found and _committee is committee:
+            _committee = replace(committee, cold_by_hot=cold_by_hot)
+
+    votes = []
+    for row in rows:
+        voter_hash = cold_by_hot.get(row[3])
+        if voter_hash is None:
+            logger.warning("CC vote in tx %s from unregistered hot key id %s — skipping", row[2][:8], row[3])
+            continue
+        votes.append(
+            CcVote(
+                ga_tx_hash=row[0],
+                ga_index=row[1],
+                vote_tx_hash=row[2],
+                voter_hash=voter_hash,
+                vote=row[4],
+                raw_url=row[5],
+            )
         )
-        for row in rows
-    ]
+    return votes
 
 
-async def get_treasury_donations(epoch_no: int) -> list[TreasuryDonation]:
-    rows = await _query(QUERY_TREASURY_DONATIONS, (epoch_no,))
-    return [
-        TreasuryDonation(
-            block_no=row[0],
-            tx_hash=row[1],
-            amount_lovelace=row[2],
-        )
-        for row in rows
-    ]
+async def get_treasury_donation_summary(epoch_no: int) -> TreasuryDonationSummary:
+    """Return the donation count and total for an epoch, aggregated in SQL."""
+    rows = await _query(QUERY_TREASURY_DONATION_SUMMARY, (epoch_no,))
+    count, total = rows[0] if rows else (0, 0)
+    return TreasuryDonationSummary(epoch_no=epoch_no, count=count, total_lovelace=int(total))
+
+
+async def get_block_treasury_donation_summary(block_no: int) -> TreasuryDonationSummary | None:
+    """Return the donations contained in a single block, or None if the block is unknown."""
+    rows = await _query(QUERY_BLOCK_TREASURY_DONATION_SUMMARY, (block_no,))
+    if not rows:
+        return None
+    epoch_no, count, total = rows[0]
+    return TreasuryDonationSummary(epoch_no=epoch_no, count=count, total_lovelace=int(total))
+
+
+async def get_epoch_block_range(epoch_no: int) -> tuple[int, int] | None:
+    """Return the first and last block numbers DB-Sync holds for an epoch, or None if it has none."""
+    rows = await _query(QUERY_EPOCH_BLOCK_RANGE, (epoch_no,))
+    if not rows or rows[0][0] is None:
+        return None
+    return rows[0][0], rows[0][1]
 
 
 async def get_block_epoch(block_hash: str) -> int | None:
@@ -161,23 +274,54 @@ async def get_block_epoch(block_hash: str) -> int | None:
     return rows[0][0] if rows else None
 
 
-async def get_all_gov_actions() -> list[GovAction]:
-    """Return all governance actions (for backfill)."""
-    rows = await _query(QUERY_ALL_GOV_ACTIONS, ())
-    return [GovAction(tx_hash=row[0], action_type=row[1], index=row[2], raw_url=row[3]) for row in rows]
+async def get_block_epoch_at_height(block_no: int) -> int | None:
+    """Return the epoch number of the canonical block at ``block_no``."""
+    rows = await _query(QUERY_BLOCK_EPOCH_AT_HEIGHT, (block_no,))
+    return rows[0][0] if rows else None
 
 
-async def get_all_cc_votes() -> list[CcVote]:
-    """Return all CC member votes (for backfill)."""
-    rows = await _query(QUERY_ALL_CC_VOTES, ())
+async def get_blocks_after(block_id: int, limit: int) -> list[Block]:
+    """Return up to ``limit`` blocks with a DB id above ``block_id``, oldest first."""
+    rows = await _query(QUERY_BLOCKS_AFTER_ID, (block_id, limit))
     return [
-        CcVote(
-            ga_tx_hash=row[0],
-            ga_index=row[1],
-            vote_tx_hash=row[2],
-            voter_hash=row[3],
-            vote=row[4],
-            raw_url=row[5],
+        Block(
+            id=row[0],
+            hash=row[1],
+            block_no=row[2],
+            epoch_no=row[3],
+            previous_hash=row[4],
         )
         for row in rows
     ]
+
+
+async def get_latest_block_id() -> int | None:
+    """Return the DB id of the most recent block DB-Sync has ingested."""
+    rows = await _query(QUERY_LATEST_BLOCK_ID, ())
+    return rows[0][0] if rows else None
+
+
+async def iter_gov_actions_after(
+    tx_id: int, *, itersize: int = DEFAULT_STREAM_ITERSIZE
+) -> AsyncIterator[tuple[int, GovAction]]:
+    """Stream ``(tx_id, action)`` for every governance action with ``tx.id`` above ``tx_id``."""
+    async for row in _stream(QUERY_GOV_ACTIONS_AFTER_TX_ID, (tx_id,), name="gov_actions_after", itersize=itersize):
+        yield row[0], GovAction(tx_hash=row[1], action_type=row[2], index=row[3], raw_url=row[4])
+
+
+async def iter_cc_votes_after(
+    vote_id: int, *, itersize: int = DEFAULT_STREAM_ITERSIZE
+) -> AsyncIterator[tuple[int, CcVote]]:
+    """Stream ``(voting_procedure.id, vote)`` for every CC vote above ``vote_id``."""
+    async for row in _stream(QUERY_CC_VOTES_AFTER_ID, (vote_id,), name="cc_votes_after", itersize=itersize):
+        yield (
+            row[0],
+            CcVote(
+                ga_tx_hash=row[1],
+                ga_index=row[2],
+                vote_tx_hash=row[3],
+                voter_hash=row[4],
+                vote=row[5],
+                raw_url=row[6],
+            ),
+        )
@@ -0,0 +1,58 @@
+"""Deferred imports for heavy dependencies.
+
+``firestore``, ``xdk``, ``psycopg``, ``requests`` and friends together take
+most of a cold start to import. Modules bind them with :func:`lazy_import`
+instead, so the import happens on first attribute access (a request, or the
+background warm-up in :mod:`bot.warmup`) rather than at process start.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module and imports it the first time an attribute is read."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            module = self.__dict__["_lazy_target"] = importlib.import_module(self.__name__)
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return ``name`` if it is already imported, otherwise a :class:`LazyModule` for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def is_available(module: types.ModuleType | None) -> bool:
+    """Import ``module`` now if it is lazy; False if it (an optional dependency) is missing."""
+    if module is None:
+        return False
+    if isinstance(module, LazyModule):
+        try:
+            module._load()
+        except ImportError:
+            return False
+    return True
+
+
+def is_loaded(module: types.ModuleType | None) -> bool:
+    """Whether ``module`` has actually been imported (without importing it)."""
+    if isinstance(module, LazyModule):
+        return module.__dict__["_lazy_target"] is not None
+    return module is not None
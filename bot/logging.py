@@ -1,18 +1,142 @@
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
 
+LOG_FORMATS = ("json", "text")
 
-def setup_logging(level: int = logging.INFO) -> None:
+# Fields attached to every record logged inside ``log_context`` (e.g. block_no, trace).
+_context: ContextVar[dict] = ContextVar("log_context", default={})
+
+_TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+_CLOUD_TRACE = "logging.googleapis.com/trace"
+
+# Argument types safe to format later, on the listener thread.
+_IMMUTABLE = (str, bytes, int, float, bool, type(None))
+
+_listener: QueueListener | None = None
+_queue_handler: QueueHandler | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, using the fields Cloud Logging recognises."""
+
+    def __init__(self, project: str = "") -> None:
+        super().__init__()
+        self.project = project
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        if record.exc_text:
+            # Error Reporting picks stack traces up from the message text.
+            message = f"{message}\n{record.exc_text}"
+        entry = {
+            "severity": record.levelname,
+            "message": message,
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "logger": record.name,
+        }
+        context = dict(getattr(record, "log_context", None) or {})
+        trace = context.pop("trace", None)
+        if trace:
+            entry[_CLOUD_TRACE] = f"projects/{self.project}/traces/{trace}" if self.project else trace
+        entry.update(context)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """Enqueue records with their context; formatting and I/O happen on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if not (isinstance(record.args, tuple) and all(isinstance(a, _IMMUTABLE) for a in record.args)):
+            # Mutable arguments may change before the listener runs, so merge them now.
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.log_context = _context.get()
+        return record
+
+
+def parse_levels(spec: str) -> dict[str, str]:
+    """Parse ``"bot.twitter.client=WARNING,bot.db=DEBUG"`` into logger -> level."""
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        level = level.strip().upper()
+        if not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Unknown log level {level!r} for logger {name.strip()!r}")
+        levels[name.strip()] = level
+    return levels
+
+
+def setup_logging(
+    level: int | str = logging.INFO,
+    *,
+    fmt: str = "text",
+    levels: dict[str, str] | None = None,
+    project: str = "",
+    stream: TextIO | None = None,
+) -> None:
     """Configure logging for the application.
 
-    Uses a simple format for local development / Cloud Run structured logging.
-    Call once at application startup.
+    Records go through a ``QueueHandler`` to a ``QueueListener`` thread that
+    formats and writes them to ``stream`` (stdout by default), so a slow stdout never blocks the
+    event loop. ``fmt="json"`` emits Cloud Logging structured entries;
+    ``levels`` overrides the level of individual loggers. Call once at
+    application startup (calling again reconfigures).
     """
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        stream=sys.stdout,
-    )
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter(project) if fmt == "json" else logging.Formatter(_TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _ContextQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, output, respect_handler_level=False)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    for name, logger_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+
+def shutdown_logging() -> None:
+    """Detach the queue handler and flush pending records."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach ``fields`` (e.g. ``block_no``, ``trace``) to every record logged in this block."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -1,61 +1,185 @@
 """Cardano Governance Actions Bot — webhook entry point."""
 
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager, contextmanager
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
-from bot.cc_profiles import get_x_handle_for_voter_hash
+from bot import metrics, tracing, warmup
+from bot.block_cache import BlockEpochCache
+from bot.cc_profiles import profile_index, resolve_handles
 from bot.config import config
 from bot.db.repository import (
     get_block_epoch,
+    get_block_epoch_at_height,
+    get_block_treasury_donation_summary,
     get_cc_votes,
+    get_epoch_block_range,
     get_gov_actions,
-    get_treasury_donations,
+    get_treasury_donation_summary,
 )
-from bot.logging import get_logger, setup_logging
+from bot.logging import get_logger, log_context, setup_logging
 from bot.metadata.fetcher import fetch_metadata, sanitise_url
+from bot.models import EpochCommittee
+from bot.poller import DbSyncPoller
 from bot.rationale_validator import validate_cc_vote_rationale, validate_gov_action_rationale
+from bot.rollback import ChainTracker
 from bot.state_store import (
     get_action_tweet_id,
+    get_checkpoint,
+    get_epoch_treasury_donations,
+    is_action_archived,
+    is_cc_vote_archived,
+    is_epoch_summarised,
     mark_cc_vote_archived,
+    mark_epoch_summarised,
+    record_block_treasury_donations,
     save_action_tweet_id,
     set_checkpoint,
 )
-from bot.twitter.client import post_quote_tweet, post_tweet
+from bot.twitter.client import TweetTooLongError, post_quote_tweet, post_thread, post_tweet
 from bot.twitter.formatter import (
     format_cc_vote_tweet,
     format_gov_action_tweet,
-    format_treasury_donations_tweet,
+    format_treasury_donation_summary_tweet,
 )
+from bot.twitter.text import split_thread
 from bot.webhook_auth import verify_webhook_signature
 
-setup_logging()
+# Validate config at startup — fail fast on missing required vars, and before the
+# LOG_* settings are applied.
+config.validate()
+
+setup_logging(config.log_level, fmt=config.log_format, levels=config.log_levels, project=config.gcp_project)
 logger = get_logger("main")
 
-# Validate config at startup — fail fast on missing required vars.
-config.validate()
+CHECKPOINT_NAME = "blockfrost_main"
+
+# Recently seen blocks, so epoch checks rarely need to hit DB-Sync.
+_block_cache = BlockEpochCache()
+
+# Recent block hashes and processed heights, for rollback detection.
+_chain = ChainTracker()
+
+# Serialises blocks from the webhook and the poller so "both" mode cannot race.
+_pipeline_lock = asyncio.Lock()
+
+
+# Cleared by the lifespan until the checkpoint restore has run (or given up), so no block is
+# processed against chain state that the restore would then overwrite.
+_chain_restored = asyncio.Event()
+_chain_restored.set()
+
+
+async def _restore_chain_state() -> None:
+    """Prime the block cache and rollback window from the last checkpoint, if any.
+
+    The read runs in a thread but is applied here on the event loop, so when the warm-up times out
+    and cancels this coroutine, a read that completes later is dropped instead of rewinding live state.
+    """
+    try:
+        checkpoint = await asyncio.to_thread(get_checkpoint, CHECKPOINT_NAME)
+        if checkpoint:
+            _apply_checkpoint(checkpoint)
+    finally:
+        _chain_restored.set()
+
+
+def _apply_checkpoint(checkpoint: dict) -> None:
+    _chain.restore(checkpoint)
+    block_hash = checkpoint.get("last_block_hash")
+    epoch_no = checkpoint.get("last_epoch")
+    if block_hash and epoch_no is not None:
+        _block_cache.record(block_hash, checkpoint.get("last_block_no"), epoch_no)
+
+
+def _flag_unprofiled_members(committee: EpochCommittee) -> None:
+    """Warn (once per epoch) about committee members with no X handle in the CC profile file."""
+    handles = resolve_handles(committee.members)
+    missing = sorted(voter_hash for voter_hash, handle in handles.items() if not handle)
+    if missing:
+        logger.warning(
+            "Epoch %s committee members missing from CC profiles: %s", committee.epoch_no, ", ".join(missing)
+        )
+
+
+async def _after_warm_up(warmup_task: asyncio.Task, run: Callable[[], Awaitable[None]]) -> None:
+    """Start ``run`` once the warm-up has restored chain state, so polling resumes from the checkpoint."""
+    await asyncio.wait({warmup_task})
+    await run()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage SSH tunnel lifecycle (if configured)."""
+    """Manage SSH tunnel lifecycle (if configured), startup warm-up, CC profile reloads and the DB-Sync poller."""
     tunnel_manager = None
-    from bot.db.repository import close_conn, set_db_url_provider
+    from bot.db.repository import close_conn, get_db_url, set_committee_listener, set_db_url_provider
 
     if config.ssh_host:
-        from bot.db.repository import set_db_url
         from bot.db.ssh_tunnel import SshTunnelManager
 
+        # The tunnel itself is opened by the warm-up (or the first query).
         tunnel_manager = SshTunnelManager(config)
         set_db_url_provider(tunnel_manager.get_tunneled_url)
-        set_db_url(tunnel_manager.get_tunneled_url())
+
+    tracing.configure(
+        tracing.exporter_from_config(
+            config.trace_exporter,
+            jsonl_path=config.trace_jsonl_path,
+            otlp_endpoint=config.trace_otlp_endpoint,
+        ),
+        sample_rate=config.trace_sample_rate,
+    )
+
+    set_committee_listener(_flag_unprofiled_members)
+
+    # Tunnel, DB, Firestore (+ chain checkpoint) and X are warmed concurrently; GET /ready reports progress.
+    # Blocks wait for the checkpoint restore, or for the warm-up to end if Firestore is skipped.
+    _chain_restored.clear()
+    warmup_task = asyncio.create_task(
+        warmup.warm_up(warmup.default_steps(tunnel_manager=tunnel_manager, restore_chain_state=_restore_chain_state))
+    )
+    warmup_task.add_done_callback(lambda _task: _chain_restored.set())
+
+    background_tasks: list[asyncio.Task] = []
+    if config.cc_profiles_reload_seconds > 0:
+        background_tasks.append(asyncio.create_task(profile_index().watch(config.cc_profiles_reload_seconds)))
+
+    if config.polling_ingestion_enabled:
+        poller = DbSyncPoller(
+            _process_block,
+            batch_size=config.poll_batch_size,
+            min_interval=config.poll_min_interval_seconds,
+            max_interval=config.poll_max_interval_seconds,
+        )
+        background_tasks.append(asyncio.create_task(_after_warm_up(warmup_task, poller.run)))
+        logger.info("DB-Sync polling ingestion enabled (INGESTION_MODE=%s)", config.ingestion_mode)
+
+        if config.dbsync_listen_enabled:
+            from bot.db.listener import DbSyncListener
+
+            listener = DbSyncListener(
+                poller,
+                get_db_url,
+                listen_poll_interval=config.listen_poll_interval_seconds,
+                fallback_poll_interval=config.poll_max_interval_seconds,
+            )
+            background_tasks.append(asyncio.create_task(_after_warm_up(warmup_task, listener.run)))
 
     try:
         yield
     finally:
+        warmup_task.cancel()
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
         await close_conn()
+        tracing.shutdown()
         set_db_url_provider(None)
+        set_committee_listener(None)
         if tunnel_manager is not None:
             tunnel_manager.stop()
             logger.info("SSH tunnel stopped")
@@ -64,77 +188,148 @@ async def lifespan(app: FastAPI):
 app = FastAPI(lifespan=lifespan)
 
 
+@contextmanager
+def _stage(name: str, **attributes):
+    """Time a pipeline stage in the metrics histogram and as a trace span."""
+    with metrics.stage(name), tracing.span(name, **attributes):
+        yield
+
+
 # ---------------------------------------------------------------------------
 # Block processing
 # ---------------------------------------------------------------------------
 
 
 async def _process_gov_actions(block_no: int) -> None:
-    actions = await get_gov_actions(block_no)
+    with _stage("query"):
+        actions = await get_gov_actions(block_no)
 
     if not actions:
         logger.info("No gov actions for block: %s", block_no)
         return
 
     for action in actions:
-        url = sanitise_url(action.raw_url)
-        metadata = fetch_metadata(url)
-
-        # Validate rationale (non-blocking).
-        warnings = validate_gov_action_rationale(metadata)
-        for w in warnings:
-            logger.warning("CIP-0108 validation [%s#%s]: %s", action.tx_hash[:8], action.index, w)
-
-        tweet = format_gov_action_tweet(action, metadata)
-        tweet_id = post_tweet(tweet)
-        save_action_tweet_id(action.tx_hash, action.index, tweet_id or "", source_block=block_no)
+        with tracing.span("gov_action", tx_hash=action.tx_hash, index=action.index):
+            # Checked for every item: after a rollback an orphaned action is often re-included higher up.
+            if is_action_archived(action.tx_hash, action.index):
+                logger.info("Gov action %s#%s already archived — skipping", action.tx_hash[:8], action.index)
+                metrics.ITEMS.inc("gov_action", "skipped")
+                continue
+
+            url = sanitise_url(action.raw_url)
+            with _stage("fetch", url=url):
+                metadata = fetch_metadata(url)
+
+            # Validate rationale (non-blocking).
+            with _stage("validate"):
+                warnings = validate_gov_action_rationale(metadata)
+            for w in warnings:
+                logger.warning("CIP-0108 validation [%s#%s]: %s", action.tx_hash[:8], action.index, w)
+
+            with _stage("format"):
+                tweet = format_gov_action_tweet(action, metadata)
+            try:
+                with _stage("post"):
+                    tweet_id = post_tweet(tweet)
+            except TweetTooLongError:
+                # Only a field the formatter never shortens can overflow; rather than lose the action,
+                # post it as a numbered reply thread. CC votes quote the thread's first post.
+                logger.warning("Gov action %s#%s tweet too long — posting a thread", action.tx_hash[:8], action.index)
+                with _stage("post"):
+                    tweet_id = post_thread(split_thread(tweet, numbered=True))[0]
+            with _stage("state_write"):
+                save_action_tweet_id(action.tx_hash, action.index, tweet_id or "", source_block=block_no)
+            metrics.ITEMS.inc("gov_action", "posted" if tweet_id else "unposted")
 
 
 async def _process_cc_votes(block_no: int) -> None:
-    votes = await get_cc_votes(block_no)
+    with _stage("query"):
+        votes = await get_cc_votes(block_no)
 
     if not votes:
         logger.info("No CC vote records for block: %s", block_no)
         return
 
+    voter_handles = resolve_handles({vote.voter_hash for vote in votes})
     for vote in votes:
-        url = sanitise_url(vote.raw_url)
-        metadata = fetch_metadata(url)
-
-        # Validate rationale (non-blocking).
-        warnings = validate_cc_vote_rationale(metadata)
-        for w in warnings:
-            logger.warning("CIP-0136 validation [%s]: %s", vote.voter_hash[:8], w)
-
-        # Look up the original gov action tweet for quote-tweeting.
-        quote_id = get_action_tweet_id(vote.ga_tx_hash, vote.ga_index)
-        voter_x_handle = get_x_handle_for_voter_hash(vote.voter_hash)
-        if not voter_x_handle:
-            logger.warning("No X handle mapping for CC voter hash: %s", vote.voter_hash)
-
-        tweet = format_cc_vote_tweet(
-            vote,
-            metadata,
-            quote_tweet_id=quote_id,
-            voter_x_handle=voter_x_handle,
-        )
-
-        if quote_id:
-            post_quote_tweet(tweet, quote_id)
-        else:
-            logger.info(
-                "No tweet ID for action %s_%s — posting without quote",
-                vote.ga_tx_hash[:8],
-                vote.ga_index,
-            )
-            post_tweet(tweet)
-
-        mark_cc_vote_archived(
-            vote.ga_tx_hash,
-            vote.ga_index,
-            vote.voter_hash,
-            source_block=block_no,
-        )
+        with tracing.span("cc_vote", voter_hash=vote.voter_hash, tx_hash=vote.ga_tx_hash, index=vote.ga_index):
+            # Checked for every item: after a rollback an orphaned vote is often re-included higher up.
+            if is_cc_vote_archived(vote.ga_tx_hash, vote.ga_index, vote.voter_hash, vote.vote_tx_hash):
+                logger.info(
+                    "CC vote %s on %s_%s already archived — skipping",
+                    vote.voter_hash[:8],
+                    vote.ga_tx_hash[:8],
+                    vote.ga_index,
+                )
+                metrics.ITEMS.inc("cc_vote", "skipped")
+                continue
+
+            url = sanitise_url(vote.raw_url)
+            with _stage("fetch", url=url):
+                metadata = fetch_metadata(url)
+
+            # Validate rationale (non-blocking).
+            with _stage("validate"):
+                warnings = validate_cc_vote_rationale(metadata)
+            for w in warnings:
+                logger.warning("CIP-0136 validation [%s]: %s", vote.voter_hash[:8], w)
+
+            # Look up the original gov action tweet for quote-tweeting.
+            with _stage("state_read"):
+                quote_id = get_action_tweet_id(vote.ga_tx_hash, vote.ga_index)
+            voter_x_handle = voter_handles[vote.voter_hash]
+            if not voter_x_handle:
+                logger.warning("No X handle mapping for CC voter hash: %s", vote.voter_hash)
+
+            with _stage("format"):
+                tweet = format_cc_vote_tweet(
+                    vote,
+                    metadata,
+                    quote_tweet_id=quote_id,
+                    voter_x_handle=voter_x_handle,
+                )
+
+            try:
+                with _stage("post"):
+                    if quote_id:
+                        tweet_id = post_quote_tweet(tweet, quote_id)
+                    else:
+                        logger.info(
+                            "No tweet ID for action %s_%s — posting without quote",
+                            vote.ga_tx_hash[:8],
+                            vote.ga_index,
+                        )
+                        tweet_id = post_tweet(tweet)
+            except TweetTooLongError:
+                # Recorded as unposted rather than raised, so one bad anchor cannot stall the chain.
+                logger.exception(
+                    "CC vote %s on %s_%s tweet not posted", vote.voter_hash[:8], vote.ga_tx_hash[:8], vote.ga_index
+                )
+                tweet_id = None
+
+            with _stage("state_write"):
+                mark_cc_vote_archived(
+                    vote.ga_tx_hash,
+                    vote.ga_index,
+                    vote.voter_hash,
+                    source_block=block_no,
+                    vote_tx_hash=vote.vote_tx_hash,
+                )
+            metrics.ITEMS.inc("cc_vote", "posted" if tweet_id else "unposted")
+
+
+async def _process_height(block_no: int) -> None:
+    """Run the per-block pipeline for one height.
+
+    Items already archived are skipped, so a replayed height or an orphaned item re-included
+    at a later height after a rollback is not tweeted twice.
+    """
+    with tracing.span("gov_actions", block_no=block_no):
+        await _process_gov_actions(block_no)
+    with tracing.span("cc_votes", block_no=block_no):
+        await _process_cc_votes(block_no)
+    if config.treasury_donation_accumulator_enabled:
+        await _accumulate_treasury_donations(block_no)
 
 
 # ---------------------------------------------------------------------------
@@ -142,41 +337,138 @@ async def _process_cc_votes(block_no: int) -> None:
 # ---------------------------------------------------------------------------
 
 
-async def _process_treasury_donations(epoch_no: int) -> None:
-    donations = await get_treasury_donations(epoch_no)
-    logger.debug("Donations: %s", donations)
+async def _accumulate_treasury_donations(block_no: int) -> None:
+    """Fold a block's donations into the running per-epoch accumulator."""
+    summary = await get_block_treasury_donation_summary(block_no)
+    if summary is None:
+        return
+    # Zero-donation blocks are recorded too, so a replayed height takes back its orphaned block's donations.
+    record_block_treasury_donations(summary, block_no)
+
 
-    if not donations:
+async def _process_treasury_donations(epoch_no: int) -> None:
+    summary = None
+    if config.treasury_donation_accumulator_enabled:
+        # Only trusted when it covers every block of the epoch; otherwise aggregate in DB-Sync.
+        block_range = await get_epoch_block_range(epoch_no)
+        if block_range is not None:
+            summary = get_epoch_treasury_donations(epoch_no, block_range=block_range)
+    if summary is None:
+        summary = await get_treasury_donation_summary(epoch_no)
+    logger.debug("Donations: %s", summary)
+
+    if not summary.count:
         logger.info("No treasury donations for epoch: %s", epoch_no)
+        mark_epoch_summarised(epoch_no, None)
         return
 
-    tweet = format_treasury_donations_tweet(donations)
-    post_tweet(tweet)
-
+    with _stage("format"):
+        tweet = format_treasury_donation_summary_tweet(summary)
+    with _stage("post"):
+        tweet_id = post_tweet(tweet)
+    with _stage("state_write"):
+        mark_epoch_summarised(epoch_no, tweet_id)
+    metrics.ITEMS.inc("treasury_donations", "posted" if tweet_id else "unposted")
+
+
+async def _lookup_block_epoch(block_hash: str) -> int | None:
+    """Return a block's epoch from the cache, falling back to DB-Sync on a miss."""
+    epoch_no = _block_cache.get_epoch(block_hash)
+    if epoch_no is not None:
+        return epoch_no
+
+    epoch_no = await get_block_epoch(block_hash)
+    if epoch_no is not None:
+        _block_cache.record(block_hash, None, epoch_no)
+    return epoch_no
+
+
+async def _height_epoch(block_no: int, payload: dict) -> int | None:
+    """Epoch of the current fork's block at ``block_no``: from the payload, the window, or DB-Sync."""
+    if block_no == payload["height"] and payload.get("epoch") is not None:
+        return payload["epoch"]
+    block_hash = _chain.hash_at(block_no)
+    if block_hash is None and block_no == payload["height"] - 1:
+        block_hash = payload.get("previous_block")
+    if block_hash is not None:
+        return await _lookup_block_epoch(block_hash)
+    return await get_block_epoch_at_height(block_no)
+
+
+async def _check_epoch_transition(block_no: int, payload: dict) -> None:
+    """Summarise the finished epoch when confirmed height ``block_no`` is the first block of a new one.
+
+    Runs for confirmed heights only, after they are accumulated, so the finished epoch is complete
+    and cannot be orphaned; the persisted marker stops a replayed or redelivered boundary from
+    posting the summary again.
+    """
+    current_epoch = await _height_epoch(block_no, payload)
+    previous_epoch = await _height_epoch(block_no - 1, payload)
+
+    if current_epoch is None or previous_epoch is None:
+        logger.warning("Could not resolve the epochs of blocks %s and %s", block_no - 1, block_no)
+        return
 
-async def _check_epoch_transition(payload: dict) -> None:
-    """Detect epoch boundary and run epoch processing if one occurred."""
-    current_epoch = payload.get("epoch")
-    previous_block_hash = payload.get("previous_block")
+    if current_epoch == previous_epoch:
+        return
 
-    if current_epoch is None or not previous_block_hash:
-        logger.debug("No epoch or previous_block in payload — skipping epoch check")
+    logger.info("Epoch transition detected: %s → %s", previous_epoch, current_epoch)
+    if is_epoch_summarised(previous_epoch):
+        logger.info("Treasury summary for epoch %s already posted — skipping", previous_epoch)
         return
+    # Process the completed epoch (previous_epoch).
+    await _process_treasury_donations(previous_epoch)
 
-    previous_epoch = await get_block_epoch(previous_block_hash)
 
-    if previous_epoch is None:
-        logger.warning("Could not find previous block %s in DB", previous_block_hash)
-        return
+# ---------------------------------------------------------------------------
+# Block pipeline (shared by webhook and poller ingestion)
+# ---------------------------------------------------------------------------
 
-    if current_epoch != previous_epoch:
-        logger.info(
-            "Epoch transition detected: %s → %s",
-            previous_epoch,
-            current_epoch,
-        )
-        # Process the completed epoch (previous_epoch).
-        await _process_treasury_donations(previous_epoch)
+
+async def _process_block(payload: dict) -> None:
+    """Run the full pipeline for one block given in Blockfrost payload shape."""
+    block_no = payload["height"]
+    block_hash = payload.get("hash")
+    epoch_no = payload.get("epoch")
+
+    with tracing.span("block", block_no=block_no, block_hash=block_hash or ""), log_context(block_no=block_no):
+        await _chain_restored.wait()
+        async with _pipeline_lock:
+            if block_hash and _chain.has_seen(block_hash):
+                logger.info("Block %s (%s) already processed — skipping", block_no, block_hash[:8])
+                return
+            if _chain.is_behind_window(block_no):
+                logger.info("Block %s is older than the rollback window and already processed — skipping", block_no)
+                return
+
+            orphaned = _chain.detect_rollback(block_hash, payload.get("previous_block"), block_no)
+            if orphaned:
+                logger.warning(
+                    "Chain rollback detected at block %s — orphaned: %s",
+                    block_no,
+                    ", ".join(f"{n}:{h[:8]}" for h, n in orphaned),
+                )
+
+            # Process confirmed heights, including any rewound by a rollback.
+            for height in _chain.heights_to_process(block_no - config.confirmation_depth):
+                await _process_height(height)
+                # Epoch boundaries are detected on confirmed heights, once the height is accumulated.
+                await _check_epoch_transition(height, payload)
+                _chain.mark_processed(height)
+
+            if block_hash:
+                _chain.push(block_hash, block_no)
+                if epoch_no is not None:
+                    _block_cache.record(block_hash, block_no, epoch_no)
+
+            with _stage("state_write"):
+                set_checkpoint(
+                    name=CHECKPOINT_NAME,
+                    block_no=block_no,
+                    epoch_no=epoch_no,
+                    block_hash=block_hash,
+                    extra=_chain.snapshot(),
+                )
 
 
 # ---------------------------------------------------------------------------
@@ -184,24 +476,41 @@ async def _check_epoch_transition(payload: dict) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _cloud_trace_id(request: Request) -> str | None:
+    """Trace ID from Cloud Run's ``X-Cloud-Trace-Context: TRACE_ID/SPAN_ID;o=1`` header."""
+    header = request.headers.get("X-Cloud-Trace-Context")
+    return header.split("/", 1)[0] if header else None
+
+
 @app.post("/")
 async def handle_webhook(request: Request) -> JSONResponse:
     """Main entry point for Blockfrost webhooks."""
+    with log_context(trace=_cloud_trace_id(request)):
+        return await _handle_webhook(request)
+
+
+async def _handle_webhook(request: Request) -> JSONResponse:
     # --- Signature verification ---
     raw_body = await request.body()
     signature = request.headers.get("Blockfrost-Signature")
 
-    if not verify_webhook_signature(signature, raw_body):
+    with _stage("signature"):
+        verified = verify_webhook_signature(signature, raw_body)
+    if not verified:
         logger.warning("Webhook signature verification failed")
+        metrics.WEBHOOKS.inc("unauthorized")
         return JSONResponse({"error": "Unauthorized"}, status_code=401)
 
     # --- Parse payload ---
     request_json = await request.json()
 
     logger.info("Incoming webhook")
-    logger.debug("Webhook payload: %s", request_json)
+    if logger.isEnabledFor(logging.DEBUG):
+        # A plain string argument is formatted on the logging thread, not here.
+        logger.debug("Webhook payload: %s", raw_body.decode("utf-8", "replace"))
 
     if not request_json:
+        metrics.WEBHOOKS.inc("bad_request")
         return JSONResponse({"error": "Invalid or missing JSON body"}, status_code=400)
 
     payload = request_json.get("payload", {})
@@ -209,22 +518,36 @@ async def handle_webhook(request: Request) -> JSONResponse:
 
     if block_no is None:
         logger.warning("Missing block height in payload")
+        metrics.WEBHOOKS.inc("bad_request")
         return JSONResponse({"error": "Missing block height"}, status_code=400)
 
-    try:
-        # Always process block events.
-        await _process_gov_actions(block_no)
-        await _process_cc_votes(block_no)
-
-        # Detect epoch transitions and process if needed.
-        await _check_epoch_transition(payload)
-        set_checkpoint(
-            name="blockfrost_main",
-            block_no=block_no,
-            epoch_no=payload.get("epoch"),
+    if not config.webhook_ingestion_enabled:
+        logger.info(
+            "Webhook ingestion disabled (INGESTION_MODE=%s) — ignoring block %s", config.ingestion_mode, block_no
         )
+        metrics.WEBHOOKS.inc("ignored")
+        return JSONResponse({"status": "ignored"})
+
+    try:
+        with tracing.span("webhook", block_no=block_no):
+            await _process_block(payload)
     except Exception:
         logger.exception("Error processing webhook for block: %s", block_no)
+        metrics.WEBHOOKS.inc("error")
         return JSONResponse({"error": "Internal server error"}, status_code=500)
 
+    metrics.WEBHOOKS.inc("ok")
     return JSONResponse({"status": "ok"})
+
+
+@app.get("/ready")
+async def handle_ready() -> JSONResponse:
+    """Readiness probe: 503 until the startup warm-up has finished, then 200 with per-step outcomes."""
+    status = warmup.readiness()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
+@app.get("/metrics")
+async def handle_metrics() -> Response:
+    """Prometheus scrape endpoint for pipeline stage latencies and outcome counters."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
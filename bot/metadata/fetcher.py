@@ -1,8 +1,11 @@
-import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from functools import cache
 
+from bot import metrics
+from bot.lazy import is_available, lazy_import
 from bot.logging import get_logger
 
+requests = lazy_import("requests")
+
 logger = get_logger("metadata.fetcher")
 
 
@@ -11,9 +14,30 @@ def sanitise_url(url: str) -> str:
     return url.replace("ipfs://", "https://ipfs.io/ipfs/")
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
 def fetch_metadata(url: str) -> dict | None:
     """Fetch and parse JSON metadata from a URL. Returns None on failure."""
+    return _retrying_fetch()(url)
+
+
+def warm_up() -> None:
+    """Import requests and tenacity and build the retrying fetcher ahead of the first fetch."""
+    is_available(requests)
+    _retrying_fetch()
+
+
+@cache
+def _retrying_fetch():
+    # tenacity is imported on the first fetch (or warm-up) rather than at startup.
+    from tenacity import retry, stop_after_attempt, wait_exponential
+
+    return retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        before_sleep=lambda _: metrics.RETRIES.inc("metadata_fetch"),
+    )(_fetch_once)
+
+
+def _fetch_once(url: str) -> dict | None:
     try:
         response = requests.get(url, timeout=30)
         if response.status_code == 200:
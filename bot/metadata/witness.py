@@ -0,0 +1,192 @@
+"""CIP-100 author witness verification.
+
+A CIP-100 author signs the blake2b-256 hash of the document ``body``,
+canonicalised with the JSON-LD URDNA2015 algorithm (N-Quads), using their
+Ed25519 key. Verifying a witness therefore needs:
+
+- ``pyld`` for canonicalisation, and
+- ``cryptography`` for Ed25519 (also pulled in by ``paramiko``).
+
+Both come with the ``witness`` extra; without either, every Ed25519 witness
+is reported as unverifiable.
+
+Canonicalisation is the expensive step, so it runs once per document, and
+the per-author results are cached by document hash. Remote JSON-LD contexts
+are never fetched; documents that reference one are unverifiable. Authors
+without a witness are reported as unsigned.
+``CIP-0008`` (COSE) witnesses are reported as unsupported.
+
+A valid signature only proves the author holds the key the document itself
+supplies, so anyone can self-sign any name. :func:`trusted_author_indexes`
+is what tweets use: it also requires the key to be bound to that author's
+name (e.g. a CC profile's ``witness_keys``), and skips canonicalisation
+entirely unless some author presents such a key.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from threading import Lock
+
+from bot.lazy import is_available, lazy_import
+from bot.logging import get_logger
+
+# Optional dependencies, imported on the first witness check (pyld pulls in ``requests``).
+jsonld = lazy_import("pyld.jsonld")
+ed25519 = lazy_import("cryptography.hazmat.primitives.asymmetric.ed25519")
+crypto_exceptions = lazy_import("cryptography.exceptions")
+
+logger = get_logger("metadata.witness")
+
+VERIFIED = "verified"
+INVALID = "invalid"
+UNSUPPORTED = "unsupported"
+UNVERIFIABLE = "unverifiable"
+UNSIGNED = "unsigned"
+
+_CACHE_SIZE = 1024
+_cache: OrderedDict[str, tuple[AuthorVerification, ...]] = OrderedDict()
+_cache_lock = Lock()
+
+
+@dataclass(frozen=True)
+class AuthorVerification:
+    index: int  # position in the document's ``authors`` list
+    name: str
+    status: str
+    public_key: str = ""
+
+    @property
+    def verified(self) -> bool:
+        return self.status == VERIFIED
+
+
+def _no_remote_contexts(url, options=None):
+    raise jsonld.JsonLdError("Remote JSON-LD contexts are not fetched", "jsonld.LoadDocumentError")
+
+
+def document_hash(metadata: dict) -> str:
+    """Stable hash of a whole metadata document (the cache key)."""
+    raw = json.dumps(metadata, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def canonical_body_hash(metadata: dict) -> bytes | None:
+    """blake2b-256 of the URDNA2015-canonicalised body, or None if it cannot be computed."""
+    if "@context" not in metadata or "body" not in metadata or not is_available(jsonld):
+        return None
+    try:
+        nquads = jsonld.normalize(
+            {"@context": metadata["@context"], "body": metadata["body"]},
+            {"algorithm": "URDNA2015", "format": "application/n-quads", "documentLoader": _no_remote_contexts},
+        )
+    except Exception:
+        logger.debug("Could not canonicalise metadata body", exc_info=True)
+        return None
+    return hashlib.blake2b(nquads.encode("utf-8"), digest_size=32).digest()
+
+
+def _verify_ed25519(public_key: str, signature: str, message: bytes) -> bool:
+    try:
+        ed25519.Ed25519PublicKey.from_public_bytes(bytes.fromhex(public_key)).verify(bytes.fromhex(signature), message)
+        return True
+    except (crypto_exceptions.InvalidSignature, ValueError, TypeError):
+        return False
+
+
+def _authors(metadata: dict) -> list[tuple[int, dict]]:
+    authors = metadata.get("authors")
+    if not isinstance(authors, list):
+        return []
+    return [(i, a) for i, a in enumerate(authors) if isinstance(a, dict)]
+
+
+def _author_name(author: dict) -> str:
+    name = author.get("name")
+    return name if isinstance(name, str) else ""
+
+
+def _ed25519_key(author: dict) -> str:
+    """The author's Ed25519 witness public key (lower-case hex), or "" if there is no such witness."""
+    witness = author.get("witness")
+    if not isinstance(witness, dict) or witness.get("witnessAlgorithm") != "ed25519" or not witness.get("signature"):
+        return ""
+    return str(witness.get("publicKey", "")).lower()
+
+
+def _verify_uncached(metadata: dict) -> tuple[AuthorVerification, ...]:
+    authors = _authors(metadata)
+    if not authors:
+        return ()
+
+    body_hash: bytes | None = None
+    hashed = False
+    results = []
+    for index, author in authors:
+        name = _author_name(author)
+        witness = author.get("witness")
+        if not isinstance(witness, dict) or not witness.get("signature"):
+            results.append(AuthorVerification(index, name, UNSIGNED))
+            continue
+        public_key = str(witness.get("publicKey", "")).lower()
+        if witness.get("witnessAlgorithm") != "ed25519":
+            results.append(AuthorVerification(index, name, UNSUPPORTED, public_key))
+            continue
+        if not hashed:
+            # Canonicalise once, and only if some author has an Ed25519 witness we can check.
+            body_hash = canonical_body_hash(metadata) if is_available(ed25519) else None
+            hashed = True
+        if body_hash is None:
+            results.append(AuthorVerification(index, name, UNVERIFIABLE, public_key))
+            continue
+        ok = _verify_ed25519(public_key, str(witness["signature"]), body_hash)
+        results.append(AuthorVerification(index, name, VERIFIED if ok else INVALID, public_key))
+    return tuple(results)
+
+
+def verify_authors(metadata: dict | None) -> tuple[AuthorVerification, ...]:
+    """Verify every author witness of ``metadata`` (cached by document hash)."""
+    if not isinstance(metadata, dict) or not metadata.get("authors"):
+        return ()
+    key = document_hash(metadata)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    results = _verify_uncached(metadata)
+
+    with _cache_lock:
+        _cache[key] = results
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return results
+
+
+def trusted_author_indexes(metadata: dict | None, trusted_keys: Mapping[str, str]) -> set[int]:
+    """Indexes into ``metadata["authors"]`` of authors whose witness verifies under a trusted key.
+
+    ``trusted_keys`` maps lower-case hex Ed25519 public keys to the name they belong to; an
+    author counts only if their key is listed under their own name (case-insensitive). Nothing
+    is canonicalised unless at least one author qualifies that far.
+    """
+    if not isinstance(metadata, dict) or not trusted_keys:
+        return set()
+    candidates = set()
+    for index, author in _authors(metadata):
+        owner = trusted_keys.get(_ed25519_key(author))
+        if owner is not None and owner.casefold() == _author_name(author).strip().casefold():
+            candidates.add(index)
+    if not candidates:
+        return set()
+    return {result.index for result in verify_authors(metadata) if result.index in candidates and result.verified}
+
+
+def clear_verification_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,182 @@
+"""In-process pipeline metrics in the Prometheus text format.
+
+A deliberately small registry (counters and fixed-bucket histograms), so the
+hot path costs a ``perf_counter`` pair, a bisect and a few integer updates
+per stage, without pulling in ``prometheus_client``. :func:`render` produces
+the text exposition served at ``GET /metrics``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import time
+from threading import Lock
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds. Covers signature checks (sub-millisecond) up to slow IPFS gateways.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class _Timer:
+    """Context manager observing the elapsed time of its block (also on error)."""
+
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: Histogram, labels: tuple[str, ...]) -> None:
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> _Timer:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._histogram.observe(time.perf_counter() - self._start, *self._labels)
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.bounds = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], _Series] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        # Non-cumulative per-bucket counts; the last slot is +Inf.
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _Series(len(self.bounds) + 1)
+            series.buckets[index] += 1
+            series.count += 1
+            series.sum += value
+
+    def time(self, *labels: str) -> _Timer:
+        return _Timer(self, labels)
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series.count if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((labels, list(s.buckets), s.count, s.sum) for labels, s in self._series.items())
+        for labels, buckets, count, total in snapshot:
+            cumulative = 0
+            for bound, n in zip((*self.bounds, math.inf), buckets, strict=True):
+                cumulative += n
+                le = _labels(self.labelnames, labels, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_str = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_number(total)}")
+            lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+STAGE_SECONDS = Histogram(
+    "govbot_stage_duration_seconds",
+    "Time spent in each block pipeline stage.",
+    ("stage",),
+)
+ITEMS = Counter(
+    "govbot_items_total",
+    "Governance actions, CC votes and donation summaries handled, by outcome.",
+    ("kind", "outcome"),
+)
+WEBHOOKS = Counter(
+    "govbot_webhook_requests_total",
+    "Webhook requests by response outcome.",
+    ("outcome",),
+)
+RETRIES = Counter(
+    "govbot_retries_total",
+    "Retried operations (DB-Sync queries, metadata fetches).",
+    ("operation",),
+)
+
+REGISTRY: tuple[Counter | Histogram, ...] = (STAGE_SECONDS, ITEMS, WEBHOOKS, RETRIES)
+
+
+def stage(name: str) -> _Timer:
+    """Time a pipeline stage: ``with metrics.stage("fetch"): ...``."""
+    return STAGE_SECONDS.time(name)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    """Clear all recorded values (tests)."""
+    for metric in REGISTRY:
+        metric.clear()
@@ -35,11 +35,38 @@ class CcVote:
 
 
 @dataclass(frozen=True)
-class TreasuryDonation:
+class Block:
+    id: int
+    hash: str
     block_no: int
-    tx_hash: str
-    amount_lovelace: int
+    epoch_no: int | None
+    previous_hash: str | None
+
+    def as_payload(self) -> dict:
+        """Return the block in Blockfrost webhook payload shape."""
+        return {
+            "height": self.block_no,
+            "hash": self.hash,
+            "epoch": self.epoch_no,
+            "previous_block": self.previous_hash,
+        }
+
+
+@dataclass(frozen=True)
+class EpochCommittee:
+    """Constitutional committee in force for an epoch: cold credentials and hot key -> cold map."""
+
+    epoch_no: int
+    members: frozenset[str]
+    cold_by_hot: dict[int, str]
+
+
+@dataclass(frozen=True)
+class TreasuryDonationSummary:
+    epoch_no: int
+    count: int
+    total_lovelace: int
 
     @property
-    def amount_ada(self) -> Decimal:
-        return Decimal(self.amount_lovelace) / Decimal("1000000")
+    def total_ada(self) -> Decimal:
+        return Decimal(self.total_lovelace) / Decimal("1000000")
@@ -0,0 +1,112 @@
+"""DB-Sync polling ingestion — tails the ``block`` table without webhooks.
+
+A ``block.id > cursor`` query fetches new blocks in bounded batches and feeds
+each one, in Blockfrost payload shape, to the same pipeline the webhook uses.
+The poll interval adapts to load: a full batch polls again immediately, a
+partial batch waits the minimum interval, and idle polls back off towards the
+maximum.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from bot.db.repository import get_blocks_after, get_latest_block_id
+from bot.logging import get_logger
+from bot.state_store import get_checkpoint, set_checkpoint
+
+logger = get_logger("poller")
+
+POLLER_CHECKPOINT_NAME = "dbsync_poller"
+
+
+class DbSyncPoller:
+    """Feed new DB-Sync blocks to ``handle_block`` in order."""
+
+    def __init__(
+        self,
+        handle_block: Callable[[dict], Awaitable[None]],
+        *,
+        batch_size: int = 100,
+        min_interval: float = 2.0,
+        max_interval: float = 20.0,
+    ) -> None:
+        self._handle_block = handle_block
+        self._batch_size = batch_size
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._interval = min_interval
+        self._wake = asyncio.Event()
+        self.cursor: int | None = None
+
+    def set_max_interval(self, seconds: float) -> None:
+        """Change the idle backoff ceiling (e.g. while push notifications are live)."""
+        self._max_interval = max(seconds, self._min_interval)
+        self._interval = min(self._interval, self._max_interval)
+
+    def wake(self) -> None:
+        """Poll immediately instead of waiting out the current interval."""
+        self._wake.set()
+
+    async def _load_cursor(self) -> int | None:
+        checkpoint = get_checkpoint(POLLER_CHECKPOINT_NAME) or {}
+        cursor = checkpoint.get("last_block_id")
+        if cursor is not None:
+            return int(cursor)
+        # First run: start at the tip rather than replaying chain history.
+        return await get_latest_block_id()
+
+    async def poll_once(self) -> int:
+        """Process one batch of new blocks. Returns the number of blocks handled."""
+        if self.cursor is None:
+            self.cursor = await self._load_cursor()
+            if self.cursor is None:
+                return 0
+            logger.info("DB-Sync poller starting after block id %s", self.cursor)
+
+        blocks = await get_blocks_after(self.cursor, self._batch_size)
+        last = None
+        try:
+            for block in blocks:
+                await self._handle_block(block.as_payload())
+                self.cursor = block.id
+                last = block
+        finally:
+            # Persist progress even when a block fails part-way through the batch.
+            if last is not None:
+                set_checkpoint(
+                    name=POLLER_CHECKPOINT_NAME,
+                    block_no=last.block_no,
+                    epoch_no=last.epoch_no,
+                    block_hash=last.hash,
+                    extra={"last_block_id": last.id},
+                )
+        return len(blocks)
+
+    def _next_interval(self, handled: int) -> float:
+        if handled >= self._batch_size:
+            return 0.0
+        if handled:
+            return self._min_interval
+        return min(max(self._interval * 2, self._min_interval), self._max_interval)
+
+    async def run(self) -> None:
+        """Poll until cancelled."""
+        while True:
+            # Clear before polling so a wake() that lands mid-poll triggers another poll.
+            self._wake.clear()
+            try:
+                handled = await self.poll_once()
+                self._interval = self._next_interval(handled)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("DB-Sync poll failed after block id %s", self.cursor)
+                self._interval = self._max_interval
+
+            if self._interval:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self._interval)
+                except TimeoutError:
+                    pass
@@ -0,0 +1,331 @@
+"""Declarative CIP-0100 / CIP-0108 / CIP-0136 rationale schemas.
+
+The rules below transcribe ``docs/CIP-0108.md`` and ``docs/CIP-0136.md`` (and
+the CIP-0100 envelope they extend) into :class:`Field` specs. At import,
+:func:`compile_schema` turns each spec tree into a chain of closures, so
+validating a document does no schema interpretation. It only runs the
+precompiled checks and collects :class:`Finding` objects.
+
+Fields the CIPs call compulsory are reported with ``ERROR`` severity (these
+decide compliance). Everything else — envelope fields, witnesses, references,
+optional field types — is reported as ``WARNING``.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+
+ERROR = "error"
+WARNING = "warning"
+
+_HEX = re.compile(r"^[0-9a-fA-F]+$")
+
+
+@dataclass(frozen=True)
+class Finding:
+    severity: str
+    path: str
+    code: str
+    message: str
+
+    def as_dict(self) -> dict:
+        return {"severity": self.severity, "path": self.path, "code": self.code, "message": self.message}
+
+
+@dataclass(frozen=True)
+class Field:
+    """Schema for one JSON property.
+
+    ``required`` uses truthiness, like the original hand-written checks, so
+    empty strings count as missing. ``stop`` ends validation of the whole
+    document when the field is missing or not an object.
+    """
+
+    name: str
+    required: bool = False
+    kind: type | tuple[type, ...] | None = None
+    max_length: int | None = None
+    minimum: int | None = None
+    enum: tuple[str, ...] | None = None
+    pattern: re.Pattern | None = None
+    fields: tuple[Field, ...] = ()
+    items: Field | None = None
+    severity: str = WARNING
+    cip: str = "CIP-0100"
+    stop: bool = False
+
+
+_TYPE_NAMES = {str: "a string", dict: "an object", list: "a list", int: "an integer"}
+
+Check = Callable[[object, list[Finding]], bool]
+
+
+def _type_name(kind) -> str:
+    kinds = kind if isinstance(kind, tuple) else (kind,)
+    return " or ".join(_TYPE_NAMES.get(k, k.__name__) for k in kinds)
+
+
+def _compile_value(spec: Field, path: str) -> Check:
+    """Compile the checks applied to a present value. Returns False to stop validation."""
+    checks: list[Check] = []
+    severity, suffix = spec.severity, f" ({spec.cip})"
+
+    if spec.kind is not None:
+        kind, expected = spec.kind, _type_name(spec.kind)
+
+        def _type(value, out, kind=kind):
+            # bool is an int subclass but never a valid count.
+            if not isinstance(value, kind) or (isinstance(value, bool) and kind is int):
+                if spec.stop:
+                    out.append(Finding(severity, path, "missing", f"Missing '{path}' object{suffix}"))
+                else:
+                    out.append(Finding(severity, path, "type", f"Field '{path}' should be {expected}{suffix}"))
+                return False
+            return True
+
+        checks.append(_type)
+
+    if spec.max_length is not None:
+        limit = spec.max_length
+
+        def _max_length(value, out):
+            if len(value) > limit:
+                message = f"Field '{path}' exceeds {limit} characters ({len(value)}){suffix}"
+                out.append(Finding(severity, path, "max_length", message))
+            return True
+
+        checks.append(_max_length)
+
+    if spec.minimum is not None:
+        minimum = spec.minimum
+
+        def _minimum(value, out):
+            if value < minimum:
+                out.append(Finding(severity, path, "minimum", f"Field '{path}' must be >= {minimum}{suffix}"))
+            return True
+
+        checks.append(_minimum)
+
+    if spec.enum is not None:
+        allowed = frozenset(spec.enum)
+        listed = ", ".join(spec.enum)
+
+        def _enum(value, out):
+            if value not in allowed:
+                out.append(Finding(severity, path, "enum", f"Field '{path}' should be one of: {listed}{suffix}"))
+            return True
+
+        checks.append(_enum)
+
+    if spec.pattern is not None:
+        pattern = spec.pattern
+
+        def _pattern(value, out):
+            if not pattern.match(value):
+                out.append(Finding(severity, path, "pattern", f"Field '{path}' has an invalid format{suffix}"))
+            return True
+
+        checks.append(_pattern)
+
+    if spec.fields:
+        children = [_compile_field(child, f"{path}.{child.name}") for child in spec.fields]
+
+        def _object(value, out):
+            for child in children:
+                if not child(value, out):
+                    return False
+            return True
+
+        checks.append(_object)
+
+    if spec.items is not None:
+        item_checks = {}
+
+        def _items(value, out):
+            for i, item in enumerate(value):
+                check = item_checks.get(i)
+                if check is None:
+                    # Item paths carry the index; compile lazily and reuse per position.
+                    check = item_checks[i] = _compile_value(spec.items, f"{path}[{i}]")
+                check(item, out)
+            return True
+
+        checks.append(_items)
+
+    def _value(value, out):
+        for check in checks:
+            if not check(value, out):
+                # A wrong type makes the remaining checks meaningless; only ``stop`` fields halt the document.
+                return not spec.stop
+        return True
+
+    return _value
+
+
+def _compile_field(spec: Field, path: str) -> Check:
+    """Compile lookup + presence + value checks for ``spec`` inside a parent object."""
+    name, check_value = spec.name, _compile_value(spec, path)
+    severity, suffix = spec.severity, f" ({spec.cip})"
+    if spec.stop:
+        missing = Finding(severity, path, "missing", f"Missing '{path}' object{suffix}")
+    else:
+        missing = Finding(severity, path, "missing", f"Missing required field '{path}'{suffix}")
+
+    if spec.required:
+
+        def _required(obj, out):
+            value = obj.get(name)
+            if not value:
+                out.append(missing)
+                return not spec.stop
+            return check_value(value, out)
+
+        return _required
+
+    def _optional(obj, out):
+        value = obj.get(name)
+        if value is None:
+            return True
+        return check_value(value, out)
+
+    return _optional
+
+
+def compile_schema(fields: tuple[Field, ...]) -> Callable[[dict], list[Finding]]:
+    """Compile a top-level schema into ``validate(document) -> findings``."""
+    checks = [_compile_field(spec, spec.name) for spec in fields]
+
+    def _validate(document: dict) -> list[Finding]:
+        out: list[Finding] = []
+        for check in checks:
+            if not check(document, out):
+                break
+        return out
+
+    return _validate
+
+
+# ---------------------------------------------------------------------------
+# Shared CIP-0100 vocabulary
+# ---------------------------------------------------------------------------
+
+_HASH_ALGORITHMS = ("blake2b-256",)
+
+WITNESS = Field(
+    "witness",
+    required=True,
+    kind=dict,
+    fields=(
+        Field("witnessAlgorithm", required=True, kind=str, enum=("ed25519", "CIP-0008")),
+        Field("publicKey", required=True, kind=str, pattern=_HEX),
+        Field("signature", required=True, kind=str, pattern=_HEX),
+    ),
+)
+
+AUTHOR = Field(
+    "author",
+    kind=dict,
+    fields=(Field("name", kind=str), WITNESS),
+)
+
+
+def _references(cip: str, types: tuple[str, ...]) -> Field:
+    return Field(
+        "references",
+        kind=list,
+        cip=cip,
+        items=Field(
+            "reference",
+            kind=dict,
+            cip=cip,
+            fields=(
+                Field("@type", kind=str, enum=types, cip=cip),
+                Field("label", required=True, kind=str, cip=cip),
+                Field("uri", required=True, kind=str, cip=cip),
+                Field(
+                    "referenceHash",
+                    kind=dict,
+                    cip=cip,
+                    fields=(
+                        Field("hashDigest", required=True, kind=str, pattern=_HEX, cip=cip),
+                        Field("hashAlgorithm", required=True, kind=str, enum=_HASH_ALGORITHMS, cip=cip),
+                    ),
+                ),
+            ),
+        ),
+    )
+
+
+def _envelope(body: Field) -> tuple[Field, ...]:
+    # ``body`` comes first so its compulsory-field errors are reported in the
+    # same order as before, and a missing body stops validation outright.
+    return (
+        body,
+        Field("@context", required=True, kind=(dict, str)),
+        Field("hashAlgorithm", required=True, kind=str, enum=_HASH_ALGORITHMS),
+        Field("authors", kind=list, items=AUTHOR),
+    )
+
+
+def _text(name: str, cip: str, *, required: bool = False, max_length: int | None = None) -> Field:
+    severity = ERROR if required else WARNING
+    return Field(name, required=required, kind=str, max_length=max_length, severity=severity, cip=cip)
+
+
+# ---------------------------------------------------------------------------
+# CIP-0108 — governance action rationale
+# ---------------------------------------------------------------------------
+
+CIP_0108 = _envelope(
+    Field(
+        "body",
+        required=True,
+        kind=dict,
+        stop=True,
+        severity=ERROR,
+        cip="CIP-0108",
+        fields=(
+            _text("title", "CIP-0108", required=True, max_length=80),
+            _text("abstract", "CIP-0108", required=True, max_length=2500),
+            _text("motivation", "CIP-0108", required=True),
+            _text("rationale", "CIP-0108", required=True),
+            _references("CIP-0108", ("GovernanceMetadata", "Other", "RelevantArticles", "Identity", "Link")),
+        ),
+    )
+)
+
+# ---------------------------------------------------------------------------
+# CIP-0136 — CC vote rationale
+# ---------------------------------------------------------------------------
+
+_INTERNAL_VOTE_FIELDS = ("constitutional", "unconstitutional", "abstain", "didNotVote", "againstVote")
+
+CIP_0136 = _envelope(
+    Field(
+        "body",
+        required=True,
+        kind=dict,
+        stop=True,
+        severity=ERROR,
+        cip="CIP-0136",
+        fields=(
+            _text("summary", "CIP-0136", required=True, max_length=300),
+            _text("rationaleStatement", "CIP-0136", required=True),
+            _text("precedentDiscussion", "CIP-0136"),
+            _text("counterargumentDiscussion", "CIP-0136"),
+            _text("conclusion", "CIP-0136"),
+            Field(
+                "internalVote",
+                kind=dict,
+                cip="CIP-0136",
+                fields=tuple(Field(name, kind=int, minimum=0, cip="CIP-0136") for name in _INTERNAL_VOTE_FIELDS),
+            ),
+            _references("CIP-0136", ("GovernanceMetadata", "Other", "RelevantArticles", "Identity", "Link")),
+        ),
+    )
+)
+
+check_cip_0108 = compile_schema(CIP_0108)
+check_cip_0136 = compile_schema(CIP_0136)
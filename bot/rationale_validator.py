@@ -3,54 +3,44 @@
 CIP-0108: Governance Action rationale (title, abstract, motivation, rationale).
 CIP-0136: CC Vote rationale (summary, rationaleStatement).
 
+The rules live in :mod:`bot.rationale_schema` and are compiled once at import.
+``check_*`` return every structured finding (including CIP-0100 envelope,
+witness and reference issues); ``validate_*`` return just the messages for
+missing or oversized compulsory fields, which decide CIP compliance.
+
 Validation is non-blocking — issues are returned as a list of warnings.
 """
 
 from __future__ import annotations
 
 from bot.logging import get_logger
+from bot.rationale_schema import ERROR, Finding, check_cip_0108, check_cip_0136
 
 logger = get_logger("rationale_validator")
 
+UNAVAILABLE = Finding(ERROR, "", "unavailable", "Metadata could not be fetched")
 
-def validate_gov_action_rationale(metadata: dict | None) -> list[str]:
-    """Validate governance action metadata against CIP-0108.
-
-    Returns a list of warning messages (empty = valid).
-    """
-    if metadata is None:
-        return ["Metadata could not be fetched"]
-
-    warnings: list[str] = []
-    body = metadata.get("body")
 
-    if not body or not isinstance(body, dict):
-        warnings.append("Missing 'body' object (CIP-0108)")
-        return warnings
+def check_gov_action_rationale(metadata: dict | None) -> list[Finding]:
+    """Return all CIP-0100/CIP-0108 findings for governance action metadata."""
+    if not isinstance(metadata, dict):
+        return [UNAVAILABLE]
+    return check_cip_0108(metadata)
 
-    # title — required, ≤80 characters
-    title = body.get("title")
-    if not title:
-        warnings.append("Missing required field 'body.title' (CIP-0108)")
-    elif len(title) > 80:
-        warnings.append(f"Field 'body.title' exceeds 80 characters ({len(title)}) (CIP-0108)")
 
-    # abstract — required, ≤2500 characters
-    abstract = body.get("abstract")
-    if not abstract:
-        warnings.append("Missing required field 'body.abstract' (CIP-0108)")
-    elif len(abstract) > 2500:
-        warnings.append(f"Field 'body.abstract' exceeds 2500 characters ({len(abstract)}) (CIP-0108)")
+def check_cc_vote_rationale(metadata: dict | None) -> list[Finding]:
+    """Return all CIP-0100/CIP-0136 findings for CC vote metadata."""
+    if not isinstance(metadata, dict):
+        return [UNAVAILABLE]
+    return check_cip_0136(metadata)
 
-    # motivation — required
-    if not body.get("motivation"):
-        warnings.append("Missing required field 'body.motivation' (CIP-0108)")
 
-    # rationale — required
-    if not body.get("rationale"):
-        warnings.append("Missing required field 'body.rationale' (CIP-0108)")
+def validate_gov_action_rationale(metadata: dict | None) -> list[str]:
+    """Validate governance action metadata against CIP-0108.
 
-    return warnings
+    Returns a list of warning messages (empty = valid).
+    """
+    return [f.message for f in check_gov_action_rationale(metadata) if f.severity == ERROR]
 
 
 def validate_cc_vote_rationale(metadata: dict | None) -> list[str]:
@@ -58,25 +48,4 @@ def validate_cc_vote_rationale(metadata: dict | None) -> list[str]:
 
     Returns a list of warning messages (empty = valid).
     """
-    if metadata is None:
-        return ["Metadata could not be fetched"]
-
-    warnings: list[str] = []
-    body = metadata.get("body")
-
-    if not body or not isinstance(body, dict):
-        warnings.append("Missing 'body' object (CIP-0136)")
-        return warnings
-
-    # summary — required, ≤300 characters
-    summary = body.get("summary")
-    if not summary:
-        warnings.append("Missing required field 'body.summary' (CIP-0136)")
-    elif len(summary) > 300:
-        warnings.append(f"Field 'body.summary' exceeds 300 characters ({len(summary)}) (CIP-0136)")
-
-    # rationaleStatement — required
-    if not body.get("rationaleStatement"):
-        warnings.append("Missing required field 'body.rationaleStatement' (CIP-0136)")
-
-    return warnings
+    return [f.message for f in check_cc_vote_rationale(metadata) if f.severity == ERROR]
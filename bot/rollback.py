@@ -0,0 +1,129 @@
+"""Chain rollback detection over a small window of recent blocks.
+
+Every webhook carries the hash of its parent block. When that parent is not
+the tip we last saw, the chain switched forks: blocks above the fork point
+were orphaned and the heights they occupied must be re-queried from DB-Sync.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+ROLLBACK_WINDOW = 32
+
+
+class ChainTracker:
+    """Recent block hashes plus the heights already run through the pipeline."""
+
+    def __init__(self, window_size: int = ROLLBACK_WINDOW) -> None:
+        self._window_size = window_size
+        self._blocks: list[tuple[str, int]] = []
+        self.last_processed_block_no: int | None = None
+        self.max_processed_block_no: int | None = None
+
+    @property
+    def tip(self) -> tuple[str, int] | None:
+        return self._blocks[-1] if self._blocks else None
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Load tracker state from a checkpoint document."""
+        self._blocks = [
+            (entry["hash"], int(entry["block_no"]))
+            for entry in state.get("recent_blocks") or []
+            if entry.get("hash") and entry.get("block_no") is not None
+        ][-self._window_size :]
+        self.last_processed_block_no = state.get("last_processed_block_no")
+        self.max_processed_block_no = state.get("max_processed_block_no", self.last_processed_block_no)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return tracker state as checkpoint fields."""
+        return {
+            "recent_blocks": [{"hash": h, "block_no": n} for h, n in self._blocks],
+            "last_processed_block_no": self.last_processed_block_no,
+            "max_processed_block_no": self.max_processed_block_no,
+        }
+
+    def has_seen(self, block_hash: str) -> bool:
+        """Whether the block is already in the window (i.e. fully processed)."""
+        key = block_hash.lower()
+        return any(h == key for h, _ in self._blocks)
+
+    def is_behind_window(self, block_no: int) -> bool:
+        """Whether ``block_no`` was already processed and is older than every block in the window.
+
+        Such a block (e.g. from a poller trailing the webhook in "both" mode) can neither be
+        deduplicated by hash nor checked for a rollback, so it must be dropped before either.
+        """
+        if self.max_processed_block_no is None or block_no > self.max_processed_block_no:
+            return False
+        return not self._blocks or block_no < self._blocks[0][1]
+
+    def hash_at(self, block_no: int) -> str | None:
+        """Hash of the window's block at ``block_no`` on the current fork, if it is still held."""
+        for block_hash, n in reversed(self._blocks):
+            if n == block_no:
+                return block_hash
+        return None
+
+    def detect_rollback(
+        self,
+        block_hash: str | None,
+        previous_block_hash: str | None,
+        block_no: int,
+    ) -> list[tuple[str, int]]:
+        """Return the recent blocks orphaned by this block (empty if none).
+
+        Orphaned blocks are dropped from the window and the processed-height cursor
+        is rewound to the fork point so the affected heights get reprocessed.
+        """
+        if not previous_block_hash or not self._blocks:
+            return []
+
+        hashes = [h for h, _ in self._blocks]
+        previous = previous_block_hash.lower()
+        if hashes[-1] == previous or (block_hash and block_hash.lower() in hashes):
+            # Extends the tip, or is a redelivery of a block we already hold.
+            return []
+
+        if previous in hashes:
+            orphaned = self._blocks[hashes.index(previous) + 1 :]
+        else:
+            # Parent never seen: anything we hold at or above its height lost the fork.
+            # Below that it is either a gap (missed webhooks) or beyond the window.
+            orphaned = [(h, n) for h, n in self._blocks if n >= block_no - 1]
+
+        if not orphaned:
+            return []
+
+        self._blocks = [entry for entry in self._blocks if entry not in orphaned]
+        fork_block_no = min(n for _, n in orphaned) - 1
+        if self.last_processed_block_no is not None:
+            self.last_processed_block_no = min(self.last_processed_block_no, fork_block_no)
+        return orphaned
+
+    def push(self, block_hash: str, block_no: int) -> None:
+        """Append a block to the window as the new tip (no-op for a redelivery)."""
+        entry = (block_hash.lower(), block_no)
+        if entry in self._blocks:
+            return
+        self._blocks.append(entry)
+        del self._blocks[: -self._window_size]
+
+    def heights_to_process(self, target_block_no: int) -> list[int]:
+        """Return the heights to run the pipeline for, ending at ``target_block_no``.
+
+        Normally that is just the target. After a rollback rewound the cursor it also
+        covers the skipped heights; heights already processed are never repeated.
+        """
+        last = self.last_processed_block_no
+        if last is None:
+            return [target_block_no]
+        if target_block_no <= last:
+            return []
+        start = last + 1 if target_block_no - last <= self._window_size else target_block_no
+        return list(range(start, target_block_no + 1))
+
+    def mark_processed(self, block_no: int) -> None:
+        self.last_processed_block_no = block_no
+        if self.max_processed_block_no is None or block_no > self.max_processed_block_no:
+            self.max_processed_block_no = block_no
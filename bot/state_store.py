@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from threading import Lock
 from typing import Any
 
 from bot.config import config
+from bot.lazy import is_available, lazy_import
 from bot.logging import get_logger
+from bot.models import TreasuryDonationSummary
 
-try:
-    from google.cloud import firestore
-except Exception:  # pragma: no cover - exercised via runtime fallback.
-    firestore = None
+# Imported on first use (or by the startup warm-up); it dominates cold-start import time.
+firestore = lazy_import("google.cloud.firestore")
 
 logger = get_logger("state_store")
 
@@ -20,6 +22,20 @@ _FIRESTORE_UNAVAILABLE_LOGGED = False
 GOV_ACTION_STATE_COLLECTION = "gov_action_state"
 CC_VOTE_STATE_COLLECTION = "cc_vote_state"
 CHECKPOINTS_COLLECTION = "checkpoints"
+TREASURY_DONATION_STATE_COLLECTION = "treasury_donation_state"
+# Running totals live in treasury_donation_state/<epoch>; treasury_donation_state/<epoch>/blocks/<block_no>
+# records what each block added, so replays are idempotent. The summary reads only the epoch document.
+TREASURY_DONATION_BLOCKS_SUBCOLLECTION = "blocks"
+TREASURY_SUMMARY_STATE_COLLECTION = "treasury_summary_state"
+
+# Gov action tweet IDs already read or written, so CC votes quoting an action skip the Firestore read.
+# A posted tweet's ID never changes, so only hits are cached and they never go stale.
+ACTION_TWEET_ID_CACHE_SIZE = 1024
+_ACTION_TWEET_IDS: OrderedDict[str, str] = OrderedDict()
+_ACTION_TWEET_IDS_LOCK = Lock()
+
+# Epochs whose treasury summary is known to be done; the Firestore marker is the durable copy.
+_SUMMARISED_EPOCHS: set[int] = set()
 
 
 def _get_firestore_client():
@@ -28,7 +44,7 @@ def _get_firestore_client():
     if _FIRESTORE_CLIENT is not None:
         return _FIRESTORE_CLIENT
 
-    if firestore is None:
+    if not is_available(firestore):
         _log_firestore_unavailable_once("google-cloud-firestore is not installed")
         return None
 
@@ -58,7 +74,7 @@ def _log_firestore_unavailable_once(reason: str) -> None:
 
 
 def _server_timestamp() -> Any | None:
-    if firestore is None:
+    if not is_available(firestore):
         return None
     return firestore.SERVER_TIMESTAMP
 
@@ -71,26 +87,60 @@ def _cc_vote_id(ga_tx_hash: str, ga_index: int, voter_hash: str) -> str:
     return f"{ga_tx_hash}_{ga_index}_{voter_hash}"
 
 
+def _remember_action_tweet_id(action_id: str, tweet_id: str) -> None:
+    with _ACTION_TWEET_IDS_LOCK:
+        _ACTION_TWEET_IDS[action_id] = tweet_id
+        _ACTION_TWEET_IDS.move_to_end(action_id)
+        while len(_ACTION_TWEET_IDS) > ACTION_TWEET_ID_CACHE_SIZE:
+            _ACTION_TWEET_IDS.popitem(last=False)
+
+
+def _tweet_id_from(data: dict | None) -> str | None:
+    tweet_id = (data or {}).get("tweet_id")
+    if not tweet_id:
+        return None
+    return str(tweet_id).strip() or None
+
+
 def get_action_tweet_id(tx_hash: str, index: int) -> str | None:
-    """Return the persisted action tweet ID from Firestore."""
+    """Return the persisted action tweet ID (from the in-process cache, else Firestore)."""
+    action_id = _action_id(tx_hash, index)
+    cached = _ACTION_TWEET_IDS.get(action_id)
+    if cached is not None:
+        return cached
+
     client = _get_firestore_client()
     if client is None:
         return None
 
     try:
-        doc = client.collection(GOV_ACTION_STATE_COLLECTION).document(_action_id(tx_hash, index)).get()
+        doc = client.collection(GOV_ACTION_STATE_COLLECTION).document(action_id).get()
         if not doc.exists:
             return None
 
-        tweet_id = (doc.to_dict() or {}).get("tweet_id")
-        if not tweet_id:
-            return None
-        return str(tweet_id).strip() or None
+        tweet_id = _tweet_id_from(doc.to_dict())
+        if tweet_id:
+            _remember_action_tweet_id(action_id, tweet_id)
+        return tweet_id
     except Exception:
         logger.warning("Failed to read action tweet ID from Firestore [%s_%s]", tx_hash[:8], index, exc_info=True)
         return None
 
 
+def is_action_archived(tx_hash: str, index: int) -> bool:
+    """Return whether the gov action was already processed (tweeted/archived)."""
+    client = _get_firestore_client()
+    if client is None:
+        return False
+
+    try:
+        doc = client.collection(GOV_ACTION_STATE_COLLECTION).document(_action_id(tx_hash, index)).get()
+        return bool(doc.exists and (doc.to_dict() or {}).get("archived_action"))
+    except Exception:
+        logger.warning("Failed to read action state from Firestore [%s_%s]", tx_hash[:8], index, exc_info=True)
+        return False
+
+
 def save_action_tweet_id(tx_hash: str, index: int, tweet_id: str, source_block: int | None = None) -> None:
     """Persist action tweet ID and archived progress in Firestore."""
     client = _get_firestore_client()
@@ -111,6 +161,40 @@ def save_action_tweet_id(tx_hash: str, index: int, tweet_id: str, source_block:
         client.collection(GOV_ACTION_STATE_COLLECTION).document(_action_id(tx_hash, index)).set(payload, merge=True)
     except Exception:
         logger.warning("Failed to save action state in Firestore [%s_%s]", tx_hash[:8], index, exc_info=True)
+        return
+    if "tweet_id" in payload:
+        _remember_action_tweet_id(_action_id(tx_hash, index), payload["tweet_id"])
+
+
+def prime_action_tweet_ids(limit: int = 200) -> int:
+    """Load the tweet IDs of the most recently updated gov actions into the cache; returns how many."""
+    client = _get_firestore_client()
+    if client is None or not is_available(firestore):
+        return 0
+
+    try:
+        docs = (
+            client.collection(GOV_ACTION_STATE_COLLECTION)
+            .order_by("last_updated_at", direction=firestore.Query.DESCENDING)
+            .limit(limit)
+            .stream()
+        )
+        recent = [(doc.id, _tweet_id_from(doc.to_dict())) for doc in docs]
+    except Exception:
+        logger.warning("Failed to prime action tweet IDs from Firestore", exc_info=True)
+        return 0
+
+    primed = 0
+    for action_id, tweet_id in reversed(recent):  # oldest first, so the newest are evicted last
+        if tweet_id:
+            _remember_action_tweet_id(action_id, tweet_id)
+            primed += 1
+    return primed
+
+
+def clear_action_tweet_id_cache() -> None:
+    with _ACTION_TWEET_IDS_LOCK:
+        _ACTION_TWEET_IDS.clear()
 
 
 def mark_cc_vote_archived(
@@ -118,13 +202,20 @@ def mark_cc_vote_archived(
     ga_index: int,
     voter_hash: str,
     source_block: int | None = None,
+    vote_tx_hash: str | None = None,
 ) -> None:
-    """Persist CC vote archived status in Firestore."""
+    """Persist CC vote archived status in Firestore.
+
+    One document per action and voter; ``vote_tx_hash`` records which of the voter's votes it was,
+    so a later vote that changes it is not mistaken for one already archived.
+    """
     client = _get_firestore_client()
     if client is None:
         return
 
     payload: dict[str, Any] = {"archived_vote": True}
+    if vote_tx_hash:
+        payload["vote_tx_hash"] = vote_tx_hash
     if source_block is not None:
         payload["source_block"] = source_block
 
@@ -146,6 +237,27 @@ def mark_cc_vote_archived(
         )
 
 
+def is_cc_vote_archived(ga_tx_hash: str, ga_index: int, voter_hash: str, vote_tx_hash: str) -> bool:
+    """Return whether this CC vote (the voter's vote in ``vote_tx_hash``) was already processed."""
+    client = _get_firestore_client()
+    if client is None:
+        return False
+
+    try:
+        doc = client.collection(CC_VOTE_STATE_COLLECTION).document(_cc_vote_id(ga_tx_hash, ga_index, voter_hash)).get()
+        data = (doc.to_dict() or {}) if doc.exists else {}
+        return bool(data.get("archived_vote") and data.get("vote_tx_hash") == vote_tx_hash)
+    except Exception:
+        logger.warning(
+            "Failed to read CC vote state from Firestore [%s_%s_%s]",
+            ga_tx_hash[:8],
+            ga_index,
+            voter_hash[:8],
+            exc_info=True,
+        )
+        return False
+
+
 def get_checkpoint(name: str) -> dict[str, Any] | None:
     """Return a checkpoint document by name."""
     client = _get_firestore_client()
@@ -162,13 +274,26 @@ def get_checkpoint(name: str) -> dict[str, Any] | None:
         return None
 
 
-def set_checkpoint(name: str, block_no: int, epoch_no: int | None = None) -> None:
-    """Write/update a named checkpoint document."""
+def set_checkpoint(
+    name: str,
+    block_no: int,
+    epoch_no: int | None = None,
+    block_hash: str | None = None,
+    extra: dict[str, Any] | None = None,
+) -> None:
+    """Write/update a named checkpoint document.
+
+    ``extra`` fields (e.g. rollback-tracking state) are merged into the document.
+    """
     client = _get_firestore_client()
     if client is None:
         return
 
     payload: dict[str, Any] = {"last_block_no": block_no, "last_epoch": epoch_no}
+    if block_hash:
+        payload["last_block_hash"] = block_hash
+    if extra:
+        payload.update(extra)
     timestamp = _server_timestamp()
     if timestamp is not None:
         payload["updated_at"] = timestamp
@@ -177,3 +302,134 @@ def set_checkpoint(name: str, block_no: int, epoch_no: int | None = None) -> Non
         client.collection(CHECKPOINTS_COLLECTION).document(name).set(payload, merge=True)
     except Exception:
         logger.warning("Failed to write checkpoint to Firestore [%s]", name, exc_info=True)
+
+
+def record_block_treasury_donations(summary: TreasuryDonationSummary, block_no: int) -> None:
+    """Fold one block's donations into its epoch's running total.
+
+    The epoch document under ``treasury_donation_state`` keeps ``count``, ``total_lovelace`` and
+    ``blocks`` totals. A small per-block marker records what the block added, and both are written
+    in one transaction, so a retried webhook adds nothing and a replayed height only adds the
+    difference from the orphaned block. Blocks without donations are recorded too, so ``blocks``
+    shows how much of the epoch the total covers.
+    """
+    client = _get_firestore_client()
+    if client is None:
+        return
+
+    epoch_ref = client.collection(TREASURY_DONATION_STATE_COLLECTION).document(str(summary.epoch_no))
+    block_ref = epoch_ref.collection(TREASURY_DONATION_BLOCKS_SUBCOLLECTION).document(str(block_no))
+
+    @firestore.transactional
+    def _apply(transaction) -> None:
+        snapshot = block_ref.get(transaction=transaction)
+        previous = (snapshot.to_dict() or {}) if snapshot.exists else None
+        count = summary.count - int((previous or {}).get("count", 0))
+        total = summary.total_lovelace - int((previous or {}).get("total_lovelace", 0))
+        if previous is not None and not count and not total:
+            return
+
+        transaction.set(
+            block_ref, {"block_no": block_no, "count": summary.count, "total_lovelace": summary.total_lovelace}
+        )
+        payload: dict[str, Any] = {
+            "epoch_no": summary.epoch_no,
+            "count": firestore.Increment(count),
+            "total_lovelace": firestore.Increment(total),
+            "blocks": firestore.Increment(0 if previous is not None else 1),
+        }
+        timestamp = _server_timestamp()
+        if timestamp is not None:
+            payload["updated_at"] = timestamp
+        transaction.set(epoch_ref, payload, merge=True)
+
+    try:
+        _apply(client.transaction())
+    except Exception:
+        logger.warning(
+            "Failed to save treasury donation state in Firestore [epoch %s, block %s]",
+            summary.epoch_no,
+            block_no,
+            exc_info=True,
+        )
+
+
+def get_epoch_treasury_donations(
+    epoch_no: int, *, block_range: tuple[int, int] | None = None
+) -> TreasuryDonationSummary | None:
+    """Return the accumulated donations for an epoch, or None if nothing was recorded.
+
+    With ``block_range`` (the epoch's first and last block), also None unless every block in
+    that range was accumulated — e.g. the accumulator was enabled mid-epoch or blocks were
+    missed while the bot was down — so the caller can fall back to a full DB-Sync aggregate.
+    """
+    client = _get_firestore_client()
+    if client is None:
+        return None
+
+    try:
+        doc = client.collection(TREASURY_DONATION_STATE_COLLECTION).document(str(epoch_no)).get()
+    except Exception:
+        logger.warning("Failed to read treasury donation state from Firestore [epoch %s]", epoch_no, exc_info=True)
+        return None
+    if not doc.exists:
+        return None
+    data = doc.to_dict() or {}
+
+    if block_range is not None:
+        first_block_no, last_block_no = block_range
+        expected = last_block_no - first_block_no + 1
+        blocks = int(data.get("blocks", 0))
+        if blocks != expected:
+            logger.info(
+                "Treasury donation accumulator for epoch %s covers %s of %s blocks (%s-%s)",
+                epoch_no,
+                blocks,
+                expected,
+                first_block_no,
+                last_block_no,
+            )
+            return None
+
+    return TreasuryDonationSummary(
+        epoch_no=epoch_no,
+        count=int(data.get("count", 0)),
+        total_lovelace=int(data.get("total_lovelace", 0)),
+    )
+
+
+def is_epoch_summarised(epoch_no: int) -> bool:
+    """Whether the treasury summary for ``epoch_no`` was already posted (by any instance, before any restart)."""
+    if epoch_no in _SUMMARISED_EPOCHS:
+        return True
+    client = _get_firestore_client()
+    if client is None:
+        return False
+
+    try:
+        doc = client.collection(TREASURY_SUMMARY_STATE_COLLECTION).document(str(epoch_no)).get()
+    except Exception:
+        logger.warning("Failed to read treasury summary marker from Firestore [epoch %s]", epoch_no, exc_info=True)
+        return False
+    if doc.exists and (doc.to_dict() or {}).get("summarised"):
+        _SUMMARISED_EPOCHS.add(epoch_no)
+        return True
+    return False
+
+
+def mark_epoch_summarised(epoch_no: int, tweet_id: str | None) -> None:
+    """Record that the treasury summary for ``epoch_no`` is done, so it is never posted twice."""
+    _SUMMARISED_EPOCHS.add(epoch_no)
+    client = _get_firestore_client()
+    if client is None:
+        return
+
+    payload: dict[str, Any] = {"epoch_no": epoch_no, "summarised": True, "summary_tweet_id": tweet_id or ""}
+    timestamp = _server_timestamp()
+    if timestamp is not None:
+        payload["summarised_at"] = timestamp
+
+    try:
+        client.collection(TREASURY_SUMMARY_STATE_COLLECTION).document(str(epoch_no)).set(payload, merge=True)
+    except Exception:
+        logger.warning("Failed to save treasury summary marker in Firestore [epoch %s]", epoch_no, exc_info=True)
@@ -0,0 +1,275 @@
+"""Lightweight tracing for the block pipeline.
+
+Spans nest through a context variable, so they follow ``await`` chains:
+``webhook`` → ``block`` → ``gov_actions`` / ``cc_votes`` → per-item
+``gov_action`` / ``cc_vote`` → ``fetch`` / ``format`` / ``post`` / ...
+
+The sampling decision is made once per trace, at the root span. Unsampled
+traces (and every trace while no exporter is configured) get a shared
+no-op span, so the cost is a context-variable lookup. Finished traces are
+handed to a background thread for export, which keeps file writes and HTTP
+calls off the event loop.
+
+Exporters:
+
+- :class:`JsonLinesExporter` appends one JSON object per span to a file,
+  for offline analysis.
+- :class:`OtlpExporter` posts OTLP/HTTP JSON to a collector, so no
+  OpenTelemetry SDK is needed.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from bot.lazy import lazy_import
+from bot.logging import get_logger
+
+requests = lazy_import("requests")
+
+logger = get_logger("tracing")
+
+SERVICE_NAME = "gov-actions-bot"
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+    # Finished spans of the whole trace, shared by every span in it.
+    _finished: list[Span] = field(default_factory=list, repr=False)
+
+    sampled = True
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    sampled = False
+    trace_id = None
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Exporter(abc.ABC):
+    """Sends finished spans somewhere; called from the export thread, one trace at a time."""
+
+    @abc.abstractmethod
+    def export(self, spans: list[Span]) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLinesExporter(Exporter):
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, spans: list[Span]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.as_dict(), default=str) + "\n")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpExporter(Exporter):
+    """OTLP/HTTP exporter using the JSON encoding (``POST {endpoint}/v1/traces``)."""
+
+    def __init__(self, endpoint: str, *, timeout: float = 5.0) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    @staticmethod
+    def _span(span: Span) -> dict:
+        out = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        }
+        if span.parent_id:
+            out["parentSpanId"] = span.parent_id
+        if span.error:
+            out["status"] = {"code": 2, "message": span.error}  # STATUS_CODE_ERROR
+        return out
+
+    def payload(self, spans: list[Span]) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                    "scopeSpans": [{"scope": {"name": "bot.tracing"}, "spans": [self._span(s) for s in spans]}],
+                }
+            ]
+        }
+
+    def export(self, spans: list[Span]) -> None:
+        response = self._session.post(self.url, json=self.payload(spans), timeout=self.timeout)
+        if response.status_code >= 300:
+            logger.warning("OTLP export failed (HTTP %s)", response.status_code)
+
+    def close(self) -> None:
+        self._session.close()
+
+
+class _ExportWorker:
+    """Background thread draining finished traces into the exporter."""
+
+    def __init__(self, exporter: Exporter, max_pending: int = 1000) -> None:
+        self.exporter = exporter
+        self._queue: queue.Queue[list[Span] | None] = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+        self._thread.start()
+
+    def submit(self, spans: list[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            logger.debug("Trace export queue full — dropping trace")
+
+    def _run(self) -> None:
+        while (spans := self._queue.get()) is not None:
+            try:
+                self.exporter.export(spans)
+            except Exception:
+                logger.warning("Trace export failed", exc_info=True)
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self.exporter.close()
+
+
+_worker: _ExportWorker | None = None
+_sample_rate = 1.0
+
+
+def configure(exporter: Exporter | None, *, sample_rate: float = 1.0) -> None:
+    """Install ``exporter`` (None disables tracing) and the per-trace sample rate."""
+    global _worker, _sample_rate
+    shutdown()
+    _sample_rate = sample_rate
+    if exporter is not None:
+        _worker = _ExportWorker(exporter)
+
+
+def shutdown() -> None:
+    """Flush pending traces and stop the export thread."""
+    global _worker
+    if _worker is not None:
+        _worker.close()
+        _worker = None
+
+
+def exporter_from_config(kind: str, *, jsonl_path: str, otlp_endpoint: str) -> Exporter | None:
+    if kind == "jsonl":
+        return JsonLinesExporter(Path(jsonl_path))
+    if kind == "otlp":
+        return OtlpExporter(otlp_endpoint)
+    return None
+
+
+def current_span() -> Span | _NoopSpan:
+    return _current.get() or _NOOP
+
+
+class span:
+    """Context manager opening a child of the current span (or a new, sampled-or-not, trace)."""
+
+    __slots__ = ("_name", "_attributes", "_span", "_token")
+
+    def __init__(self, name: str, **attributes) -> None:
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> Span | _NoopSpan:
+        parent = _current.get()
+        if parent is None:
+            if _worker is None or random.random() >= _sample_rate:
+                # Unsampled root: the no-op marker is propagated so descendants skip too.
+                self._span = None
+                self._token = _current.set(_NOOP)
+                return _NOOP
+            current = Span(self._name, os.urandom(16).hex(), os.urandom(8).hex(), None, time.time_ns())
+        elif parent is _NOOP:
+            self._span, self._token = None, None
+            return _NOOP
+        else:
+            current = Span(
+                self._name,
+                parent.trace_id,
+                os.urandom(8).hex(),
+                parent.span_id,
+                time.time_ns(),
+                _finished=parent._finished,
+            )
+        current.attributes.update(self._attributes)
+        self._span = current
+        self._token = _current.set(current)
+        return current
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._token is not None:
+            _current.reset(self._token)
+        current = self._span
+        if current is None:
+            return
+        current.end_ns = time.time_ns()
+        if exc is not None:
+            current.error = f"{exc_type.__name__}: {exc}"
+        current._finished.append(current)
+        if current.parent_id is None and _worker is not None:
+            _worker.submit(current._finished)
@@ -1,22 +1,43 @@
-from xdk import Client
-from xdk.oauth1_auth import OAuth1
-from xdk.posts.models import CreateRequest, CreateRequestReply
+from __future__ import annotations
+
+import threading
 
 from bot.config import config
+from bot.lazy import lazy_import
 from bot.logging import get_logger
+from bot.twitter.text import MAX_WEIGHTED_LENGTH, weighted_length
+
+# xdk is the single most expensive import; load it when the first tweet is posted (or on warm-up).
+xdk = lazy_import("xdk")
+xdk_oauth1 = lazy_import("xdk.oauth1_auth")
+xdk_models = lazy_import("xdk.posts.models")
 
 logger = get_logger("twitter.client")
 
 
-def _get_client() -> Client:
-    oauth1 = OAuth1(
-        api_key=config.twitter.api_key,
-        api_secret=config.twitter.api_secret_key,
-        callback="oob",
-        access_token=config.twitter.access_token,
-        access_token_secret=config.twitter.access_token_secret,
-    )
-    return Client(auth=oauth1)
+class TweetTooLongError(ValueError):
+    """The text exceeds X's weighted length limit; raised before anything is sent."""
+
+
+_CLIENT: xdk.Client | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _get_client() -> xdk.Client:
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            oauth1 = xdk_oauth1.OAuth1(
+                api_key=config.twitter.api_key,
+                api_secret=config.twitter.api_secret_key,
+                callback="oob",
+                access_token=config.twitter.access_token,
+                access_token_secret=config.twitter.access_token_secret,
+            )
+            _CLIENT = xdk.Client(auth=oauth1)
+    return _CLIENT
 
 
 def _extract_post_id(response: object) -> str | None:
@@ -37,6 +58,12 @@ def _extract_post_id(response: object) -> str | None:
     return None
 
 
+def _ensure_fits(text: str) -> None:
+    length = weighted_length(text)
+    if length > MAX_WEIGHTED_LENGTH:
+        raise TweetTooLongError(f"Tweet is {length} weighted characters (limit {MAX_WEIGHTED_LENGTH})")
+
+
 def post_tweet(text: str) -> str | None:
     """Post a tweet. Controlled by the TWEET_POSTING_ENABLED flag in config."""
     logger.info("Tweet content:\n%s", text)
@@ -45,8 +72,9 @@ def post_tweet(text: str) -> str | None:
         logger.info("Tweet posting disabled — set TWEET_POSTING_ENABLED=true to enable")
         return None
 
+    _ensure_fits(text)
     client = _get_client()
-    response = client.posts.create(CreateRequest(text=text))
+    response = client.posts.create(xdk_models.CreateRequest(text=text))
     post_id = _extract_post_id(response)
     logger.info("Tweet posted: %s", response)
     return post_id
@@ -61,8 +89,9 @@ def post_quote_tweet(text: str, quote_tweet_id: str) -> str | None:
         logger.info("Tweet posting disabled — set TWEET_POSTING_ENABLED=true to enable")
         return None
 
+    _ensure_fits(text)
     client = _get_client()
-    response = client.posts.create(CreateRequest(text=text, quote_tweet_id=quote_tweet_id))
+    response = client.posts.create(xdk_models.CreateRequest(text=text, quote_tweet_id=quote_tweet_id))
     post_id = _extract_post_id(response)
     logger.info("Quote tweet posted: %s", response)
     return post_id
@@ -77,11 +106,12 @@ def post_reply_tweet(text: str, in_reply_to_tweet_id: str) -> str | None:
         logger.info("Tweet posting disabled — set TWEET_POSTING_ENABLED=true to enable")
         return None
 
+    _ensure_fits(text)
     client = _get_client()
     response = client.posts.create(
-        CreateRequest(
+        xdk_models.CreateRequest(
             text=text,
-            reply=CreateRequestReply(
+            reply=xdk_models.CreateRequestReply(
                 in_reply_to_tweet_id=in_reply_to_tweet_id,
                 auto_populate_reply_metadata=True,
             ),
@@ -90,3 +120,24 @@ def post_reply_tweet(text: str, in_reply_to_tweet_id: str) -> str | None:
     post_id = _extract_post_id(response)
     logger.info("Reply tweet posted: %s", response)
     return post_id
+
+
+def post_thread(texts: list[str], in_reply_to_tweet_id: str | None = None) -> list[str | None]:
+    """Post ``texts`` as a reply chain (e.g. from ``text.split_thread``); returns each post ID.
+
+    Every part is length-checked before the first one is sent, so a thread is never left half-posted
+    for that reason.
+    """
+    for text in texts:
+        _ensure_fits(text)
+
+    post_ids: list[str | None] = []
+    parent_id = in_reply_to_tweet_id
+    for text in texts:
+        post_id = post_reply_tweet(text, parent_id) if parent_id else post_tweet(text)
+        post_ids.append(post_id)
+        if post_id is None and config.tweet_posting_enabled:
+            logger.warning("Thread stopped after %d of %d posts: no post ID to reply to", len(post_ids), len(texts))
+            break
+        parent_id = post_id or parent_id
+    return post_ids
@@ -1,9 +1,16 @@
-from decimal import Decimal
-
+from bot.cc_profiles import trusted_witness_keys
 from bot.links import make_governance_action_link
 from bot.metadata.fetcher import sanitise_url
-from bot.models import CcVote, GovAction, TreasuryDonation
+from bot.metadata.witness import trusted_author_indexes
+from bot.models import CcVote, GovAction, TreasuryDonationSummary
 from bot.twitter import templates
+from bot.twitter.text import compile_template, fits
+
+# Compiled once at import; each tweet is then rendered and fitted to X's weighted length limit.
+_GOV_ACTION = compile_template(templates.GOV_ACTION)
+_CC_VOTE = compile_template(templates.CC_VOTE)
+_CC_VOTE_NO_QUOTE = compile_template(templates.CC_VOTE_NO_QUOTE)
+_TREASURY_DONATIONS = compile_template(templates.TREASURY_DONATIONS)
 
 VOTES_MAPPING = {
     "YES": "Constitutional",
@@ -19,15 +26,21 @@ def _vote_display(vote: str) -> str:
 def _authors_line(metadata: dict | None, *, label: str = "Authors", emoji: str = "") -> str:
     """Extract author names from CIP-100 metadata.
 
-    Returns a formatted line like 'Authors: Name1, Name2\n' or empty string.
+    Returns a formatted line like 'Authors: Name1 ✓, Name2\n' or empty string.
+    Authors are marked with ✓ only when their witness verifies under a key their
+    CC profile lists, so a self-signed name does not get one.
     """
     if not metadata:
         return ""
     authors = metadata.get("authors")
-    if not authors:
+    if not authors or not isinstance(authors, list):
         return ""
-    names = [a.get("name", "") for a in authors if isinstance(a, dict)]
-    names = [n for n in names if n]  # filter blanks
+    trusted = trusted_author_indexes(metadata, trusted_witness_keys())
+    names = [
+        f"{a['name']} ✓" if i in trusted else a["name"]
+        for i, a in enumerate(authors)
+        if isinstance(a, dict) and isinstance(a.get("name"), str) and a["name"]  # filter blanks
+    ]
     if not names:
         return ""
     emoji_prefix = f"{emoji} " if emoji else ""
@@ -39,7 +52,9 @@ def format_gov_action_tweet(action: GovAction, metadata: dict | None) -> str:
     title_line = f"Title: {title}\n" if title else ""
     authors_line = _authors_line(metadata, label="Authors")
 
-    return templates.GOV_ACTION.format(
+    # Over-long tweets lose author names first, then title characters; type and link always survive.
+    return _GOV_ACTION.fit(
+        shrink=("authors_line", "title_line"),
         title_line=title_line,
         authors_line=authors_line,
         action_type=action.action_type_display,
@@ -62,27 +77,38 @@ def format_cc_vote_tweet(
         if not voted_by_line:
             voted_by_line = f"Voted by: CC member ({vote.voter_hash[:8]})\n"
 
-    if quote_tweet_id:
-        # Quote-tweet: no GA link needed (it's embedded in the quoted tweet).
-        return templates.CC_VOTE.format(
+    ga_link = make_governance_action_link(vote.ga_tx_hash, vote.ga_index)
+
+    def _fit(rationale_url: str) -> str:
+        # Over-long tweets lose voter names; every other field is bounded.
+        if quote_tweet_id:
+            # Quote-tweet: no GA link needed (it's embedded in the quoted tweet).
+            return _CC_VOTE.fit(
+                shrink=("voted_by_line",),
+                vote_display=_vote_display(vote.vote),
+                voted_by_line=voted_by_line,
+                rationale_url=rationale_url,
+            )
+
+        # Fallback: include GA link in the tweet text.
+        return _CC_VOTE_NO_QUOTE.fit(
+            shrink=("voted_by_line",),
             vote_display=_vote_display(vote.vote),
             voted_by_line=voted_by_line,
-            rationale_url=sanitise_url(vote.raw_url),
+            ga_link=ga_link,
+            rationale_url=rationale_url,
         )
 
-    # Fallback: include GA link in the tweet text.
-    return templates.CC_VOTE_NO_QUOTE.format(
-        vote_display=_vote_display(vote.vote),
-        voted_by_line=voted_by_line,
-        ga_link=make_governance_action_link(vote.ga_tx_hash, vote.ga_index),
-        rationale_url=sanitise_url(vote.raw_url),
-    )
-
+    tweet = _fit(sanitise_url(vote.raw_url))
+    if not fits(tweet):
+        # An anchor X does not shorten to a t.co link (e.g. a long ar:// URI) would only break if cut,
+        # so point at the governance action on the explorer, which lists the vote, instead.
+        tweet = _fit(ga_link)
+    return tweet
 
-def format_treasury_donations_tweet(donations: list[TreasuryDonation]) -> str:
-    total_ada = sum((d.amount_ada for d in donations), start=Decimal(0))
 
-    return templates.TREASURY_DONATIONS.format(
-        count=len(donations),
-        total_ada=total_ada,
+def format_treasury_donation_summary_tweet(summary: TreasuryDonationSummary) -> str:
+    return _TREASURY_DONATIONS.render(
+        count=summary.count,
+        total_ada=summary.total_ada,
     )
@@ -2,6 +2,8 @@
 
 Edit these constants to change tweet wording without touching formatter logic.
 Use Python str.format() placeholders — see formatter.py for available variables.
+Templates are compiled once by bot.twitter.text; the formatter shortens the
+optional lines if a rendered tweet would exceed X's 280 weighted characters.
 """
 
 GOV_ACTION = """\
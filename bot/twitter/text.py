@@ -0,0 +1,224 @@
+"""Tweet text engine: weighted length, compiled templates, truncation and threads.
+
+X measures tweets in weighted characters (the twitter-text v3 rules):
+
+- after NFC normalisation, code points in a few Latin and punctuation ranges
+  weigh 1 and everything else (CJK, most symbols) weighs 2;
+- an emoji weighs 2, including ZWJ sequences, skin-tone modifiers and flags;
+- every URL weighs 23 whatever its length, because X wraps it in t.co.
+
+A tweet may weigh at most 280. Everything here runs before the network call,
+so a tweet the API would reject is trimmed (or split into a reply thread)
+up front instead of failing after a round trip.
+"""
+
+from __future__ import annotations
+
+import re
+import string
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+
+MAX_WEIGHTED_LENGTH = 280
+URL_WEIGHT = 23
+EMOJI_WEIGHT = 2
+ELLIPSIS = "…"
+
+# Code point ranges that weigh 1 (twitter-text v3 config); all others weigh 2.
+_LIGHT_RANGES = ((0x0000, 0x10FF), (0x2000, 0x200D), (0x2010, 0x201F), (0x2032, 0x2037))
+
+# Scheme URLs (trailing punctuation is not part of the link), plus bare domains on common TLDs,
+# which X links too.
+_URL = (
+    r"https?://[^\s]*[^\s.,:;!?)\]'\"]"
+    r"|(?<![\w@./-])(?:[a-z0-9-]+\.)+(?:com|org|net|io|co|dev|app|ai|xyz|info|gov|edu|tools|me|uk|de|jp|kr|us"
+    r"|ca|eu|ch|fr|network|foundation|finance|global)\b(?:/[^\s]*[^\s.,:;!?)\]'\"])?"
+)
+
+# An approximation of the twemoji pattern X uses: pictographs with optional variation selector,
+# skin tone, keycap or tag modifiers, flags, and ZWJ sequences of those.
+_EMOJI_UNIT = (
+    r"(?:[\U0001F1E6-\U0001F1FF]{2}"
+    r"|[\u2194-\u21AA\u231A-\u23FF\u25AA-\u25FE\u2600-\u27BF\u2934\u2935\u2B05-\u2B55\u3030\u303D\u3297\u3299"
+    r"\U0001F000-\U0001FAFF](?:\uFE0F|[\U0001F3FB-\U0001F3FF]|\u20E3|[\U000E0020-\U000E007F])*"
+    r"|[\u00A9\u00AE\u203C\u2049\u2122\u2139\u24C2]\uFE0F"
+    r"|[0-9#*]\uFE0F?\u20E3)"
+)
+_EMOJI = rf"{_EMOJI_UNIT}(?:\u200D{_EMOJI_UNIT})*"
+
+_SPECIAL = re.compile(rf"(?P<url>{_URL})|(?P<emoji>{_EMOJI})", re.IGNORECASE)
+
+
+def _char_weight(char: str) -> int:
+    code = ord(char)
+    for low, high in _LIGHT_RANGES:
+        if low <= code <= high:
+            return 1
+    return 2
+
+
+def _plain_weight(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    return sum(_char_weight(char) for char in text)
+
+
+def _tokens(text: str):
+    """Yield ``(token, weight)``: whole URLs and emoji, single characters otherwise."""
+    position = 0
+    for match in _SPECIAL.finditer(text):
+        for char in text[position : match.start()]:
+            yield char, _char_weight(char)
+        yield match.group(), URL_WEIGHT if match.lastgroup == "url" else EMOJI_WEIGHT
+        position = match.end()
+    for char in text[position:]:
+        yield char, _char_weight(char)
+
+
+def weighted_length(text: str) -> int:
+    """Length of ``text`` as X counts it."""
+    text = unicodedata.normalize("NFC", text)
+    total = 0
+    position = 0
+    for match in _SPECIAL.finditer(text):
+        total += _plain_weight(text[position : match.start()])
+        total += URL_WEIGHT if match.lastgroup == "url" else EMOJI_WEIGHT
+        position = match.end()
+    return total + _plain_weight(text[position:])
+
+
+def fits(text: str, limit: int = MAX_WEIGHTED_LENGTH) -> bool:
+    return weighted_length(text) <= limit
+
+
+def truncate(text: str, max_weight: int, *, ellipsis: str = ELLIPSIS) -> str:
+    """Shorten ``text`` to at most ``max_weight``, ending in ``ellipsis``.
+
+    Cuts between tokens, so a URL or emoji is kept whole or dropped, and backs
+    up to a word boundary when one is close. Returns "" if nothing fits.
+    """
+    text = unicodedata.normalize("NFC", text)
+    if weighted_length(text) <= max_weight:
+        return text
+    budget = max_weight - weighted_length(ellipsis)
+    if budget <= 0:
+        return ""
+
+    kept, used = [], 0
+    for token, weight in _tokens(text):
+        if used + weight > budget:
+            break
+        kept.append(token)
+        used += weight
+    prefix = "".join(kept).rstrip()
+    space = prefix.rfind(" ")
+    if space > len(prefix) * 0.6:
+        prefix = prefix[:space]
+    prefix = prefix.rstrip(" ,;:-")
+    return f"{prefix}{ellipsis}" if prefix else ""
+
+
+@dataclass(frozen=True)
+class Template:
+    """A ``str.format``-style template parsed once into literal and field parts."""
+
+    source: str
+    parts: tuple[tuple[str, str | None, str], ...]
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(field for _, field, _ in self.parts if field is not None)
+
+    def render(self, **values) -> str:
+        out = []
+        for literal, field, spec in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(values[field], spec))
+        return "".join(out)
+
+    def fit(self, *, shrink: tuple[str, ...] = (), limit: int = MAX_WEIGHTED_LENGTH, **values) -> str:
+        """Render, then truncate the ``shrink`` fields (first listed, first cut) until the text fits.
+
+        A field ending in a newline keeps it, so a shortened line stays a line;
+        a field with nothing left worth keeping is dropped. Fields not listed
+        are never touched, so the result can still exceed ``limit`` — callers
+        that cannot accept that should :func:`split_thread` it.
+        """
+        text = self.render(**values)
+        overflow = weighted_length(text) - limit
+        for field in shrink:
+            while overflow > 0 and values[field]:
+                value = str(values[field])
+                body, newline = (value[:-1], "\n") if value.endswith("\n") else (value, "")
+                shortened = truncate(body, weighted_length(body) - overflow)
+                values[field] = f"{shortened}{newline}" if shortened else ""
+                text = self.render(**values)
+                overflow = weighted_length(text) - limit
+        return text
+
+
+@lru_cache(maxsize=64)
+def compile_template(source: str) -> Template:
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(source):
+        if conversion:
+            raise ValueError(f"Template conversions are not supported: {{{field}!{conversion}}}")
+        if field is not None and not field.isidentifier():
+            raise ValueError(f"Template fields must be plain names: {{{field}}}")
+        parts.append((literal, field, spec or ""))
+    return Template(source, tuple(parts))
+
+
+def _split_line(line: str, limit: int) -> list[str]:
+    """Split one over-long line on spaces (hard-cutting any single word that is still too long)."""
+    chunks, current = [], ""
+    for word in line.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if weighted_length(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        while weighted_length(word) > limit:
+            head = truncate(word, limit, ellipsis="")
+            if not head:
+                break
+            chunks.append(head)
+            word = word[len(head) :]
+        current = word
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_thread(text: str, limit: int = MAX_WEIGHTED_LENGTH, *, numbered: bool = False) -> list[str]:
+    """Split ``text`` into tweets of at most ``limit``, breaking at lines, then words.
+
+    With ``numbered``, each tweet ends in `` (i/n)`` (the room for it is reserved up front).
+    """
+    if fits(text, limit) and not numbered:
+        return [text]
+    budget = limit - len(" (99/99)") if numbered else limit
+
+    chunks, current = [], ""
+    for line in text.split("\n"):
+        candidate = f"{current}\n{line}" if current else line
+        if weighted_length(candidate) <= budget:
+            current = candidate
+            continue
+        if current.strip():
+            chunks.append(current.strip("\n"))
+        if weighted_length(line) <= budget:
+            current = line
+        else:
+            *full, current = _split_line(line, budget) or [""]
+            chunks.extend(full)
+    if current.strip():
+        chunks.append(current.strip("\n"))
+
+    if numbered:
+        total = len(chunks)
+        chunks = [f"{chunk} ({i}/{total})" for i, chunk in enumerate(chunks, start=1)]
+    return chunks
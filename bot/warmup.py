@@ -0,0 +1,139 @@
+"""Startup warm-up of connections, clients and caches.
+
+Heavy modules are bound with :func:`bot.lazy.lazy_import`, and connections
+are otherwise opened by the first webhook that needs them. :func:`warm_up`
+runs from the lifespan, while the server starts accepting requests, and does
+that work up front, one concurrent step per resource:
+
+- ``imports``: the deferred dependencies (psycopg, requests, tenacity, pyld, cryptography)
+- ``database``: the SSH tunnel (when configured) and the DB-Sync connection
+- ``firestore``: the client, the chain checkpoint and recent action tweet IDs
+  (blocks are held until the checkpoint is restored or the step gives up)
+- ``x_client``: the X client (only imported while posting is disabled)
+- ``cc_profiles``: the CC voter hash -> X handle map
+
+Each step is bounded by ``WARMUP_TIMEOUT_SECONDS``. :func:`readiness` backs
+``GET /ready``, which answers 200 once every step has finished — a step that
+failed or timed out is reported, and the pipeline then sets that resource up
+on first use as it would without warm-up — so a Cloud Run startup probe can
+hold traffic back until the instance is warm.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from bot import cc_profiles, state_store
+from bot.config import config
+from bot.db import repository
+from bot.lazy import is_available
+from bot.logging import get_logger
+from bot.metadata import fetcher, witness
+from bot.twitter import client as twitter_client
+
+logger = get_logger("warmup")
+
+PENDING = "pending"
+OK = "ok"
+SKIPPED = "skipped"
+FAILED = "failed"
+TIMED_OUT = "timeout"
+
+# A step returns False when there is nothing to warm (e.g. Firestore is not configured).
+Step = Callable[[], Awaitable[bool | None]]
+
+_status: dict[str, str] = {}
+_seconds: dict[str, float] = {}
+_finished = False
+
+
+def import_deferred() -> None:
+    """Import the dependencies :mod:`bot.lazy` deferred at startup."""
+    is_available(repository.psycopg)
+    fetcher.warm_up()
+    is_available(witness.jsonld)
+    is_available(witness.ed25519)
+
+
+async def _warm_database(tunnel_manager) -> None:
+    if tunnel_manager is not None:
+        await asyncio.to_thread(tunnel_manager.get_tunneled_url)
+    await repository.connect()
+
+
+async def _warm_firestore(restore_chain_state: Callable[[], Awaitable[None]] | None) -> bool:
+    if await asyncio.to_thread(state_store._get_firestore_client) is None:
+        return False
+    if restore_chain_state is not None:
+        await restore_chain_state()
+    primed = await asyncio.to_thread(state_store.prime_action_tweet_ids)
+    logger.debug("Primed %s recent action tweet IDs", primed)
+    return True
+
+
+def _warm_x_client() -> None:
+    if config.tweet_posting_enabled:
+        twitter_client._get_client()
+    else:
+        is_available(twitter_client.xdk_models)
+
+
+def default_steps(
+    *, tunnel_manager=None, restore_chain_state: Callable[[], Awaitable[None]] | None = None
+) -> dict[str, Step]:
+    """The warm-up steps for this process; ``restore_chain_state`` is awaited once Firestore is reachable.
+
+    It runs under the step timeout and is cancelled with it, so it must apply its result on the event loop.
+    """
+    return {
+        "imports": lambda: asyncio.to_thread(import_deferred),
+        "database": lambda: _warm_database(tunnel_manager),
+        "firestore": lambda: _warm_firestore(restore_chain_state),
+        "x_client": lambda: asyncio.to_thread(_warm_x_client),
+        "cc_profiles": lambda: asyncio.to_thread(cc_profiles.preload_profiles),
+    }
+
+
+async def _run_step(name: str, step: Step, timeout: float) -> None:
+    start = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(step(), timeout)
+    except TimeoutError:
+        _status[name] = TIMED_OUT
+        logger.warning("Warm-up step %s timed out after %.0fs", name, timeout)
+    except Exception:
+        _status[name] = FAILED
+        logger.warning("Warm-up step %s failed", name, exc_info=True)
+    else:
+        _status[name] = SKIPPED if result is False else OK
+    _seconds[name] = time.perf_counter() - start
+
+
+async def warm_up(steps: dict[str, Step], *, timeout: float | None = None) -> None:
+    """Run ``steps`` concurrently and record their outcome for :func:`readiness`."""
+    global _finished
+    timeout = config.warmup_timeout_seconds if timeout is None else timeout
+    _finished = False
+    _status.clear()
+    _seconds.clear()
+    _status.update(dict.fromkeys(steps, PENDING))
+
+    await asyncio.gather(*(_run_step(name, step, timeout) for name, step in steps.items()))
+    _finished = True
+    logger.info(
+        "Warm-up done: %s",
+        ", ".join(f"{name} {_status[name]} ({_seconds[name] * 1000:.0f}ms)" for name in steps),
+    )
+
+
+def readiness() -> dict:
+    """Warm-up progress for ``GET /ready``: ``ready`` turns true once every step has finished."""
+    return {
+        "ready": _finished,
+        "steps": {
+            name: {"status": status, "seconds": round(_seconds[name], 3) if name in _seconds else None}
+            for name, status in _status.items()
+        },
+    }
@@ -2,124 +2,258 @@
 
 Reads configuration from .env (or environment variables).
 
+Rationales are fetched concurrently and progress is recorded in a manifest
+(``rationales/.backfill_manifest.json`` by default), so an interrupted run
+resumes where it stopped and failed fetches are retried on the next run.
+
+The manifest also records the highest ``tx.id`` (gov actions) and
+``voting_procedure.id`` (CC votes) processed; later runs only query rows
+above those marks. Pass ``--full`` to rescan everything.
+
+Large rebuilds can be split across hosts with ``--shard i/n`` (each host
+writes ``.backfill_manifest.shard-i-of-n.json``) and across local processes
+with ``--workers N``. Copy the shard archives into one ``rationales/`` tree
+and combine their manifests with ``--merge``.
+
+``--pack PATH`` writes into a content-addressed pack file instead of the
+directory layout (see ``bot/archive/pack.py``): documents shared by several
+votes are stored once, and the run reports the dedup ratio and bytes saved.
+
 Usage:
-    uv run python scripts/backfill_rationales.py
+    uv run python scripts/backfill_rationales.py [--concurrency 16] [--full]
+    uv run python scripts/backfill_rationales.py --shard 0/4 --workers 8
+    uv run python scripts/backfill_rationales.py --merge rationales/.backfill_manifest.shard-*.json
+    uv run python scripts/backfill_rationales.py --pack rationales.pack
 """
 
 from __future__ import annotations
 
+import argparse
 import asyncio
-import json
+import multiprocessing
 import sys
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Ensure the project root is on the import path.
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from bot.db.repository import get_all_cc_votes, get_all_gov_actions
+from bot.archive.backfill import BackfillItem, run_backfill
+from bot.archive.layout import RATIONALES_DIR, action_key, cc_vote_key, is_placeholder, key_kind
+from bot.archive.manifest import DONE, FAILED, BackfillManifest
+from bot.archive.pack import PackArchive
+from bot.archive.search import INDEX_NAME, SearchIndex
+from bot.archive.shard import Shard, parse_shard
+from bot.db.repository import DEFAULT_STREAM_ITERSIZE, iter_cc_votes_after, iter_gov_actions_after
 from bot.logging import get_logger, setup_logging
-from bot.metadata.fetcher import fetch_metadata, sanitise_url
+from bot.metadata.fetcher import sanitise_url
 
 setup_logging()
 logger = get_logger("backfill")
 
-RATIONALES_DIR = Path(__file__).resolve().parent.parent / "rationales"
-
-PLACEHOLDER = {"error": "Failed to fetch rationale"}
-
-
-def _save_json(path: Path, data: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
-
-
-async def _backfill_gov_actions() -> tuple[int, int, int]:
-    """Fetch and save all governance action rationales. Returns (total, skipped, failed)."""
-    actions = await get_all_gov_actions()
-    logger.info("Found %d governance actions", len(actions))
-
-    skipped = 0
-    failed = 0
-
-    for i, action in enumerate(actions, 1):
-        action_dir = RATIONALES_DIR / f"{action.tx_hash}_{action.index}"
-        target = action_dir / "action.json"
-
-        if target.exists():
-            skipped += 1
-            continue
-
-        url = sanitise_url(action.raw_url)
-        metadata = fetch_metadata(url)
+MANIFEST_NAME = ".backfill_manifest.json"
 
-        if metadata:
-            _save_json(target, metadata)
-        else:
-            _save_json(target, {**PLACEHOLDER, "url": url})
-            failed += 1
+# High-water mark names in the manifest.
+GOV_ACTIONS_MARK = "gov_action_tx_id"
+CC_VOTES_MARK = "cc_vote_id"
 
-        if i % 50 == 0:
-            logger.info("Gov actions progress: %d / %d", i, len(actions))
 
-    return len(actions), skipped, failed
+def _shard_arg(value: str) -> Shard:
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
 
 
-async def _backfill_cc_votes() -> tuple[int, int, int]:
-    """Fetch and save all CC vote rationales. Returns (total, skipped, failed)."""
-    votes = await get_all_cc_votes()
-    logger.info("Found %d CC votes", len(votes))
-
-    skipped = 0
-    failed = 0
-
-    for i, vote in enumerate(votes, 1):
-        action_dir = RATIONALES_DIR / f"{vote.ga_tx_hash}_{vote.ga_index}"
-        target = action_dir / "cc_votes" / f"{vote.voter_hash}.json"
-
-        if target.exists():
-            skipped += 1
-            continue
-
-        url = sanitise_url(vote.raw_url)
-        metadata = fetch_metadata(url)
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill governance rationale files from DB-Sync.")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel metadata fetches (default: 8)")
+    parser.add_argument(
+        "--itersize",
+        type=int,
+        default=DEFAULT_STREAM_ITERSIZE,
+        help=f"rows fetched per DB round trip (default: {DEFAULT_STREAM_ITERSIZE})",
+    )
+    parser.add_argument("--output", type=Path, default=RATIONALES_DIR, help="archive directory")
+    parser.add_argument(
+        "--manifest", type=Path, default=None, help=f"manifest path (default: <output>/{MANIFEST_NAME})"
+    )
+    parser.add_argument("--full", action="store_true", help="ignore high-water marks and rescan all rows")
+    parser.add_argument("--shard", type=_shard_arg, default=None, help="only backfill shard i of n (e.g. 0/4)")
+    parser.add_argument("--workers", type=int, default=1, help="local worker processes (default: 1)")
+    parser.add_argument("--merge", type=Path, nargs="+", default=None, help="merge shard manifests and exit")
+    parser.add_argument("--pack", type=Path, default=None, help="write into a deduplicated pack file")
+    args = parser.parse_args()
+    if args.pack and args.workers > 1:
+        parser.error("--pack writes a single file and cannot be combined with --workers")
+    return args
+
+
+def _manifest_path(output: Path, explicit: Path | None, shard: Shard | None) -> Path:
+    if explicit is not None:
+        return explicit
+    if shard is None:
+        return output / MANIFEST_NAME
+    return output / MANIFEST_NAME.replace(".json", f".{shard.label}.json")
+
+
+async def _gov_action_items(after: int, itersize: int) -> AsyncIterator[BackfillItem]:
+    async for tx_id, action in iter_gov_actions_after(after, itersize=itersize):
+        yield BackfillItem(action_key(action.tx_hash, action.index), sanitise_url(action.raw_url), tx_id)
+
+
+async def _cc_vote_items(after: int, itersize: int) -> AsyncIterator[BackfillItem]:
+    async for vote_id, vote in iter_cc_votes_after(after, itersize=itersize):
+        key = cc_vote_key(vote.ga_tx_hash, vote.ga_index, vote.voter_hash)
+        yield BackfillItem(key, sanitise_url(vote.raw_url), vote_id)
+
+
+async def _with_retries(
+    manifest: BackfillManifest, kind: str, new_items: AsyncIterator[BackfillItem]
+) -> AsyncIterator[BackfillItem]:
+    """Retry unfinished manifest entries of ``kind``, then stream the new rows."""
+    retries = [BackfillItem(key, url) for key, url in manifest.unfinished() if key_kind(key) == kind]
+    retry_keys = {item.key for item in retries}
+    for item in retries:
+        yield item
+    async for item in new_items:
+        if item.key not in retry_keys:
+            yield item
+
+
+async def _backfill(
+    output: Path,
+    manifest: BackfillManifest,
+    args: argparse.Namespace,
+    shards: tuple[Shard, ...],
+    save: Callable[[str, dict], int] | None = None,
+) -> int:
+    """Backfill gov actions then CC votes into ``manifest``; return the number of failed fetches."""
+    sources: list[tuple[str, str, str, Callable[[int, int], AsyncIterator[BackfillItem]]]] = [
+        ("Gov actions", "action", GOV_ACTIONS_MARK, _gov_action_items),
+        ("CC votes", "cc_vote", CC_VOTES_MARK, _cc_vote_items),
+    ]
+    prefix = "".join(f"[{shard}] " for shard in shards)
+    total_failed = 0
+    for label, kind, mark, source in sources:
+        label = prefix + label
+        after = 0 if args.full else manifest.high_water.get(mark, 0)
+        if after:
+            logger.info("%s: incremental run above id %d", label, after)
+        items = _with_retries(manifest, kind, source(after, args.itersize))
+        stats = await run_backfill(
+            items,
+            root=output,
+            manifest=manifest,
+            concurrency=args.concurrency,
+            label=label,
+            save=save,
+            owns=lambda key: all(shard.owns(key) for shard in shards),
+        )
+        if stats.max_row_id is not None and stats.max_row_id > manifest.high_water.get(mark, 0):
+            manifest.high_water[mark] = stats.max_row_id
+            manifest.save()
+        logger.info(
+            "%s — total: %d, fetched: %d, skipped: %d, failed: %d",
+            label,
+            stats.skipped + stats.processed,
+            stats.fetched,
+            stats.skipped,
+            stats.failed,
+        )
+        total_failed += stats.failed
+    return total_failed
+
+
+def _run_worker(output: Path, manifest_path: Path, args: argparse.Namespace, shards: tuple[Shard, ...]) -> int:
+    """Entry point of a local worker process."""
+    return asyncio.run(_backfill(output, BackfillManifest.load(manifest_path), args, shards))
+
+
+def _run_workers(output: Path, manifest: BackfillManifest, args: argparse.Namespace, shards: tuple[Shard, ...]) -> int:
+    """Split ``manifest`` across ``args.workers`` processes, run them and merge the results back."""
+    workers = [Shard(i, args.workers, level=len(shards)) for i in range(args.workers)]
+    paths = [manifest.path.with_name(f"{manifest.path.stem}.worker-{w.index}-of-{w.count}.json") for w in workers]
+    for worker, path in zip(workers, paths, strict=True):
+        if not path.exists():
+            manifest.subset(path, worker.owns).save()
+
+    # Spawn rather than fork: each worker opens its own DB connection and event loop.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx) as pool:
+        futures = [
+            pool.submit(_run_worker, output, path, args, (*shards, worker))
+            for worker, path in zip(workers, paths, strict=True)
+        ]
+        results = [future.exception() or future.result() for future in futures]
+
+    manifest.merge(BackfillManifest.load(path) for path in paths)
+    manifest.save()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+    for path in paths:
+        path.unlink()
+    return sum(results)
+
+
+def _seed_from_pack(manifest: BackfillManifest, pack: PackArchive) -> int:
+    added = 0
+    for key in pack.keys():
+        if key not in manifest.entries:
+            manifest.entries[key] = {"status": FAILED if is_placeholder(pack.get(key)) else DONE}
+            added += 1
+    return added
+
+
+def _merge(target: BackfillManifest, paths: list[Path]) -> None:
+    target.merge(BackfillManifest.load(path) for path in paths)
+    target.save()
+    logger.info("Merged %d manifests into %s: %s", len(paths), target.path, target.counts())
 
-        if metadata:
-            _save_json(target, metadata)
-        else:
-            _save_json(target, {**PLACEHOLDER, "url": url})
-            failed += 1
 
-        if i % 50 == 0:
-            logger.info("CC votes progress: %d / %d", i, len(votes))
+async def _main() -> None:
+    args = _parse_args()
+    output: Path = args.output
+    manifest = BackfillManifest.load(_manifest_path(output, args.manifest, args.shard))
 
-    return len(votes), skipped, failed
+    if args.merge:
+        _merge(manifest, args.merge)
+        return
 
+    pack = PackArchive(args.pack) if args.pack else None
+    if not manifest.entries:
+        seeded = _seed_from_pack(manifest, pack) if pack else manifest.bootstrap(output)
+        logger.info("Seeded manifest with %d existing documents", seeded)
 
-async def _main() -> None:
+    shards = (args.shard,) if args.shard else ()
     logger.info("Starting rationale backfill...")
-    logger.info("Output directory: %s", RATIONALES_DIR)
-
-    ga_total, ga_skipped, ga_failed = await _backfill_gov_actions()
     logger.info(
-        "Gov actions — total: %d, fetched: %d, skipped: %d, failed: %d",
-        ga_total,
-        ga_total - ga_skipped - ga_failed,
-        ga_skipped,
-        ga_failed,
+        "Output directory: %s (concurrency %d, workers %d%s)",
+        output,
+        args.concurrency,
+        args.workers,
+        f", shard {args.shard}" if args.shard else "",
     )
 
-    cc_total, cc_skipped, cc_failed = await _backfill_cc_votes()
-    logger.info(
-        "CC votes — total: %d, fetched: %d, skipped: %d, failed: %d",
-        cc_total,
-        cc_total - cc_skipped - cc_failed,
-        cc_skipped,
-        cc_failed,
-    )
+    if args.workers > 1:
+        total_failed = await asyncio.to_thread(_run_workers, output, manifest, args, shards)
+    elif pack is not None:
+        with pack:
+            total_failed = await _backfill(output, manifest, args, shards, save=pack.put)
+            logger.info("Pack %s: %s", args.pack, pack.dedup_stats().summary())
+    else:
+        total_failed = await _backfill(output, manifest, args, shards)
+
+    # Keep an existing search index (scripts/search_rationales.py) current.
+    if pack is None and (output / INDEX_NAME).exists():
+        with SearchIndex(output / INDEX_NAME) as index:
+            synced = index.sync_directory(output)
+        logger.info("Search index updated: %d indexed, %d removed", synced.indexed, synced.removed)
 
-    total_failed = ga_failed + cc_failed
     if total_failed:
-        logger.warning("Completed with %d failed fetches (placeholders created)", total_failed)
+        logger.warning("Completed with %d failed fetches (placeholders created, retried next run)", total_failed)
     else:
         logger.info("Backfill complete — all rationales fetched successfully")
 
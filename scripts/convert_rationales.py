@@ -0,0 +1,60 @@
+"""Convert the rationale archive between the directory layout and a pack file.
+
+The packed format (see ``bot/archive/pack.py``) stores every document as a
+compressed record in one append-only file with a memory-mapped index, so
+lookups are O(1) and the archive is a couple of files instead of hundreds.
+zstd is used when the ``zstandard`` package is installed (``uv sync
+--extra archive``), zlib otherwise.
+
+Usage:
+    uv run python scripts/convert_rationales.py pack [--input rationales] [--pack rationales.pack]
+    uv run python scripts/convert_rationales.py unpack [--pack rationales.pack] [--output rationales]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure the project root is on the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.archive.layout import RATIONALES_DIR
+from bot.archive.pack import CODEC_ZSTD, PackArchive, pack_directory, unpack_to_directory
+from bot.logging import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger("convert_rationales")
+
+DEFAULT_PACK = RATIONALES_DIR.with_suffix(".pack")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="directory layout -> pack file")
+    pack.add_argument("--input", type=Path, default=RATIONALES_DIR, help="archive directory")
+    pack.add_argument("--pack", type=Path, default=DEFAULT_PACK, help="pack file to create or extend")
+    unpack = sub.add_parser("unpack", help="pack file -> directory layout")
+    unpack.add_argument("--pack", type=Path, default=DEFAULT_PACK, help="pack file to read")
+    unpack.add_argument("--output", type=Path, default=RATIONALES_DIR, help="archive directory")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        count = pack_directory(args.input, args.pack)
+        with PackArchive(args.pack) as archive:
+            codec = "zstd" if archive.codec == CODEC_ZSTD else "zlib"
+            size = args.pack.stat().st_size
+            logger.info("Packed %d documents into %s (%d bytes, %s)", count, args.pack, size, codec)
+            logger.info("Dedup: %s", archive.dedup_stats().summary())
+    else:
+        if not args.pack.exists():
+            logger.error("Pack file %s does not exist", args.pack)
+            sys.exit(1)
+        count = unpack_to_directory(args.pack, args.output)
+        logger.info("Unpacked %d documents into %s", count, args.output)
+
+
+if __name__ == "__main__":
+    main()
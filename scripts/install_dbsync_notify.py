@@ -0,0 +1,54 @@
+"""Install (or remove) the DB-Sync triggers used for LISTEN/NOTIFY ingestion.
+
+The triggers send a ``pg_notify`` on every ``gov_action_proposal`` and CC
+``voting_procedure`` insert so the bot (with ``DBSYNC_LISTEN_ENABLED=true``)
+can process new governance activity without waiting for the next poll.
+Requires a DB-Sync role allowed to create functions and triggers.
+
+Reads configuration from .env (or environment variables).
+
+Usage:
+    uv run python scripts/install_dbsync_notify.py
+    uv run python scripts/install_dbsync_notify.py --uninstall
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure the project root is on the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import psycopg
+
+from bot.config import config
+from bot.db.listener import INSTALL_NOTIFY_TRIGGERS, NOTIFY_CHANNEL, UNINSTALL_NOTIFY_TRIGGERS
+from bot.logging import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger("install_dbsync_notify")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uninstall", action="store_true", help="drop the triggers and function instead")
+    args = parser.parse_args()
+
+    if not config.db_sync_url:
+        logger.error("DB_SYNC_URL is not set")
+        sys.exit(1)
+
+    sql = UNINSTALL_NOTIFY_TRIGGERS if args.uninstall else INSTALL_NOTIFY_TRIGGERS
+    with psycopg.connect(config.db_sync_url) as conn:
+        conn.execute(sql)
+
+    if args.uninstall:
+        logger.info("Removed DB-Sync notify triggers")
+    else:
+        logger.info("Installed DB-Sync notify triggers on channel %r", NOTIFY_CHANNEL)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Search archived rationales (SQLite FTS5 full-text index).
+
+The index lives next to the archive (``rationales/.search_index.sqlite`` by
+default) and is brought up to date before every query, which only re-reads
+documents added or changed since the last run.
+
+Queries use FTS5 syntax: ``"article 3"`` for phrases, ``OR``, ``constitu*``.
+
+Usage:
+    uv run python scripts/search_rationales.py "article 3" [--kind cc_vote] [--limit 10]
+    uv run python scripts/search_rationales.py --pack rationales.pack treasury withdrawal
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure the project root is on the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.archive.layout import RATIONALES_DIR
+from bot.archive.pack import PackArchive
+from bot.archive.search import INDEX_NAME, SearchIndex
+from bot.cc_profiles import get_x_handle_for_voter_hash
+from bot.logging import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger("search_rationales")
+
+
+def _describe(key: str) -> str:
+    action, _, voter = key.partition("/")
+    if not voter:
+        return f"action {action}"
+    handle = get_x_handle_for_voter_hash(voter)
+    return f"CC vote on {action} by {handle or voter[:16]}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="+", help="search terms (FTS5 syntax)")
+    parser.add_argument("--archive", type=Path, default=RATIONALES_DIR, help="archive directory")
+    parser.add_argument("--pack", type=Path, default=None, help="search a pack file instead of the directory")
+    parser.add_argument("--index", type=Path, default=None, help=f"index path (default: <archive>/{INDEX_NAME})")
+    parser.add_argument("--kind", choices=("action", "cc_vote"), default=None, help="only return this kind")
+    parser.add_argument("--limit", type=int, default=20, help="maximum hits (default: 20)")
+    parser.add_argument("--no-update", action="store_true", help="query the index as is, without syncing")
+    args = parser.parse_args()
+
+    index_path = args.index or (args.pack.with_suffix(".search.sqlite") if args.pack else args.archive / INDEX_NAME)
+    with SearchIndex(index_path) as index:
+        if not args.no_update:
+            started = time.perf_counter()
+            if args.pack:
+                with PackArchive(args.pack) as pack:
+                    stats = index.sync_pack(pack)
+            else:
+                stats = index.sync_directory(args.archive)
+            logger.info(
+                "Index synced in %.0f ms (%d indexed, %d unchanged, %d removed)",
+                (time.perf_counter() - started) * 1000,
+                stats.indexed,
+                stats.unchanged,
+                stats.removed,
+            )
+
+        started = time.perf_counter()
+        hits = index.search(" ".join(args.query), limit=args.limit, kind=args.kind)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for rank, hit in enumerate(hits, 1):
+        print(f"{rank:>3}. [{hit.score:7.3f}] {_describe(hit.key)}")
+        print(f"     {' '.join(hit.snippet.split())}")
+    print(f"{len(hits)} hits in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
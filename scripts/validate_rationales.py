@@ -0,0 +1,92 @@
+"""Validate the whole rationale archive against CIP-0108 / CIP-0136.
+
+Walks ``rationales/`` (or a pack file), validates documents across a process
+pool and writes a JSON compliance report grouped by action and CC voter.
+Results are cached by content hash, so re-runs only validate changed files.
+
+Usage:
+    uv run python scripts/validate_rationales.py [--workers 8] [--report report.json] [--strict]
+    uv run python scripts/validate_rationales.py --pack rationales.pack
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Ensure the project root is on the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.archive.layout import RATIONALES_DIR
+from bot.archive.pack import PackArchive
+from bot.archive.validate import (
+    CACHE_NAME,
+    REPORT_NAME,
+    ValidationCache,
+    build_report,
+    directory_source,
+    pack_source,
+    validate_archive,
+)
+from bot.logging import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger("validate_rationales")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", type=Path, default=RATIONALES_DIR, help="archive directory")
+    parser.add_argument("--pack", type=Path, default=None, help="validate a pack file instead of the directory")
+    parser.add_argument("--workers", type=int, default=None, help="validation processes (default: CPU count)")
+    parser.add_argument("--report", type=Path, default=None, help="report path (default: next to the archive)")
+    parser.add_argument("--cache", type=Path, default=None, help="cache path (default: next to the archive)")
+    parser.add_argument("--no-cache", action="store_true", help="revalidate everything")
+    parser.add_argument("--strict", action="store_true", help="exit non-zero if any document is non-compliant")
+    args = parser.parse_args()
+
+    # Default outputs sit next to the archive: <archive>/.validation_*.json or <name>.validation_*.json.
+    if args.pack:
+        report_path = args.report or args.pack.with_suffix(REPORT_NAME)
+        cache_path = args.cache or args.pack.with_suffix(CACHE_NAME)
+    else:
+        report_path = args.report or args.archive / REPORT_NAME
+        cache_path = args.cache or args.archive / CACHE_NAME
+
+    cache = ValidationCache.load(cache_path)
+    if args.no_cache:
+        cache.results.clear()
+
+    started = time.perf_counter()
+    if args.pack:
+        with PackArchive(args.pack) as pack:
+            results = validate_archive(pack_source(pack), cache, workers=args.workers)
+    else:
+        results = validate_archive(directory_source(args.archive), cache, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    cache.save()
+
+    report = build_report(results, version=cache.version)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    summary = report["summary"]
+    logger.info(
+        "Validated %d documents in %.2fs (%d validated, %d cached): %d compliant, %d non-compliant",
+        summary["documents"],
+        elapsed,
+        summary["validated"],
+        summary["cached"],
+        summary["compliant"],
+        summary["non_compliant"],
+    )
+    logger.info("Report written to %s", report_path)
+
+    sys.exit(1 if args.strict and summary["non_compliant"] else 0)
+
+
+if __name__ == "__main__":
+    main()
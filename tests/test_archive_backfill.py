@@ -0,0 +1,231 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from bot.archive import layout
+from bot.archive.backfill import BackfillItem, BackfillStats, run_backfill
+from bot.archive.manifest import DONE, FAILED, PENDING, BackfillManifest
+from bot.archive.pack import PackArchive
+from bot.archive.shard import Shard, jump_hash, parse_shard, shard_of
+
+
+def _items() -> list[BackfillItem]:
+    return [
+        BackfillItem(layout.action_key("aa", 0), "https://ok/aa"),
+        BackfillItem(layout.cc_vote_key("aa", 0, "v1"), "https://ok/v1"),
+        BackfillItem(layout.cc_vote_key("aa", 0, "v2"), "https://down/v2"),
+    ]
+
+
+def _fetch(url: str) -> dict | None:
+    if "down" in url:
+        return None
+    return {"body": {"url": url}}
+
+
+def _tx_hash(i: int) -> str:
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+class TestLayout:
+    def test_key_paths(self, tmp_path: Path):
+        assert layout.key_path(tmp_path, "aa_0") == tmp_path / "aa_0" / "action.json"
+        assert layout.key_path(tmp_path, "aa_0/v1") == tmp_path / "aa_0" / "cc_votes" / "v1.json"
+
+    def test_iter_keys_round_trips(self, tmp_path: Path):
+        for key in ("aa_0", "aa_0/v1", "bb_3/v2"):
+            layout.save_json(layout.key_path(tmp_path, key), {"k": key})
+
+        assert sorted(layout.iter_keys(tmp_path)) == ["aa_0", "aa_0/v1", "bb_3/v2"]
+
+
+class TestManifest:
+    def test_bootstrap_marks_placeholders_failed(self, tmp_path: Path):
+        layout.save_json(layout.key_path(tmp_path, "aa_0"), {"body": {"title": "x" * 2000}})
+        layout.save_json(layout.key_path(tmp_path, "aa_0/v1"), layout.placeholder("https://down"))
+
+        manifest = BackfillManifest(tmp_path / "m.json")
+        assert manifest.bootstrap(tmp_path) == 2
+        assert manifest.status("aa_0") == DONE
+        assert manifest.status("aa_0/v1") == FAILED
+
+    def test_save_and_load(self, tmp_path: Path):
+        manifest = BackfillManifest(tmp_path / "m.json")
+        manifest.mark("aa_0", DONE, "https://ok")
+        manifest.save()
+
+        manifest.mark("aa_0/v1", FAILED, "https://down")
+        manifest.high_water["cc_vote_id"] = 42
+        manifest.save()
+
+        loaded = BackfillManifest.load(tmp_path / "m.json")
+        assert loaded.entries["aa_0"] == {"status": DONE, "url": "https://ok"}
+        assert loaded.high_water == {"cc_vote_id": 42}
+        assert list(loaded.unfinished()) == [("aa_0/v1", "https://down")]
+
+    def test_subset_and_merge_round_trip(self, tmp_path: Path):
+        manifest = BackfillManifest(tmp_path / "m.json", high_water={"cc_vote_id": 10})
+        manifest.mark("aa_0", PENDING, "https://a")
+        manifest.mark("bb_0", FAILED, "https://b")
+
+        left = manifest.subset(tmp_path / "l.json", lambda key: key.startswith("aa"))
+        right = manifest.subset(tmp_path / "r.json", lambda key: key.startswith("bb"))
+        assert set(left.entries) == {"aa_0"}
+        left.mark("aa_0", DONE)
+        left.high_water["cc_vote_id"] = 30
+        right.high_water["cc_vote_id"] = 25
+        right.high_water["gov_action_tx_id"] = 7
+
+        manifest.merge([left, right])
+
+        assert manifest.entries["aa_0"] == {"status": DONE, "url": "https://a"}
+        assert manifest.status("bb_0") == FAILED
+        # Only advanced as far as every shard got; marks missing from a shard stay put.
+        assert manifest.high_water == {"cc_vote_id": 25}
+
+    def test_merge_keeps_most_advanced_status(self, tmp_path: Path):
+        manifest = BackfillManifest(tmp_path / "m.json")
+        manifest.mark("aa_0", DONE)
+        other = BackfillManifest(tmp_path / "o.json")
+        other.mark("aa_0", FAILED, "https://a")
+
+        manifest.merge([other])
+
+        assert manifest.status("aa_0") == DONE
+
+
+class TestShard:
+    def test_jump_hash_is_consistent(self):
+        keys = [int(_tx_hash(i)[:16], 16) for i in range(2000)]
+        before = [jump_hash(key, 8) for key in keys]
+        after = [jump_hash(key, 9) for key in keys]
+
+        moved = [(b, a) for b, a in zip(before, after, strict=True) if b != a]
+        assert all(a == 8 for _, a in moved)
+        assert 0.05 < len(moved) / len(keys) < 0.2
+        assert set(before) == set(range(8))
+
+    def test_action_and_votes_share_a_shard(self):
+        tx_hash = "ab" * 32
+        owner = shard_of(tx_hash, 4)
+        shard = Shard(owner, 4)
+
+        assert shard.owns(layout.action_key(tx_hash, 0))
+        assert shard.owns(layout.cc_vote_key(tx_hash, 0, "v1"))
+        assert not Shard((owner + 1) % 4, 4).owns(layout.cc_vote_key(tx_hash, 0, "v1"))
+
+    def test_nested_levels_split_a_shard(self):
+        tx_hashes = [_tx_hash(i) for i in range(400)]
+        outer = [h for h in tx_hashes if Shard(0, 2).owns(f"{h}_0")]
+        inner = {Shard(0, 2, level=1).owns(f"{h}_0") for h in outer}
+
+        assert inner == {True, False}
+
+    def test_parse_shard(self):
+        assert parse_shard("1/4") == Shard(1, 4)
+        for bad in ("4/4", "1", "a/b", "-1/2"):
+            with pytest.raises(ValueError):
+                parse_shard(bad)
+
+
+class TestRunBackfill:
+    @pytest.mark.asyncio
+    async def test_fetches_concurrently_and_records_outcomes(self, tmp_path: Path):
+        manifest = BackfillManifest(tmp_path / "m.json")
+
+        stats = await run_backfill(_items(), root=tmp_path, manifest=manifest, concurrency=3, fetch=_fetch)
+
+        assert (stats.total, stats.fetched, stats.failed, stats.skipped) == (3, 2, 1, 0)
+        assert stats.bytes_written > 0
+        assert layout.load_json(layout.key_path(tmp_path, "aa_0")) == {"body": {"url": "https://ok/aa"}}
+        assert layout.is_placeholder(layout.load_json(layout.key_path(tmp_path, "aa_0/v2")))
+        saved = json.loads((tmp_path / "m.json").read_text())["entries"]
+        assert saved["aa_0/v2"] == {"status": FAILED, "url": "https://down/v2"}
+
+    @pytest.mark.asyncio
+    async def test_rerun_skips_done_and_retries_failed(self, tmp_path: Path):
+        manifest = BackfillManifest(tmp_path / "m.json")
+        await run_backfill(_items(), root=tmp_path, manifest=manifest, fetch=_fetch)
+
+        fetched_urls = []
+
+        def _recovered_fetch(url):
+            fetched_urls.append(url)
+            return {"body": {"url": url}}
+
+        stats = await run_backfill(
+            _items(), root=tmp_path, manifest=BackfillManifest.load(tmp_path / "m.json"), fetch=_recovered_fetch
+        )
+
+        assert fetched_urls == ["https://down/v2"]
+        assert (stats.fetched, stats.skipped, stats.failed) == (1, 2, 0)
+        assert not layout.is_placeholder(layout.load_json(layout.key_path(tmp_path, "aa_0/v2")))
+
+    @pytest.mark.asyncio
+    async def test_accepts_async_iterable_source(self, tmp_path: Path):
+        async def _source():
+            for item in _items():
+                yield item
+
+        stats = await run_backfill(
+            _source(), root=tmp_path, manifest=BackfillManifest(tmp_path / "m.json"), concurrency=1, fetch=_fetch
+        )
+
+        assert stats.total is None
+        assert stats.max_row_id is None
+        assert (stats.fetched, stats.failed) == (2, 1)
+        assert stats.eta_seconds() is None
+
+
+@pytest.mark.asyncio
+async def test_tracks_highest_row_id(tmp_path: Path):
+    items = [BackfillItem(item.key, item.url, row_id) for item, row_id in zip(_items(), (3, 11, 7), strict=True)]
+
+    stats = await run_backfill(items, root=tmp_path, manifest=BackfillManifest(tmp_path / "m.json"), fetch=_fetch)
+
+    assert stats.max_row_id == 11
+
+
+@pytest.mark.asyncio
+async def test_shard_with_no_new_rows_still_advances_the_merged_mark(tmp_path: Path):
+    owner = Shard(shard_of("aa", 2), 2)
+    idle = Shard(1 - owner.index, 2)
+    parent = BackfillManifest(tmp_path / "m.json", high_water={"cc_vote_id": 2})
+    items = [BackfillItem(item.key, item.url, row_id) for item, row_id in zip(_items(), (3, 11, 7), strict=True)]
+
+    parts = []
+    for shard in (owner, idle):
+        part = parent.subset(tmp_path / f"{shard.label}.json", shard.owns)
+        stats = await run_backfill(items, root=tmp_path, manifest=part, fetch=_fetch, owns=shard.owns)
+        part.high_water["cc_vote_id"] = stats.max_row_id
+        parts.append((part, stats))
+
+    assert parts[1][1].processed == 0
+    parent.merge(part for part, _ in parts)
+    assert parent.high_water == {"cc_vote_id": 11}
+
+
+@pytest.mark.asyncio
+async def test_backfills_into_a_pack(tmp_path: Path):
+    items = [*_items(), BackfillItem(layout.cc_vote_key("aa", 0, "v3"), "https://ok/v1")]
+
+    with PackArchive(tmp_path / "r.pack") as pack:
+        stats = await run_backfill(
+            items, root=tmp_path, manifest=BackfillManifest(tmp_path / "m.json"), fetch=_fetch, save=pack.put
+        )
+
+        assert (stats.fetched, stats.failed) == (3, 1)
+        assert pack.get("aa_0/v3") == pack.get("aa_0/v1") == {"body": {"url": "https://ok/v1"}}
+        assert pack.dedup_stats().blobs == 3
+    assert not layout.key_path(tmp_path, "aa_0").exists()
+
+
+def test_stats_eta():
+    stats = BackfillStats(total=10, fetched=2, skipped=4)
+    stats.started_at -= 2.0
+
+    assert stats.items_per_second == pytest.approx(1.0, rel=0.05)
+    assert stats.eta_seconds() == pytest.approx(4.0, rel=0.05)
+    assert "items/s" in stats.progress_line()
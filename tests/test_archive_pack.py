@@ -0,0 +1,124 @@
+from pathlib import Path
+
+import pytest
+
+from bot.archive import layout, pack
+from bot.archive.pack import CODEC_ZLIB, PackArchive, pack_directory, unpack_to_directory
+
+
+def _doc(i: int) -> dict:
+    return {"body": {"title": f"Rationale {i}", "comment": "ünïcode " * (i % 5)}}
+
+
+def test_put_get_and_reopen(tmp_path: Path):
+    path = tmp_path / "r.pack"
+    with PackArchive(path) as archive:
+        archive.put("aa_0", _doc(0))
+        archive.put("aa_0/v1", _doc(1))
+
+    with PackArchive(path) as archive:
+        assert len(archive) == 2
+        assert archive.get("aa_0/v1") == _doc(1)
+        assert "aa_0" in archive
+        assert archive.get("missing_0") is None
+
+
+def test_rewrite_replaces_document(tmp_path: Path):
+    with PackArchive(tmp_path / "r.pack") as archive:
+        archive.put("aa_0", _doc(0))
+        archive.put("aa_0", _doc(9))
+
+        assert len(archive) == 1
+        assert archive.get("aa_0") == _doc(9)
+
+
+def test_index_grows_past_initial_capacity(tmp_path: Path):
+    keys = [f"{i:064x}_0" for i in range(2000)]
+    with PackArchive(tmp_path / "r.pack") as archive:
+        for i, key in enumerate(keys):
+            archive.put(key, _doc(i))
+
+        assert len(archive) == len(keys)
+        assert archive.get(keys[1234]) == _doc(1234)
+        assert sorted(archive.keys()) == sorted(keys)
+
+
+def test_stale_index_is_rebuilt_and_torn_tail_dropped(tmp_path: Path):
+    path = tmp_path / "r.pack"
+    with PackArchive(path) as archive:
+        archive.put("aa_0", _doc(0))
+    with PackArchive(path) as archive:
+        archive.put("bb_0", _doc(1))
+        archive._index.close()  # simulate a crash before the index header is updated
+        archive._index = None
+    with path.open("ab") as f:
+        f.write(b"\x05\x00\x00\x00\xff")  # partial record header
+
+    with PackArchive(path) as archive:
+        assert len(archive) == 2
+        assert archive.get("bb_0") == _doc(1)
+        archive.put("cc_0", _doc(2))
+        assert archive.get("cc_0") == _doc(2)
+
+
+def test_zlib_fallback_without_zstandard(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(pack, "zstandard", None)
+    with PackArchive(tmp_path / "r.pack") as archive:
+        archive.put("aa_0", _doc(0))
+        assert archive.codec == CODEC_ZLIB
+        assert archive.get("aa_0") == _doc(0)
+
+
+def test_rejects_foreign_file(tmp_path: Path):
+    path = tmp_path / "r.pack"
+    path.write_bytes(b"not a pack at all")
+    with pytest.raises(ValueError):
+        PackArchive(path)
+
+
+def test_directory_round_trip(tmp_path: Path):
+    src = tmp_path / "src"
+    for i, key in enumerate(("aa_0", "aa_0/v1", "bb_2/v2")):
+        layout.save_json(layout.key_path(src, key), _doc(i))
+
+    assert pack_directory(src, tmp_path / "r.pack") == 3
+    assert unpack_to_directory(tmp_path / "r.pack", tmp_path / "dst") == 3
+
+    for key in ("aa_0", "aa_0/v1", "bb_2/v2"):
+        original = layout.key_path(src, key).read_bytes()
+        assert layout.key_path(tmp_path / "dst", key).read_bytes() == original
+
+
+def test_identical_documents_share_one_blob(tmp_path: Path):
+    with PackArchive(tmp_path / "r.pack") as archive:
+        first = archive.put("aa_0/v1", _doc(1))
+        second = archive.put("aa_0/v2", _doc(1))
+        archive.put("aa_0", _doc(0))
+
+        assert second < first  # only a ref record was appended
+        assert archive.get("aa_0/v2") == _doc(1)
+        assert sorted(archive.keys()) == ["aa_0", "aa_0/v1", "aa_0/v2"]
+        stats = archive.dedup_stats()
+
+    assert (stats.documents, stats.blobs) == (3, 2)
+    assert stats.bytes_saved == stats.logical_bytes - stats.stored_bytes > 0
+    assert stats.ratio > 1.0
+
+
+def test_rewriting_same_content_appends_nothing(tmp_path: Path):
+    with PackArchive(tmp_path / "r.pack") as archive:
+        archive.put("aa_0", _doc(0))
+        assert archive.put("aa_0", _doc(0)) == 0
+
+
+def test_dedup_survives_index_rebuild(tmp_path: Path):
+    path = tmp_path / "r.pack"
+    with PackArchive(path) as archive:
+        archive.put("aa_0/v1", _doc(1))
+        archive.put("aa_0/v2", _doc(1))
+    path.with_suffix(".idx").unlink()
+
+    with PackArchive(path) as archive:
+        assert len(archive) == 2
+        assert archive.dedup_stats().blobs == 1
+        assert archive.get("aa_0/v1") == archive.get("aa_0/v2") == _doc(1)
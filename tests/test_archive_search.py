@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+from bot.archive import layout
+from bot.archive.pack import PackArchive
+from bot.archive.search import SearchIndex, extract_fields
+
+
+def _cip108(title: str, rationale: str) -> dict:
+    return {"body": {"title": title, "abstract": "", "motivation": "", "rationale": rationale}}
+
+
+def _cip136(summary: str, statement: str, refs: list | None = None) -> dict:
+    return {"body": {"summary": summary, "rationaleStatement": statement, "references": refs or []}}
+
+
+def _write(root: Path, key: str, doc: dict) -> None:
+    layout.save_json(layout.key_path(root, key), doc)
+
+
+def test_extract_fields_handles_both_cips_and_placeholders():
+    fields = extract_fields(_cip136("Yes", "Per Article 3", [{"label": "Constitution", "uri": "ipfs://c"}]))
+
+    assert fields["summary"] == "Yes"
+    assert fields["rationale_statement"] == "Per Article 3"
+    assert fields["refs"] == "Constitution\nipfs://c"
+    assert extract_fields(_cip108("Budget", "Because"))["title"] == "Budget"
+    assert extract_fields(layout.placeholder("https://down")) is None
+
+
+def test_search_ranks_and_filters(tmp_path: Path):
+    _write(tmp_path, "aa_0", _cip108("Treasury withdrawal for tooling", "Funds the tooling roadmap"))
+    _write(tmp_path, "aa_0/v1", _cip136("Constitutional", "Consistent with Article 3 section 5 of the constitution"))
+    _write(tmp_path, "aa_0/v2", _cip136("Unconstitutional", "Conflicts with Article 4"))
+
+    with SearchIndex(tmp_path / "idx.sqlite") as index:
+        stats = index.sync_directory(tmp_path)
+        assert (stats.indexed, len(index)) == (3, 3)
+
+        hits = index.search('"article 3"')
+        assert [hit.key for hit in hits] == ["aa_0/v1"]
+        assert "[Article 3]" in hits[0].snippet
+
+        assert {hit.key for hit in index.search("article")} == {"aa_0/v1", "aa_0/v2"}
+        assert index.search("treasury", kind="cc_vote") == []
+        assert [hit.key for hit in index.search("treasury", kind="action")] == ["aa_0"]
+        assert index.search("tool*")[0].key == "aa_0"
+
+
+def test_malformed_query_falls_back_to_literal_terms(tmp_path: Path):
+    _write(tmp_path, "aa_0/v1", _cip136("Yes", "See CIP-1694 (governance)"))
+
+    with SearchIndex(tmp_path / "idx.sqlite") as index:
+        index.sync_directory(tmp_path)
+        assert [hit.key for hit in index.search("governance)")] == ["aa_0/v1"]
+
+
+def test_sync_is_incremental(tmp_path: Path):
+    archive = tmp_path / "archive"
+    _write(archive, "aa_0/v1", _cip136("Yes", "alpha"))
+    _write(archive, "aa_0/v2", _cip136("No", "beta"))
+
+    with SearchIndex(tmp_path / "idx.sqlite") as index:
+        index.sync_directory(archive)
+
+        path = layout.key_path(archive, "aa_0/v1")
+        _write(archive, "aa_0/v1", _cip136("Yes", "gamma"))
+        os.utime(path, ns=(1, 1))
+        layout.key_path(archive, "aa_0/v2").unlink()
+        _write(archive, "bb_0", _cip108("New", "delta"))
+
+        stats = index.sync_directory(archive)
+        assert (stats.indexed, stats.unchanged, stats.removed) == (2, 0, 1)
+        assert index.search("alpha") == []
+        assert [hit.key for hit in index.search("gamma")] == ["aa_0/v1"]
+        assert index.search("beta") == []
+
+        again = index.sync_directory(archive)
+        assert (again.indexed, again.unchanged) == (0, 2)
+
+
+def test_sync_pack_uses_blob_digest(tmp_path: Path):
+    with PackArchive(tmp_path / "r.pack") as pack, SearchIndex(tmp_path / "idx.sqlite") as index:
+        pack.put("aa_0/v1", _cip136("Yes", "alpha"))
+        assert index.sync_pack(pack).indexed == 1
+        assert index.sync_pack(pack).unchanged == 1
+
+        pack.put("aa_0/v1", _cip136("Yes", "omega"))
+        assert index.sync_pack(pack).indexed == 1
+        assert [hit.key for hit in index.search("omega")] == ["aa_0/v1"]
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+from bot.archive import layout
+from bot.archive.pack import PackArchive
+from bot.archive.validate import (
+    ValidationCache,
+    build_report,
+    directory_source,
+    pack_source,
+    validate_archive,
+    validate_document,
+)
+
+_ACTION = {"body": {"title": "T", "abstract": "A", "motivation": "M", "rationale": "R"}}
+_VOTE = {"body": {"summary": "S", "rationaleStatement": "R"}}
+
+
+def _archive(root: Path) -> None:
+    layout.save_json(layout.key_path(root, "aa_0"), _ACTION)
+    layout.save_json(layout.key_path(root, "aa_0/v1"), _VOTE)
+    layout.save_json(layout.key_path(root, "aa_0/v2"), {"body": {"summary": "S"}})
+    layout.save_json(layout.key_path(root, "bb_1"), layout.placeholder("https://down"))
+
+
+def _errors(findings) -> list[str]:
+    return [f.message for f in findings if f.severity == "error"]
+
+
+def test_validate_document_dispatches_on_kind():
+    assert _errors(validate_document("aa_0", _ACTION)) == []
+    assert _errors(validate_document("aa_0/v1", _VOTE)) == []
+    # A CIP-0136 document is not a valid CIP-0108 one.
+    assert "Missing required field 'body.title' (CIP-0108)" in _errors(validate_document("aa_0", _VOTE))
+    assert _errors(validate_document("bb_1", layout.placeholder("https://down"))) == ["Metadata could not be fetched"]
+
+
+def test_report_groups_by_action_and_voter(tmp_path: Path):
+    _archive(tmp_path)
+    cache = ValidationCache(tmp_path / "cache.json", "v1")
+
+    report = build_report(validate_archive(directory_source(tmp_path), cache, workers=1), version="v1")
+
+    summary = report["summary"]
+    assert (summary["documents"], summary["compliant"], summary["non_compliant"]) == (4, 2, 2)
+    assert (summary["validated"], summary["cached"], summary["error"]) == (4, 0, 2)
+    assert report["actions"]["aa_0"]["action"]["compliant"] is True
+    v2_errors = [f for f in report["actions"]["aa_0"]["cc_votes"]["v2"]["findings"] if f["severity"] == "error"]
+    assert v2_errors == [
+        {
+            "severity": "error",
+            "path": "body.rationaleStatement",
+            "code": "missing",
+            "message": "Missing required field 'body.rationaleStatement' (CIP-0136)",
+        }
+    ]
+    assert report["actions"]["bb_1"]["action"]["findings"][0]["code"] == "unavailable"
+
+
+def test_cache_skips_unchanged_documents(tmp_path: Path):
+    archive = tmp_path / "archive"
+    _archive(archive)
+    cache_path = tmp_path / "cache.json"
+    cache = ValidationCache.load(cache_path, "v1")
+    validate_archive(directory_source(archive), cache, workers=1)
+    cache.save()
+
+    layout.save_json(layout.key_path(archive, "aa_0/v2"), {"body": {"summary": "S2", "rationaleStatement": "R"}})
+    results = validate_archive(directory_source(archive), ValidationCache.load(cache_path, "v1"), workers=1)
+
+    assert {r.key: r.cached for r in results} == {"aa_0": True, "aa_0/v1": True, "aa_0/v2": False, "bb_1": True}
+    assert next(r for r in results if r.key == "aa_0/v2").compliant
+
+    # A different validator version ignores the cache.
+    rerun = validate_archive(directory_source(archive), ValidationCache.load(cache_path, "v2"), workers=1)
+    assert not any(r.cached for r in rerun)
+
+
+def test_process_pool_matches_inline(tmp_path: Path):
+    _archive(tmp_path)
+
+    inline = validate_archive(directory_source(tmp_path), ValidationCache(tmp_path / "a.json", "v1"), workers=1)
+    pooled = validate_archive(directory_source(tmp_path), ValidationCache(tmp_path / "b.json", "v1"), workers=2)
+
+    assert [(r.key, r.findings) for r in pooled] == [(r.key, r.findings) for r in inline]
+
+
+def test_pack_source_uses_blob_digest(tmp_path: Path):
+    with PackArchive(tmp_path / "r.pack") as pack:
+        pack.put("aa_0/v1", _VOTE)
+        pack.put("aa_0/v2", _VOTE)
+        cache = ValidationCache(tmp_path / "cache.json", "v1")
+
+        results = validate_archive(pack_source(pack), cache, workers=1)
+
+        assert {r.digest for r in results} == {pack.blob_of("aa_0/v1")}
+    assert all(r.compliant for r in results)
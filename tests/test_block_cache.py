@@ -0,0 +1,33 @@
+from bot.block_cache import BlockEpochCache, BlockRef
+
+
+class TestBlockEpochCache:
+    def test_record_and_lookup_is_case_insensitive(self):
+        cache = BlockEpochCache()
+        cache.record("ABCD", 10, 500)
+
+        assert cache.get_epoch("abcd") == 500
+        assert cache.get("AbCd") == BlockRef(block_hash="abcd", block_no=10, epoch_no=500)
+
+    def test_miss_returns_none(self):
+        assert BlockEpochCache().get_epoch("missing") is None
+
+    def test_evicts_oldest_entry(self):
+        cache = BlockEpochCache(maxlen=2)
+        cache.record("a", 1, 500)
+        cache.record("b", 2, 500)
+        cache.record("c", 3, 501)
+
+        assert len(cache) == 2
+        assert cache.get_epoch("a") is None
+        assert cache.get_epoch("c") == 501
+
+    def test_re_recording_refreshes_position(self):
+        cache = BlockEpochCache(maxlen=2)
+        cache.record("a", 1, 500)
+        cache.record("b", 2, 500)
+        cache.record("a", 1, 500)
+        cache.record("c", 3, 500)
+
+        assert cache.get_epoch("a") == 500
+        assert cache.get_epoch("b") is None
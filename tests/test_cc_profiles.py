@@ -1,6 +1,34 @@
+import asyncio
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
-from bot.cc_profiles import clear_profile_cache, get_x_handle_for_voter_hash
+import pytest
+
+from bot.cc_profiles import (
+    _DEFAULT_PROFILE_PATH,
+    CcProfile,
+    CcProfileIndex,
+    clear_profile_cache,
+    get_x_handle_for_voter_hash,
+    resolve_handles,
+)
+
+_PROFILES = """\
+version: 1
+members:
+  - member_id: "member-a"
+    display_name: "Member A"
+    voter_hash: "aa11"
+    x_handle: "aaa"
+    confidence: "high"
+    status: "active_dbsync"
+    sources:
+      - "https://example.com/a"
+      - "https://x.com/aaa"
+  - member_id: "member-b"
+    voter_hash: "BB22"
+    x_handle: ""
+"""
 
 
 class TestCcProfiles:
@@ -28,3 +56,151 @@ members:
         clear_profile_cache()
 
         assert get_x_handle_for_voter_hash("aa11", path=missing) is None
+
+    def test_index_exposes_every_profile_field(self, tmp_path: Path):
+        profile = tmp_path / "cc_profiles.yaml"
+        profile.write_text(_PROFILES, encoding="utf-8")
+
+        member = CcProfileIndex(profile).get("AA11")
+
+        assert member == CcProfile(
+            voter_hash="aa11",
+            member_id="member-a",
+            display_name="Member A",
+            x_handle="@aaa",
+            confidence="high",
+            status="active_dbsync",
+            sources=("https://example.com/a", "https://x.com/aaa"),
+        )
+
+    def test_members_without_hash_or_after_the_list_are_ignored(self, tmp_path: Path):
+        profile = tmp_path / "cc_profiles.yaml"
+        profile.write_text(
+            _PROFILES + '  - member_id: "vacant"\n    voter_hash: null\nfooter:\n  - "not a source"\n', encoding="utf-8"
+        )
+
+        index = CcProfileIndex(profile)
+
+        assert len(index) == 2
+        assert index.get("bb22").sources == ()
+        assert index.handle("bb22") is None
+
+    def test_witness_keys_are_bound_to_display_names(self, tmp_path: Path):
+        profile = tmp_path / "cc_profiles.yaml"
+        profile.write_text(
+            _PROFILES.replace(
+                '    sources:\n      - "https://example.com/a"',
+                '    witness_keys:\n      - "ABCD"\n    sources:\n      - "https://example.com/a"',
+            ),
+            encoding="utf-8",
+        )
+
+        index = CcProfileIndex(profile)
+
+        assert index.get("aa11").witness_keys == ("abcd",)
+        assert index.get("aa11").sources == ("https://example.com/a", "https://x.com/aaa")
+        assert index.witness_keys() == {"abcd": "Member A"}
+
+    def test_refresh_rebuilds_only_when_the_file_changes(self, tmp_path: Path):
+        profile = tmp_path / "cc_profiles.yaml"
+        profile.write_text(_PROFILES, encoding="utf-8")
+        index = CcProfileIndex(profile)
+        assert index.handle("aa11") == "@aaa"
+
+        assert index.refresh() is False
+
+        profile.write_text(_PROFILES.replace('x_handle: "aaa"', 'x_handle: "renamed"'), encoding="utf-8")
+        assert index.refresh() is True
+        assert index.handle("aa11") == "@renamed"
+
+    def test_unreadable_source_keeps_the_current_table(self, tmp_path: Path):
+        profile = tmp_path / "cc_profiles.yaml"
+        profile.write_text(_PROFILES, encoding="utf-8")
+        index = CcProfileIndex(profile)
+        assert len(index) == 2
+
+        profile.unlink()
+        profile.mkdir()  # now stat() succeeds but reading fails
+
+        assert index.refresh() is False
+        assert index.handle("aa11") == "@aaa"
+
+    def test_missing_file_keeps_the_current_table(self, tmp_path: Path):
+        profile = tmp_path / "cc_profiles.yaml"
+        profile.write_text(_PROFILES, encoding="utf-8")
+        index = CcProfileIndex(profile)
+        assert index.handle("aa11") == "@aaa"
+
+        profile.unlink()
+        assert index.refresh() is False
+        assert index.handle("aa11") == "@aaa"
+
+        profile.write_text(_PROFILES.replace('x_handle: "aaa"', 'x_handle: "renamed"'), encoding="utf-8")
+        assert index.refresh() is True
+        assert index.handle("aa11") == "@renamed"
+
+    def test_resolve_handles_in_bulk(self, tmp_path: Path):
+        profile = tmp_path / "cc_profiles.yaml"
+        profile.write_text(_PROFILES, encoding="utf-8")
+        clear_profile_cache()
+
+        assert resolve_handles(["aa11", "BB22", "cc33"], path=profile) == {"aa11": "@aaa", "BB22": None, "cc33": None}
+
+    @patch("bot.cc_profiles.requests.get")
+    def test_http_source_uses_conditional_requests(self, mock_get):
+        mock_get.side_effect = [
+            MagicMock(status_code=200, text=_PROFILES, headers={"ETag": '"v1"'}),
+            MagicMock(status_code=304),
+        ]
+        index = CcProfileIndex("https://example.com/cc_profiles.yaml")
+
+        # Lookups never fetch the URL themselves; the warm-up or the watch task loads it.
+        assert index.handle("aa11") is None
+        mock_get.assert_not_called()
+        assert index.refresh() is True
+        assert index.handle("aa11") == "@aaa"
+        assert index.refresh() is False
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        assert index.handle("aa11") == "@aaa"
+
+    def test_default_profiles_file_parses(self):
+        index = CcProfileIndex(_DEFAULT_PROFILE_PATH)
+
+        assert len(index) > 0
+        tingvard = index.get("1980dbf1ad624b0cb5410359b5ab14d008561994a6c2b6c53fabec00")
+        assert (tingvard.display_name, tingvard.x_handle, tingvard.status) == ("Tingvard", "@tingvard", "active_dbsync")
+
+
+@pytest.mark.asyncio
+async def test_watch_picks_up_changes(tmp_path: Path):
+    profile = tmp_path / "cc_profiles.yaml"
+    profile.write_text(_PROFILES, encoding="utf-8")
+    index = CcProfileIndex(profile)
+    assert index.handle("aa11") == "@aaa"
+
+    task = asyncio.create_task(index.watch(0.01))
+    profile.write_text(_PROFILES.replace('x_handle: "aaa"', 'x_handle: "watched"'), encoding="utf-8")
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if index.handle("aa11") == "@watched":
+            break
+    task.cancel()
+
+    assert index.handle("aa11") == "@watched"
+
+
+@pytest.mark.asyncio
+@patch("bot.cc_profiles.requests.get")
+async def test_watch_loads_an_unloaded_url_without_waiting(mock_get):
+    mock_get.return_value = MagicMock(status_code=200, text=_PROFILES, headers={})
+    index = CcProfileIndex("https://example.com/cc_profiles.yaml")
+
+    task = asyncio.create_task(index.watch(3600))
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if index.handle("aa11") == "@aaa":
+            break
+    task.cancel()
+
+    assert index.handle("aa11") == "@aaa"
+    assert mock_get.call_count == 1
@@ -35,3 +35,54 @@ class TestConfigValidate:
             ),
         )
         cfg.validate()  # no exception
+
+    def test_confirmation_depth_must_fit_rollback_window(self):
+        cfg = Config(db_sync_url="postgresql://localhost/test", confirmation_depth=1000)
+        with pytest.raises(ConfigError, match="CONFIRMATION_DEPTH"):
+            cfg.validate()
+
+    def test_unknown_ingestion_mode(self):
+        cfg = Config(db_sync_url="postgresql://localhost/test", ingestion_mode="carrier-pigeon")
+        with pytest.raises(ConfigError, match="INGESTION_MODE"):
+            cfg.validate()
+
+    def test_ingestion_mode_flags(self):
+        both = Config(db_sync_url="postgresql://localhost/test", ingestion_mode="both")
+        assert both.webhook_ingestion_enabled and both.polling_ingestion_enabled
+        polling = Config(db_sync_url="postgresql://localhost/test", ingestion_mode="polling")
+        assert not polling.webhook_ingestion_enabled
+
+    def test_listen_requires_polling(self):
+        cfg = Config(db_sync_url="postgresql://localhost/test", dbsync_listen_enabled=True)
+        with pytest.raises(ConfigError, match="DBSYNC_LISTEN_ENABLED"):
+            cfg.validate()
+
+    def test_unknown_trace_exporter(self):
+        cfg = Config(db_sync_url="postgresql://localhost/test", trace_exporter="zipkin")
+        with pytest.raises(ConfigError, match="TRACE_EXPORTER"):
+            cfg.validate()
+
+    def test_trace_sample_rate_range(self):
+        cfg = Config(db_sync_url="postgresql://localhost/test", trace_exporter="jsonl", trace_sample_rate=1.5)
+        with pytest.raises(ConfigError, match="TRACE_SAMPLE_RATE"):
+            cfg.validate()
+
+    def test_warmup_timeout_must_be_positive(self):
+        cfg = Config(db_sync_url="postgresql://localhost/test", warmup_timeout_seconds=0)
+        with pytest.raises(ConfigError, match="WARMUP_TIMEOUT_SECONDS"):
+            cfg.validate()
+
+    def test_unknown_log_format(self):
+        cfg = Config(db_sync_url="postgresql://localhost/test", log_format="xml")
+        with pytest.raises(ConfigError, match="LOG_FORMAT"):
+            cfg.validate()
+
+    def test_unknown_log_level(self):
+        cfg = Config(db_sync_url="postgresql://localhost/test", log_level="LOUD")
+        with pytest.raises(ConfigError, match="LOG_LEVEL"):
+            cfg.validate()
+
+    def test_unknown_per_logger_level(self, monkeypatch):
+        monkeypatch.setenv("LOG_LEVELS", "bot.db=LOUD")
+        with pytest.raises(ConfigError, match="LOG_LEVELS"):
+            Config.from_env()
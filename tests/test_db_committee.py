@@ -0,0 +1,129 @@
+import pytest
+
+from bot import main
+from bot.db import repository
+from bot.db.queries import QUERY_CC_VOTES, QUERY_COLD_KEYS_FOR_HOT_KEYS, QUERY_EPOCH_COMMITTEE
+from bot.models import EpochCommittee
+
+
+class _FakeDbSync:
+    """Answers the committee and vote queries; records every query issued."""
+
+    def __init__(self):
+        self.committees = {
+            500: [("cold-a", 1), ("cold-b", 2), ("cold-c", None)],
+            501: [("cold-a", 1), ("cold-d", 4)],
+        }
+        self.registrations = {3: "cold-b"}
+        self.votes = {}
+        self.calls = []
+
+    def vote(self, block_no: int, hot_key_id: int, epoch_no: int, vote: str = "Yes"):
+        self.votes.setdefault(block_no, []).append(
+            ("ga", 0, f"vote-{block_no}-{hot_key_id}", hot_key_id, vote, "ipfs://x", epoch_no)
+        )
+
+    async def query(self, sql, params):
+        self.calls.append(sql)
+        if sql is QUERY_CC_VOTES:
+            return self.votes.get(params[0], [])
+        if sql is QUERY_EPOCH_COMMITTEE:
+            return self.committees.get(params[0], [])
+        if sql is QUERY_COLD_KEYS_FOR_HOT_KEYS:
+            return [(hot, self.registrations[hot]) for hot in params[0] if hot in self.registrations]
+        raise AssertionError(sql)
+
+
+@pytest.fixture
+def dbsync(monkeypatch):
+    fake = _FakeDbSync()
+    monkeypatch.setattr(repository, "_query", fake.query)
+    monkeypatch.setattr(repository, "_committee", None)
+    monkeypatch.setattr(repository, "_committee_listener", None)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_votes_resolve_cold_keys_through_the_epoch_committee(dbsync):
+    dbsync.vote(10, 1, 500)
+    dbsync.vote(11, 2, 500, "No")
+
+    first = await repository.get_cc_votes(10)
+    second = await repository.get_cc_votes(11)
+
+    assert [(v.voter_hash, v.vote) for v in first + second] == [("cold-a", "Yes"), ("cold-b", "No")]
+    assert dbsync.calls.count(QUERY_EPOCH_COMMITTEE) == 1
+
+
+@pytest.mark.asyncio
+async def test_committee_is_reloaded_on_epoch_transition(dbsync):
+    dbsync.vote(10, 1, 500)
+    dbsync.vote(20, 4, 501)
+
+    await repository.get_cc_votes(10)
+    votes = await repository.get_cc_votes(20)
+
+    assert [v.voter_hash for v in votes] == ["cold-d"]
+    assert dbsync.calls.count(QUERY_EPOCH_COMMITTEE) == 2
+    committee = await repository.get_epoch_committee(501)
+    assert committee.members == frozenset({"cold-a", "cold-d"})
+
+
+@pytest.mark.asyncio
+async def test_hot_keys_authorised_mid_epoch_are_looked_up_once(dbsync):
+    dbsync.vote(10, 3, 500)
+    dbsync.vote(11, 3, 500)
+
+    assert [v.voter_hash for v in await repository.get_cc_votes(10)] == ["cold-b"]
+    assert [v.voter_hash for v in await repository.get_cc_votes(11)] == ["cold-b"]
+    assert dbsync.calls.count(QUERY_COLD_KEYS_FOR_HOT_KEYS) == 1
+
+
+@pytest.mark.asyncio
+async def test_hot_keys_authorised_mid_epoch_leave_the_loaded_committee_untouched(dbsync):
+    seen = []
+    repository.set_committee_listener(seen.append)
+    dbsync.vote(10, 3, 500)
+
+    assert [v.voter_hash for v in await repository.get_cc_votes(10)] == ["cold-b"]
+    (loaded,) = seen
+    assert 3 not in loaded.cold_by_hot
+    assert (await repository.get_epoch_committee(500)).cold_by_hot[3] == "cold-b"
+
+
+@pytest.mark.asyncio
+async def test_votes_from_unregistered_hot_keys_are_skipped(dbsync):
+    dbsync.vote(10, 1, 500)
+    dbsync.vote(10, 99, 500)
+
+    assert [v.voter_hash for v in await repository.get_cc_votes(10)] == ["cold-a"]
+
+
+@pytest.mark.asyncio
+async def test_blocks_without_votes_do_not_load_the_committee(dbsync):
+    assert await repository.get_cc_votes(10) == []
+    assert QUERY_EPOCH_COMMITTEE not in dbsync.calls
+
+
+@pytest.mark.asyncio
+async def test_listener_sees_each_loaded_committee(dbsync):
+    seen = []
+    repository.set_committee_listener(seen.append)
+
+    await repository.get_epoch_committee(500)
+    await repository.get_epoch_committee(500)
+    await repository.get_epoch_committee(501)
+
+    assert [c.epoch_no for c in seen] == [500, 501]
+
+
+def test_unprofiled_committee_members_are_flagged(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(
+        main, "resolve_handles", lambda hashes: {h: "@known" if h == "cold-a" else None for h in hashes}
+    )
+    monkeypatch.setattr(main.logger, "warning", lambda msg, *args: warnings.append(msg % args))
+
+    main._flag_unprofiled_members(EpochCommittee(500, frozenset({"cold-a", "cold-c", "cold-b"}), {}))
+
+    assert warnings == ["Epoch 500 committee members missing from CC profiles: cold-b, cold-c"]
@@ -0,0 +1,81 @@
+import psycopg
+import pytest
+
+from bot.db import listener
+
+
+class _FakePoller:
+    def __init__(self):
+        self.wakes = 0
+        self.max_intervals = []
+
+    def wake(self):
+        self.wakes += 1
+
+    def set_max_interval(self, seconds):
+        self.max_intervals.append(seconds)
+
+
+class _FakeNotify:
+    def __init__(self, payload):
+        self.payload = payload
+
+
+class _FakeListenConn:
+    def __init__(self, payloads):
+        self._payloads = payloads
+        self.executed = []
+        self.closed = False
+
+    async def execute(self, sql):
+        self.executed.append(sql)
+
+    async def notifies(self):
+        for payload in self._payloads:
+            yield _FakeNotify(payload)
+        raise psycopg.OperationalError("server closed the connection")
+
+    async def close(self):
+        self.closed = True
+
+
+def test_parse_notify_payload():
+    assert listener.parse_notify_payload('{"table": "voting_procedure", "tx_id": 42}') == ("voting_procedure", 42)
+    assert listener.parse_notify_payload("not json") is None
+    assert listener.parse_notify_payload('{"table": "x"}') is None
+
+
+@pytest.mark.asyncio
+async def test_listen_once_wakes_poller_and_falls_back_on_disconnect(monkeypatch):
+    conn = _FakeListenConn(['{"table": "gov_action_proposal", "tx_id": 7}', "garbage"])
+
+    async def _fake_connect(*, conninfo, autocommit):
+        assert conninfo == "postgresql://db"
+        assert autocommit is True
+        return conn
+
+    monkeypatch.setattr(listener.psycopg.AsyncConnection, "connect", _fake_connect)
+
+    poller = _FakePoller()
+    db_listener = listener.DbSyncListener(
+        poller,
+        lambda: "postgresql://db",
+        listen_poll_interval=300.0,
+        fallback_poll_interval=20.0,
+    )
+
+    with pytest.raises(psycopg.OperationalError):
+        await db_listener.listen_once()
+
+    assert conn.executed == [f"LISTEN {listener.NOTIFY_CHANNEL}"]
+    assert conn.closed is True
+    assert db_listener.connected is True
+    # One catch-up wake on subscribe, one for the valid notification.
+    assert poller.wakes == 2
+    assert poller.max_intervals == [300.0]
+
+    db_listener._on_disconnected()
+
+    assert db_listener.connected is False
+    assert poller.max_intervals == [300.0, 20.0]
+    assert poller.wakes == 3
@@ -150,3 +150,67 @@ def test_tunnel_manager_restarts_with_previous_local_port(monkeypatch):
     assert manager.ensure_active() is second_tunnel
     assert start_calls == [None, 43123]
     assert first_tunnel.stopped is True
+
+
+class _FakeServerCursor:
+    def __init__(self, rows):
+        self._rows = rows
+        self.itersize = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def execute(self, _sql, params):
+        self.params = params
+
+    async def __aiter__(self):
+        for row in self._rows:
+            yield row
+
+
+class _FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _FakeStreamConn:
+    def __init__(self, cursor: _FakeServerCursor):
+        self.cursor_obj = cursor
+        self.cursor_names = []
+        self.closed = False
+
+    def transaction(self):
+        return _FakeTransaction()
+
+    def cursor(self, *, name):
+        self.cursor_names.append(name)
+        return self.cursor_obj
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_iter_gov_actions_after_streams_from_named_cursor(monkeypatch):
+    cursor = _FakeServerCursor([(7, "aa", "InfoAction", 0, "https://a"), (9, "bb", "NoConfidence", 1, "https://b")])
+    conn = _FakeStreamConn(cursor)
+
+    async def fake_connect(*, conninfo: str):
+        return conn
+
+    monkeypatch.setattr(repository.psycopg.AsyncConnection, "connect", fake_connect)
+
+    rows = [row async for row in repository.iter_gov_actions_after(5, itersize=500)]
+
+    assert [(tx_id, a.tx_hash) for tx_id, a in rows] == [(7, "aa"), (9, "bb")]
+    assert cursor.params == (5,)
+    assert conn.cursor_names == ["gov_actions_after"]
+    assert cursor.itersize == 500
+    assert conn.closed is True
+    assert repository._conn is None
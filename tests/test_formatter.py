@@ -1,9 +1,11 @@
-from bot.models import CcVote, GovAction, TreasuryDonation
+from bot.links import make_governance_action_link
+from bot.models import CcVote, GovAction, TreasuryDonationSummary
 from bot.twitter.formatter import (
     format_cc_vote_tweet,
     format_gov_action_tweet,
-    format_treasury_donations_tweet,
+    format_treasury_donation_summary_tweet,
 )
+from bot.twitter.text import weighted_length
 
 MAX_TWEET_LENGTH = 280
 
@@ -85,20 +87,77 @@ class TestFormatCcVoteTweet:
         assert "Voted by: CC member (deadbeef)" in tweet
 
 
-class TestFormatTreasuryDonationsTweet:
+class TestFormatTreasuryDonationSummaryTweet:
     def test_single_donation(self):
-        donations = [TreasuryDonation(block_no=1, tx_hash="aabb", amount_lovelace=5_000_000)]
-        tweet = format_treasury_donations_tweet(donations)
+        summary = TreasuryDonationSummary(epoch_no=500, count=1, total_lovelace=5_000_000)
+        tweet = format_treasury_donation_summary_tweet(summary)
         assert "Treasury Donations Summary" in tweet
         assert "Transactions: 1" in tweet
-        assert "5" in tweet
+        assert "Total Donated: 5 ADA" in tweet
         assert len(tweet) <= MAX_TWEET_LENGTH
 
     def test_multiple_donations(self):
-        donations = [
-            TreasuryDonation(block_no=1, tx_hash="aabb", amount_lovelace=1_000_000),
-            TreasuryDonation(block_no=2, tx_hash="ccdd", amount_lovelace=2_000_000),
-        ]
-        tweet = format_treasury_donations_tweet(donations)
+        summary = TreasuryDonationSummary(epoch_no=500, count=2, total_lovelace=3_500_000)
+        tweet = format_treasury_donation_summary_tweet(summary)
         assert "Transactions: 2" in tweet
-        assert "3" in tweet  # 1 + 2 = 3 ADA
+        assert "Total Donated: 3.5 ADA" in tweet
+
+
+class TestTweetLengthFitting:
+    def _action(self):
+        return GovAction(tx_hash="ab" * 32, action_type="TreasuryWithdrawals", index=3, raw_url="http://example.com")
+
+    def test_long_author_list_is_trimmed_before_the_title(self):
+        metadata = {
+            "body": {"title": "Budget for the Cardano developer ecosystem"},
+            "authors": [{"name": f"Contributor Number {i}"} for i in range(40)],
+        }
+        tweet = format_gov_action_tweet(self._action(), metadata)
+
+        assert weighted_length(tweet) <= MAX_TWEET_LENGTH
+        assert "Title: Budget for the Cardano developer ecosystem\n" in tweet
+        assert "Authors: Contributor Number 0" in tweet
+        assert "…\nType: Treasury Withdrawals" in tweet
+        assert "ababab" in tweet and tweet.endswith("#Cardano #Governance")
+
+    def test_long_cjk_title_is_truncated_by_weight(self):
+        metadata = {"body": {"title": "予算" * 200}}
+        tweet = format_gov_action_tweet(self._action(), metadata)
+
+        # Each CJK character weighs 2, so far fewer of them fit than len() would suggest.
+        assert MAX_TWEET_LENGTH - 2 <= weighted_length(tweet) <= MAX_TWEET_LENGTH
+        assert "…\nType: Treasury Withdrawals" in tweet
+
+    def test_cc_vote_trims_voted_by_line(self):
+        vote = CcVote(
+            ga_tx_hash="ab" * 32,
+            ga_index=0,
+            vote_tx_hash="cd" * 32,
+            voter_hash="ef" * 28,
+            vote="YES",
+            raw_url="https://example.com/" + "r" * 300,
+        )
+        metadata = {"authors": [{"name": f"Committee Member {i}"} for i in range(30)]}
+        tweet = format_cc_vote_tweet(vote, metadata)
+
+        assert weighted_length(tweet) <= MAX_TWEET_LENGTH
+        assert "Voted by: Committee Member 0" in tweet
+        assert "r" * 300 in tweet
+
+    def test_cc_vote_links_the_explorer_for_an_anchor_too_long_to_post(self):
+        vote = CcVote(
+            ga_tx_hash="ab" * 32,
+            ga_index=0,
+            vote_tx_hash="cd" * 32,
+            voter_hash="ef" * 28,
+            vote="YES",
+            raw_url="ar://" + "x" * 300,
+        )
+        for quote_tweet_id in (None, "123"):
+            tweet = format_cc_vote_tweet(vote, None, quote_tweet_id=quote_tweet_id, voter_x_handle="@member")
+
+            assert weighted_length(tweet) <= MAX_TWEET_LENGTH
+            assert "Voted by: @member\n" in tweet
+            assert f"Rationale: {make_governance_action_link('ab' * 32, 0)}\n" in tweet
+            assert "ar://" not in tweet and "…" not in tweet
+            assert tweet.endswith("#Cardano #Governance")
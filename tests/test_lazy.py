@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from bot.lazy import LazyModule, is_available, is_loaded, lazy_import
+
+
+def test_lazy_import_defers_until_attribute_access(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    module = lazy_import("colorsys")
+
+    assert isinstance(module, LazyModule)
+    assert not is_loaded(module)
+    assert "colorsys" not in sys.modules
+
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert is_loaded(module)
+    assert "not loaded" not in repr(module)
+
+
+def test_lazy_import_returns_already_imported_module():
+    assert lazy_import("json") is json
+
+
+def test_is_available_reports_missing_module():
+    assert not is_available(lazy_import("bot_no_such_dependency"))
+    assert not is_available(None)
+    assert is_available(lazy_import("json"))
+
+
+def test_attributes_set_on_lazy_module_shadow_the_real_ones(monkeypatch):
+    module = lazy_import("colorsys")
+    monkeypatch.setattr(module, "rgb_to_hsv", lambda *_: "patched")
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == "patched"
+
+
+def test_importing_main_does_not_import_heavy_dependencies():
+    heavy = ("xdk", "google.cloud.firestore", "psycopg", "requests", "tenacity", "pyld")
+    code = f"import sys, bot.main; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    env = {**os.environ, "DB_SYNC_URL": "postgresql://localhost/test", "LOG_LEVEL": "ERROR"}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,81 @@
+import io
+import json
+import logging
+
+import pytest
+
+from bot.logging import JsonFormatter, get_logger, log_context, parse_levels, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def json_logs():
+    """Route logging through the queue listener into a buffer; yields a reader of JSON lines."""
+    root = logging.getLogger()
+    level = root.level
+    stream = io.StringIO()
+    setup_logging(logging.DEBUG, fmt="json", levels={"bot.noisy": "WARNING"}, project="demo", stream=stream)
+
+    def _read():
+        shutdown_logging()  # flushes the listener
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield _read
+    shutdown_logging()
+    root.setLevel(level)
+    logging.getLogger("bot.noisy").setLevel(logging.NOTSET)
+
+
+def test_json_entries_carry_cloud_logging_fields(json_logs):
+    with log_context(block_no=42, trace="abc123"):
+        get_logger("test").info("Processed %s items", 3)
+    get_logger("test").warning("outside")
+
+    first, second = json_logs()
+    assert first["severity"] == "INFO"
+    assert first["message"] == "Processed 3 items"
+    assert first["logger"] == "bot.test"
+    assert first["block_no"] == 42
+    assert first["logging.googleapis.com/trace"] == "projects/demo/traces/abc123"
+    assert second["severity"] == "WARNING"
+    assert "block_no" not in second
+
+
+def test_per_logger_levels(json_logs):
+    get_logger("noisy").info("hidden")
+    get_logger("noisy").warning("shown")
+    get_logger("other").debug("debug shown")
+    assert [entry["message"] for entry in json_logs()] == ["shown", "debug shown"]
+
+
+def test_mutable_arguments_are_formatted_at_call_time(json_logs):
+    payload = {"height": 1}
+    get_logger("test").info("Payload: %s", payload)
+    payload["height"] = 2
+    (entry,) = json_logs()
+    assert entry["message"] == "Payload: {'height': 1}"
+
+
+def test_exceptions_are_included(json_logs):
+    try:
+        raise ValueError("bad block")
+    except ValueError:
+        get_logger("test").exception("Failed")
+    (entry,) = json_logs()
+    assert entry["severity"] == "ERROR"
+    assert entry["message"].startswith("Failed\nTraceback")
+    assert "ValueError: bad block" in entry["message"]
+
+
+def test_json_formatter_without_project():
+    record = logging.LogRecord("bot.x", logging.INFO, __file__, 1, "hi", None, None)
+    record.log_context = {"trace": "t1"}
+    assert json.loads(JsonFormatter().format(record))["logging.googleapis.com/trace"] == "t1"
+
+
+def test_parse_levels():
+    assert parse_levels("bot.db=debug, bot.twitter.client=WARNING,,") == {
+        "bot.db": "DEBUG",
+        "bot.twitter.client": "WARNING",
+    }
+    with pytest.raises(ValueError, match="LOUD"):
+        parse_levels("bot.db=LOUD")
@@ -1,11 +1,28 @@
 import os
+from dataclasses import replace
 
 import pytest
 
 os.environ.setdefault("DB_SYNC_URL", "postgresql://localhost/test")
 
 from bot import main
-from bot.models import CcVote, GovAction
+from bot.models import CcVote, GovAction, TreasuryDonationSummary
+
+
+@pytest.fixture(autouse=True)
+def _summary_markers(monkeypatch):
+    """Keep treasury summary markers in memory instead of Firestore."""
+    summarised = set()
+    monkeypatch.setattr(main, "is_epoch_summarised", lambda epoch_no: epoch_no in summarised)
+    monkeypatch.setattr(main, "mark_epoch_summarised", lambda epoch_no, tweet_id: summarised.add(epoch_no))
+    return summarised
+
+
+@pytest.fixture(autouse=True)
+def _nothing_archived(monkeypatch):
+    """Treat every gov action and CC vote as new unless a test says otherwise."""
+    monkeypatch.setattr(main, "is_action_archived", lambda *_: False)
+    monkeypatch.setattr(main, "is_cc_vote_archived", lambda *_: False)
 
 
 @pytest.mark.asyncio
@@ -39,6 +56,99 @@ async def test_process_gov_actions_saves_action_state(monkeypatch):
     assert save_calls == [(action.tx_hash, action.index, "tweet-123", 321)]
 
 
+@pytest.mark.asyncio
+async def test_process_gov_actions_posts_an_over_long_tweet_as_a_thread(monkeypatch):
+    action = GovAction(tx_hash="a" * 64, action_type="InfoAction", index=0, raw_url="ipfs://example")
+
+    async def _fake_get_gov_actions(*_):
+        return [action]
+
+    def _post(text):
+        raise main.TweetTooLongError("too long")
+
+    threads = []
+
+    def _post_thread(texts):
+        threads.append(texts)
+        return [f"tweet-{i}" for i in range(len(texts))]
+
+    monkeypatch.setattr(main, "get_gov_actions", _fake_get_gov_actions)
+    monkeypatch.setattr(main, "sanitise_url", lambda url: url)
+    monkeypatch.setattr(main, "fetch_metadata", lambda *_: None)
+    monkeypatch.setattr(main, "validate_gov_action_rationale", lambda *_: [])
+    monkeypatch.setattr(main, "format_gov_action_tweet", lambda *_: "word " * 100)
+    monkeypatch.setattr(main, "post_tweet", _post)
+    monkeypatch.setattr(main, "post_thread", _post_thread)
+
+    save_calls = []
+    monkeypatch.setattr(
+        main,
+        "save_action_tweet_id",
+        lambda tx_hash, index, tweet_id, source_block=None: save_calls.append(tweet_id),
+    )
+
+    await main._process_gov_actions(322)
+
+    (parts,) = threads
+    assert len(parts) == 2 and parts[0].endswith("(1/2)")
+    assert save_calls == ["tweet-0"]
+
+
+@pytest.mark.asyncio
+async def test_process_gov_actions_skips_archived_action_at_any_height(monkeypatch):
+    # An action orphaned by a rollback and re-included at a higher height is already archived.
+    action = GovAction(tx_hash="a" * 64, action_type="InfoAction", index=0, raw_url="ipfs://example")
+
+    async def _fake_get_gov_actions(*_):
+        return [action]
+
+    def _unexpected(*_args, **_kwargs):
+        raise AssertionError("unexpected post_tweet")
+
+    monkeypatch.setattr(main, "get_gov_actions", _fake_get_gov_actions)
+    monkeypatch.setattr(main, "is_action_archived", lambda tx_hash, index: (tx_hash, index) == (action.tx_hash, 0))
+    monkeypatch.setattr(main, "post_tweet", _unexpected)
+    monkeypatch.setattr(main, "save_action_tweet_id", _unexpected)
+
+    await main._process_gov_actions(999)
+
+
+@pytest.mark.asyncio
+async def test_process_cc_votes_records_a_tweet_that_is_too_long_and_moves_on(monkeypatch):
+    votes = [
+        CcVote(ga_tx_hash="b" * 64, ga_index=1, vote_tx_hash="c" * 64, voter_hash=voter * 56, vote="YES", raw_url="")
+        for voter in ("d", "e")
+    ]
+
+    async def _fake_get_cc_votes(*_):
+        return votes
+
+    def _post(text):
+        if text == "d":
+            raise main.TweetTooLongError("too long")
+        return "tweet-e"
+
+    monkeypatch.setattr(main, "get_cc_votes", _fake_get_cc_votes)
+    monkeypatch.setattr(main, "sanitise_url", lambda url: url)
+    monkeypatch.setattr(main, "fetch_metadata", lambda *_: None)
+    monkeypatch.setattr(main, "validate_cc_vote_rationale", lambda *_: [])
+    monkeypatch.setattr(main, "get_action_tweet_id", lambda *_: None)
+    monkeypatch.setattr(main, "resolve_handles", lambda hashes: dict.fromkeys(hashes, "cc_member"))
+    monkeypatch.setattr(main, "format_cc_vote_tweet", lambda vote, *_args, **_kwargs: vote.voter_hash[0])
+    monkeypatch.setattr(main, "post_tweet", _post)
+
+    archived = []
+    monkeypatch.setattr(
+        main,
+        "mark_cc_vote_archived",
+        lambda ga_tx_hash, ga_index, voter_hash, source_block=None, vote_tx_hash=None: archived.append(voter_hash[0]),
+    )
+
+    await main._process_cc_votes(654)
+
+    assert archived == ["d", "e"]
+
+
 @pytest.mark.asyncio
 async def test_process_cc_votes_posts_regular_tweet_when_no_action_tweet_id(monkeypatch):
     vote = CcVote(
@@ -58,7 +168,7 @@ async def test_process_cc_votes_posts_regular_tweet_when_no_action_tweet_id(monk
     monkeypatch.setattr(main, "fetch_metadata", lambda *_: {"body": {"summary": "s"}})
     monkeypatch.setattr(main, "validate_cc_vote_rationale", lambda *_: [])
     monkeypatch.setattr(main, "get_action_tweet_id", lambda *_: None)
-    monkeypatch.setattr(main, "get_x_handle_for_voter_hash", lambda *_: "cc_member")
+    monkeypatch.setattr(main, "resolve_handles", lambda hashes: dict.fromkeys(hashes, "cc_member"))
     monkeypatch.setattr(main, "format_cc_vote_tweet", lambda *_args, **_kwargs: "cc vote tweet")
 
     post_calls = []
@@ -73,8 +183,8 @@ async def test_process_cc_votes_posts_regular_tweet_when_no_action_tweet_id(monk
     monkeypatch.setattr(
         main,
         "mark_cc_vote_archived",
-        lambda ga_tx_hash, ga_index, voter_hash, source_block=None: cc_state_calls.append(
-            (ga_tx_hash, ga_index, voter_hash, source_block)
+        lambda ga_tx_hash, ga_index, voter_hash, source_block=None, vote_tx_hash=None: cc_state_calls.append(
+            (ga_tx_hash, ga_index, voter_hash, source_block, vote_tx_hash)
         ),
     )
 
@@ -82,7 +192,48 @@ async def test_process_cc_votes_posts_regular_tweet_when_no_action_tweet_id(monk
 
     # No tweet ID found, so posts regular tweet instead of quote tweet
     assert post_calls == ["cc vote tweet"]
-    assert cc_state_calls == [(vote.ga_tx_hash, vote.ga_index, vote.voter_hash, 654)]
+    assert cc_state_calls == [(vote.ga_tx_hash, vote.ga_index, vote.voter_hash, 654, vote.vote_tx_hash)]
+
+
+@pytest.mark.asyncio
+async def test_process_cc_votes_tweets_a_changed_vote_but_not_a_replayed_one(monkeypatch):
+    first = CcVote(ga_tx_hash="b" * 64, ga_index=1, vote_tx_hash="c" * 64, voter_hash="d" * 56, vote="NO", raw_url="")
+    changed = replace(first, vote_tx_hash="f" * 64, vote="YES")
+    votes_by_block = {100: [first], 200: [changed]}
+
+    async def _fake_get_cc_votes(block_no):
+        return votes_by_block[block_no]
+
+    archive = {}
+    monkeypatch.setattr(
+        main,
+        "is_cc_vote_archived",
+        lambda ga_tx_hash, ga_index, voter_hash, vote_tx_hash: (
+            archive.get((ga_tx_hash, ga_index, voter_hash)) == vote_tx_hash
+        ),
+    )
+    monkeypatch.setattr(
+        main,
+        "mark_cc_vote_archived",
+        lambda ga_tx_hash, ga_index, voter_hash, source_block=None, vote_tx_hash=None: archive.__setitem__(
+            (ga_tx_hash, ga_index, voter_hash), vote_tx_hash
+        ),
+    )
+    monkeypatch.setattr(main, "get_cc_votes", _fake_get_cc_votes)
+    monkeypatch.setattr(main, "sanitise_url", lambda url: url)
+    monkeypatch.setattr(main, "fetch_metadata", lambda *_: None)
+    monkeypatch.setattr(main, "validate_cc_vote_rationale", lambda *_: [])
+    monkeypatch.setattr(main, "get_action_tweet_id", lambda *_: None)
+    monkeypatch.setattr(main, "resolve_handles", lambda hashes: dict.fromkeys(hashes, "cc_member"))
+    monkeypatch.setattr(main, "format_cc_vote_tweet", lambda vote, *_args, **_kwargs: vote.vote)
+    posted = []
+    monkeypatch.setattr(main, "post_tweet", lambda text: posted.append(text))
+
+    await main._process_cc_votes(100)
+    await main._process_cc_votes(200)  # the voter changes their vote in a later transaction
+    await main._process_cc_votes(200)  # a replay of the same vote
+
+    assert posted == ["NO", "YES"]
 
 
 @pytest.mark.asyncio
@@ -90,8 +241,10 @@ async def test_handle_blockfrost_webhook_updates_checkpoint(monkeypatch):
     from httpx import ASGITransport, AsyncClient
 
     monkeypatch.setattr(main, "verify_webhook_signature", lambda *_: True)
+    monkeypatch.setattr(main, "_block_cache", main.BlockEpochCache())
+    monkeypatch.setattr(main, "_chain", main.ChainTracker())
 
-    async def _noop(*_):
+    async def _noop(*_, **__):
         pass
 
     monkeypatch.setattr(main, "_process_gov_actions", _noop)
@@ -102,10 +255,12 @@ async def test_handle_blockfrost_webhook_updates_checkpoint(monkeypatch):
     monkeypatch.setattr(
         main,
         "set_checkpoint",
-        lambda name, block_no, epoch_no=None: checkpoint_calls.append((name, block_no, epoch_no)),
+        lambda name, block_no, epoch_no=None, block_hash=None, extra=None: checkpoint_calls.append(
+            (name, block_no, epoch_no, block_hash)
+        ),
     )
 
-    payload = {"payload": {"height": 111, "epoch": 222, "previous_block": "prev-hash"}}
+    payload = {"payload": {"height": 111, "hash": "cur-hash", "epoch": 222, "previous_block": "prev-hash"}}
 
     transport = ASGITransport(app=main.app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -116,4 +271,295 @@ async def test_handle_blockfrost_webhook_updates_checkpoint(monkeypatch):
         )
 
     assert response.status_code == 200
-    assert checkpoint_calls == [("blockfrost_main", 111, 222)]
+    assert checkpoint_calls == [("blockfrost_main", 111, 222, "cur-hash")]
+    assert main._block_cache.get_epoch("cur-hash") == 222
+
+
+@pytest.mark.asyncio
+async def test_process_treasury_donations_prefers_accumulator(monkeypatch):
+    monkeypatch.setattr(main, "config", replace(main.config, treasury_donation_accumulator_enabled=True))
+    monkeypatch.setattr(
+        main,
+        "get_epoch_treasury_donations",
+        lambda epoch_no, block_range=None: TreasuryDonationSummary(
+            epoch_no=epoch_no, count=2, total_lovelace=7_000_000
+        ),
+    )
+
+    async def _block_range(epoch_no):
+        return (1000, 1999)
+
+    monkeypatch.setattr(main, "get_epoch_block_range", _block_range)
+
+    async def _unexpected_query(*_):
+        raise AssertionError("unexpected DB-Sync aggregate query")
+
+    monkeypatch.setattr(main, "get_treasury_donation_summary", _unexpected_query)
+
+    post_calls = []
+    monkeypatch.setattr(main, "post_tweet", lambda text: post_calls.append(text))
+
+    await main._process_treasury_donations(600)
+
+    assert len(post_calls) == 1
+    assert "Transactions: 2" in post_calls[0]
+    assert "Total Donated: 7 ADA" in post_calls[0]
+
+
+@pytest.mark.asyncio
+async def test_process_treasury_donations_falls_back_when_accumulator_is_incomplete(monkeypatch):
+    monkeypatch.setattr(main, "config", replace(main.config, treasury_donation_accumulator_enabled=True))
+    monkeypatch.setattr(main, "get_epoch_treasury_donations", lambda epoch_no, block_range=None: None)
+
+    async def _block_range(epoch_no):
+        return (1000, 1999)
+
+    async def _full_summary(epoch_no):
+        return TreasuryDonationSummary(epoch_no=epoch_no, count=5, total_lovelace=9_000_000)
+
+    monkeypatch.setattr(main, "get_epoch_block_range", _block_range)
+    monkeypatch.setattr(main, "get_treasury_donation_summary", _full_summary)
+    post_calls = []
+    monkeypatch.setattr(main, "post_tweet", lambda text: post_calls.append(text))
+
+    await main._process_treasury_donations(600)
+
+    assert "Transactions: 5" in post_calls[0]
+
+
+@pytest.mark.asyncio
+async def test_accumulator_records_blocks_without_donations(monkeypatch):
+    async def _block_summary(block_no):
+        return TreasuryDonationSummary(epoch_no=600, count=0, total_lovelace=0)
+
+    recorded = []
+    monkeypatch.setattr(main, "get_block_treasury_donation_summary", _block_summary)
+    monkeypatch.setattr(main, "record_block_treasury_donations", lambda summary, block_no: recorded.append(block_no))
+
+    await main._accumulate_treasury_donations(1234)
+
+    assert recorded == [1234]
+
+
+@pytest.mark.asyncio
+async def test_process_treasury_donations_skips_empty_epoch(monkeypatch):
+    async def _fake_summary(epoch_no):
+        return TreasuryDonationSummary(epoch_no=epoch_no, count=0, total_lovelace=0)
+
+    def _unexpected_tweet(*_):
+        raise AssertionError("unexpected post_tweet")
+
+    monkeypatch.setattr(main, "get_treasury_donation_summary", _fake_summary)
+    monkeypatch.setattr(main, "post_tweet", _unexpected_tweet)
+
+    await main._process_treasury_donations(601)
+
+
+@pytest.mark.asyncio
+async def test_check_epoch_transition_uses_cached_previous_block(monkeypatch):
+    monkeypatch.setattr(main, "_block_cache", main.BlockEpochCache())
+    monkeypatch.setattr(main, "_chain", main.ChainTracker())
+    main._chain.push("prev-hash", 110)
+    main._block_cache.record("prev-hash", 110, 221)
+
+    async def _unexpected_lookup(*_):
+        raise AssertionError("unexpected DB-Sync epoch lookup")
+
+    monkeypatch.setattr(main, "get_block_epoch", _unexpected_lookup)
+    monkeypatch.setattr(main, "get_block_epoch_at_height", _unexpected_lookup)
+
+    processed = []
+
+    async def _fake_process(epoch_no):
+        processed.append(epoch_no)
+
+    monkeypatch.setattr(main, "_process_treasury_donations", _fake_process)
+
+    payload = {"height": 111, "epoch": 222, "previous_block": "prev-hash"}
+    await main._check_epoch_transition(111, payload)
+
+    assert processed == [221]
+
+    # The same boundary seen again (a replayed height) does not post the summary twice.
+    main.mark_epoch_summarised(221, None)
+    await main._check_epoch_transition(111, payload)
+    assert processed == [221]
+
+
+def _chain_payloads(first: int, last: int, boundary: int, prefix: str = "a") -> list[dict]:
+    """Blockfrost-shaped payloads for a linear chain; epoch 501 starts at ``boundary``."""
+    return [
+        {
+            "height": n,
+            "hash": f"{prefix}{n}",
+            "epoch": 500 if n < boundary else 501,
+            "previous_block": f"{prefix}{n - 1}",
+        }
+        for n in range(first, last + 1)
+    ]
+
+
+@pytest.fixture
+def epoch_pipeline(monkeypatch):
+    monkeypatch.setattr(main, "_block_cache", main.BlockEpochCache())
+    monkeypatch.setattr(main, "_chain", main.ChainTracker())
+    monkeypatch.setattr(main, "set_checkpoint", lambda *_args, **_kwargs: None)
+    events = []
+
+    async def _fake_process_height(block_no):
+        events.append(block_no)
+
+    async def _fake_summary(epoch_no):
+        events.append(("summary", epoch_no))
+        main.mark_epoch_summarised(epoch_no, "tweet")
+
+    async def _db_epoch(block):
+        # Only blocks from before the first payload are looked up; they are all in epoch 500.
+        events.append(("db_lookup", block))
+        return 500
+
+    monkeypatch.setattr(main, "_process_height", _fake_process_height)
+    monkeypatch.setattr(main, "_process_treasury_donations", _fake_summary)
+    monkeypatch.setattr(main, "get_block_epoch", _db_epoch)
+    monkeypatch.setattr(main, "get_block_epoch_at_height", _db_epoch)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_epoch_summary_waits_for_the_boundary_to_be_confirmed(monkeypatch, epoch_pipeline):
+    monkeypatch.setattr(main, "config", replace(main.config, confirmation_depth=2))
+
+    for payload in _chain_payloads(100, 105, boundary=103):
+        await main._process_block(payload)
+
+    # Tip 103 crosses the boundary, but the summary only runs once height 103 itself is confirmed
+    # (tip 105), after every height of epoch 500 was processed.
+    processed = [event for event in epoch_pipeline if not (isinstance(event, tuple) and event[0] == "db_lookup")]
+    assert processed == [98, 99, 100, 101, 102, 103, ("summary", 500)]
+
+
+@pytest.mark.asyncio
+async def test_replayed_boundary_does_not_post_the_summary_twice(epoch_pipeline):
+    for payload in _chain_payloads(100, 104, boundary=103):
+        await main._process_block(payload)
+    # A fork replaces blocks 103-104; height 103 is replayed and is again the first block of epoch 501.
+    for payload in _chain_payloads(103, 105, boundary=103, prefix="b"):
+        payload["previous_block"] = "a102" if payload["height"] == 103 else payload["previous_block"]
+        await main._process_block(payload)
+
+    assert epoch_pipeline.count(("summary", 500)) == 1
+    assert epoch_pipeline == [100, ("db_lookup", "a99"), 101, 102, 103, ("summary", 500), 104, 103, 104, 105]
+
+
+@pytest.mark.asyncio
+async def test_lookup_block_epoch_caches_db_result(monkeypatch):
+    monkeypatch.setattr(main, "_block_cache", main.BlockEpochCache())
+    lookups = []
+
+    async def _fake_get_block_epoch(block_hash):
+        lookups.append(block_hash)
+        return 300
+
+    monkeypatch.setattr(main, "get_block_epoch", _fake_get_block_epoch)
+
+    assert await main._lookup_block_epoch("abc") == 300
+    assert await main._lookup_block_epoch("abc") == 300
+    assert lookups == ["abc"]
+
+
+@pytest.mark.asyncio
+async def test_webhook_rollback_replays_orphaned_height_without_duplicates(monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+
+    monkeypatch.setattr(main, "verify_webhook_signature", lambda *_: True)
+    monkeypatch.setattr(main, "_block_cache", main.BlockEpochCache())
+    monkeypatch.setattr(main, "_chain", main.ChainTracker())
+    monkeypatch.setattr(main, "set_checkpoint", lambda *_args, **_kwargs: None)
+
+    async def _noop(*_):
+        pass
+
+    monkeypatch.setattr(main, "_check_epoch_transition", _noop)
+
+    processed = []
+
+    async def _fake_process_height(block_no):
+        processed.append(block_no)
+
+    monkeypatch.setattr(main, "_process_height", _fake_process_height)
+
+    blocks = [
+        {"height": 100, "hash": "a100", "epoch": 500, "previous_block": "a99"},
+        {"height": 101, "hash": "a101", "epoch": 500, "previous_block": "a100"},
+        # Fork: a new block 101 whose parent is still a100 — a101 is orphaned.
+        {"height": 101, "hash": "b101", "epoch": 500, "previous_block": "a100"},
+        {"height": 102, "hash": "b102", "epoch": 500, "previous_block": "b101"},
+    ]
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for block in blocks:
+            response = await client.post("/", json={"payload": block}, headers={"Blockfrost-Signature": "sig"})
+            assert response.status_code == 200
+
+    assert processed == [100, 101, 101, 102]
+
+
+@pytest.mark.asyncio
+async def test_process_block_deduplicates_across_ingestion_sources(monkeypatch):
+    monkeypatch.setattr(main, "_block_cache", main.BlockEpochCache())
+    monkeypatch.setattr(main, "_chain", main.ChainTracker())
+    monkeypatch.setattr(main, "set_checkpoint", lambda *_args, **_kwargs: None)
+
+    processed = []
+
+    async def _fake_process_height(block_no):
+        processed.append(block_no)
+
+    async def _fake_epoch_check(block_no, payload):
+        processed.append(("epoch", block_no))
+
+    monkeypatch.setattr(main, "_process_height", _fake_process_height)
+    monkeypatch.setattr(main, "_check_epoch_transition", _fake_epoch_check)
+
+    payload = {"height": 200, "hash": "h200", "epoch": 501, "previous_block": "h199"}
+    await main._process_block(payload)
+    # The same block arriving from the other ingestion source is a no-op.
+    await main._process_block(dict(payload))
+
+    assert processed == [200, ("epoch", 200)]
+
+
+@pytest.mark.asyncio
+async def test_webhook_ignored_in_polling_mode(monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+
+    monkeypatch.setattr(main, "verify_webhook_signature", lambda *_: True)
+    monkeypatch.setattr(main, "config", replace(main.config, ingestion_mode="polling"))
+
+    async def _unexpected(*_):
+        raise AssertionError("unexpected block processing")
+
+    monkeypatch.setattr(main, "_process_block", _unexpected)
+
+    transport = ASGITransport(app=main.app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/", json={"payload": {"height": 1}}, headers={"Blockfrost-Signature": "sig"})
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ignored"}
+
+
+@pytest.mark.asyncio
+async def test_poller_trailing_beyond_the_rollback_window_is_deduplicated(epoch_pipeline):
+    chain = _chain_payloads(100, 140, boundary=105)
+    for payload in chain:  # webhook
+        await main._process_block(payload)
+    for payload in chain:  # the poller, catching up 40 blocks behind
+        await main._process_block(dict(payload))
+
+    heights = [event for event in epoch_pipeline if isinstance(event, int)]
+    assert heights == list(range(100, 141))
+    assert epoch_pipeline.count(("summary", 500)) == 1
+    assert main._chain.tip == ("a140", 140)
+    assert main._chain.last_processed_block_no == 140
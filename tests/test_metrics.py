@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+os.environ.setdefault("DB_SYNC_URL", "postgresql://localhost/test")
+
+from bot import main, metrics
+from bot.metrics import Counter, Histogram
+from bot.models import GovAction
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_counter_render():
+    counter = Counter("jobs_total", "Jobs.", ("kind",))
+    counter.inc("a")
+    counter.inc("a")
+    counter.inc('we"ird')
+    assert counter.render() == [
+        "# HELP jobs_total Jobs.",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="a"} 2',
+        'jobs_total{kind="we\\"ird"} 1',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("op_seconds", "Op.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "fetch")
+    lines = histogram.render()
+    assert 'op_seconds_bucket{stage="fetch",le="0.1"} 2' in lines
+    assert 'op_seconds_bucket{stage="fetch",le="1.0"} 3' in lines
+    assert 'op_seconds_bucket{stage="fetch",le="+Inf"} 4' in lines
+    assert 'op_seconds_sum{stage="fetch"} 3.65' in lines
+    assert 'op_seconds_count{stage="fetch"} 4' in lines
+
+
+def test_stage_timer_records_on_error():
+    with pytest.raises(ValueError):
+        with metrics.stage("post"):
+            raise ValueError("boom")
+    assert metrics.STAGE_SECONDS.count("post") == 1
+
+
+@pytest.mark.asyncio
+async def test_gov_action_pipeline_records_stages(monkeypatch):
+    action = GovAction(tx_hash="a" * 64, action_type="InfoAction", index=0, raw_url="ipfs://example")
+
+    async def _fake_get_gov_actions(*_):
+        return [action]
+
+    monkeypatch.setattr(main, "get_gov_actions", _fake_get_gov_actions)
+    monkeypatch.setattr(main, "fetch_metadata", lambda *_: None)
+    monkeypatch.setattr(main, "post_tweet", lambda *_: "tweet-1")
+    monkeypatch.setattr(main, "save_action_tweet_id", lambda *_, **__: None)
+
+    await main._process_gov_actions(1)
+
+    for stage in ("query", "fetch", "validate", "format", "post", "state_write"):
+        assert metrics.STAGE_SECONDS.count(stage) == 1
+    assert metrics.ITEMS.value("gov_action", "posted") == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    metrics.WEBHOOKS.inc("ok")
+    response = await main.handle_metrics()
+    assert response.media_type == metrics.CONTENT_TYPE
+    assert 'govbot_webhook_requests_total{outcome="ok"} 1' in response.body.decode()
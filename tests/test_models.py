@@ -1,6 +1,6 @@
 from decimal import Decimal
 
-from bot.models import GovAction, TreasuryDonation, camel_case_to_spaced
+from bot.models import GovAction, TreasuryDonationSummary, camel_case_to_spaced
 
 # ---------------------------------------------------------------------------
 # camel_case_to_spaced
@@ -43,23 +43,23 @@ class TestGovAction:
 
 
 # ---------------------------------------------------------------------------
-# TreasuryDonation
+# TreasuryDonationSummary
 # ---------------------------------------------------------------------------
 
 
-class TestTreasuryDonation:
-    def test_amount_ada_basic(self):
-        donation = TreasuryDonation(block_no=1, tx_hash="abc", amount_lovelace=1_000_000)
-        assert donation.amount_ada == Decimal("1")
+class TestTreasuryDonationSummary:
+    def test_total_ada_basic(self):
+        summary = TreasuryDonationSummary(epoch_no=500, count=1, total_lovelace=1_000_000)
+        assert summary.total_ada == Decimal("1")
 
-    def test_amount_ada_fractional(self):
-        donation = TreasuryDonation(block_no=1, tx_hash="abc", amount_lovelace=1_500_000)
-        assert donation.amount_ada == Decimal("1.5")
+    def test_total_ada_fractional(self):
+        summary = TreasuryDonationSummary(epoch_no=500, count=1, total_lovelace=1_500_000)
+        assert summary.total_ada == Decimal("1.5")
 
-    def test_amount_ada_small(self):
-        donation = TreasuryDonation(block_no=1, tx_hash="abc", amount_lovelace=1)
-        assert donation.amount_ada == Decimal("0.000001")
+    def test_total_ada_small(self):
+        summary = TreasuryDonationSummary(epoch_no=500, count=1, total_lovelace=1)
+        assert summary.total_ada == Decimal("0.000001")
 
-    def test_amount_ada_zero(self):
-        donation = TreasuryDonation(block_no=1, tx_hash="abc", amount_lovelace=0)
-        assert donation.amount_ada == Decimal("0")
+    def test_total_ada_zero(self):
+        summary = TreasuryDonationSummary(epoch_no=500, count=0, total_lovelace=0)
+        assert summary.total_ada == Decimal("0")
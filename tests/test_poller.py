@@ -0,0 +1,98 @@
+import pytest
+
+from bot import poller
+from bot.models import Block
+
+
+def _block(block_id: int) -> Block:
+    return Block(
+        id=block_id,
+        hash=f"h{block_id}",
+        block_no=1000 + block_id,
+        epoch_no=500,
+        previous_hash=f"h{block_id - 1}",
+    )
+
+
+@pytest.fixture
+def fake_chain(monkeypatch):
+    blocks = [_block(i) for i in range(1, 8)]
+    checkpoints = []
+
+    async def _fake_get_blocks_after(block_id, limit):
+        return [b for b in blocks if b.id > block_id][:limit]
+
+    async def _fake_latest_block_id():
+        return blocks[-1].id
+
+    monkeypatch.setattr(poller, "get_blocks_after", _fake_get_blocks_after)
+    monkeypatch.setattr(poller, "get_latest_block_id", _fake_latest_block_id)
+    monkeypatch.setattr(poller, "get_checkpoint", lambda _name: {"last_block_id": 2})
+    monkeypatch.setattr(poller, "set_checkpoint", lambda **kwargs: checkpoints.append(kwargs))
+    return blocks, checkpoints
+
+
+@pytest.mark.asyncio
+async def test_poll_once_feeds_payloads_in_batches(fake_chain):
+    _, checkpoints = fake_chain
+    handled = []
+
+    async def _handle(payload):
+        handled.append(payload)
+
+    p = poller.DbSyncPoller(_handle, batch_size=3)
+
+    assert await p.poll_once() == 3
+    assert [b["height"] for b in handled] == [1003, 1004, 1005]
+    assert handled[0] == {"height": 1003, "hash": "h3", "epoch": 500, "previous_block": "h2"}
+    assert checkpoints[-1]["extra"] == {"last_block_id": 5}
+
+    assert await p.poll_once() == 2
+    assert await p.poll_once() == 0
+    assert p.cursor == 7
+
+
+@pytest.mark.asyncio
+async def test_first_run_starts_at_tip(fake_chain, monkeypatch):
+    monkeypatch.setattr(poller, "get_checkpoint", lambda _name: None)
+    handled = []
+
+    async def _handle(payload):
+        handled.append(payload)
+
+    p = poller.DbSyncPoller(_handle)
+
+    assert await p.poll_once() == 0
+    assert p.cursor == 7
+    assert handled == []
+
+
+@pytest.mark.asyncio
+async def test_failed_block_keeps_cursor_on_last_success(fake_chain):
+    _, checkpoints = fake_chain
+
+    async def _handle(payload):
+        if payload["height"] == 1005:
+            raise RuntimeError("boom")
+
+    p = poller.DbSyncPoller(_handle, batch_size=10)
+
+    with pytest.raises(RuntimeError):
+        await p.poll_once()
+
+    assert p.cursor == 4
+    assert checkpoints[-1]["extra"] == {"last_block_id": 4}
+
+
+def test_interval_adapts_to_load():
+    async def _handle(_payload):
+        pass
+
+    p = poller.DbSyncPoller(_handle, batch_size=10, min_interval=1.0, max_interval=5.0)
+
+    assert p._next_interval(10) == 0.0
+    assert p._next_interval(3) == 1.0
+    p._interval = 0.0
+    assert p._next_interval(0) == 1.0
+    p._interval = 4.0
+    assert p._next_interval(0) == 5.0
@@ -1,6 +1,11 @@
 """Tests for bot.rationale_validator."""
 
-from bot.rationale_validator import validate_cc_vote_rationale, validate_gov_action_rationale
+from bot.rationale_validator import (
+    check_cc_vote_rationale,
+    check_gov_action_rationale,
+    validate_cc_vote_rationale,
+    validate_gov_action_rationale,
+)
 
 
 class TestValidateGovActionRationale:
@@ -114,3 +119,68 @@ class TestValidateCcVoteRationale:
         metadata = {"body": {"@context": "ignored"}}
         result = validate_cc_vote_rationale(metadata)
         assert len(result) == 2
+
+
+def _finding_paths(findings, severity="warning") -> list[str]:
+    return [f.path for f in findings if f.severity == severity]
+
+
+class TestStructuredFindings:
+    """Envelope, witness and reference checks from the compiled schema."""
+
+    def _valid(self) -> dict:
+        return {
+            "@context": {"@language": "en-us"},
+            "hashAlgorithm": "blake2b-256",
+            "authors": [
+                {"name": "Alice", "witness": {"witnessAlgorithm": "ed25519", "publicKey": "ab", "signature": "cd"}}
+            ],
+            "body": {
+                "summary": "Yes",
+                "rationaleStatement": "Because",
+                "references": [{"@type": "RelevantArticles", "label": "Article 3", "uri": "ipfs://c"}],
+                "internalVote": {"constitutional": 3, "unconstitutional": 0},
+            },
+        }
+
+    def test_fully_valid_document_has_no_findings(self):
+        assert check_cc_vote_rationale(self._valid()) == []
+
+    def test_envelope_issues_are_warnings_not_compliance_errors(self):
+        metadata = self._valid()
+        del metadata["@context"]
+        metadata["hashAlgorithm"] = "sha256"
+
+        findings = check_cc_vote_rationale(metadata)
+
+        assert _finding_paths(findings) == ["@context", "hashAlgorithm"]
+        assert validate_cc_vote_rationale(metadata) == []
+
+    def test_witness_and_reference_checks(self):
+        metadata = self._valid()
+        metadata["authors"] = [{"name": "Bob"}, {"witness": {"witnessAlgorithm": "rsa", "publicKey": "zz"}}]
+        metadata["body"]["references"] = [{"@type": "relevantArticles", "uri": "ipfs://c"}]
+        metadata["body"]["internalVote"] = {"abstain": -1, "didNotVote": True}
+
+        findings = {(f.path, f.code) for f in check_cc_vote_rationale(metadata)}
+
+        assert findings == {
+            ("authors[0].witness", "missing"),
+            ("authors[1].witness.witnessAlgorithm", "enum"),
+            ("authors[1].witness.publicKey", "pattern"),
+            ("authors[1].witness.signature", "missing"),
+            ("body.references[0].@type", "enum"),
+            ("body.references[0].label", "missing"),
+            ("body.internalVote.abstain", "minimum"),
+            ("body.internalVote.didNotVote", "type"),
+        }
+
+    def test_missing_body_stops_validation(self):
+        findings = check_gov_action_rationale({"hashAlgorithm": "md5"})
+
+        assert [(f.severity, f.message) for f in findings] == [("error", "Missing 'body' object (CIP-0108)")]
+
+    def test_non_string_compulsory_field_is_an_error(self):
+        metadata = {"body": {"title": ["x"], "abstract": "a", "motivation": "m", "rationale": "r"}}
+
+        assert validate_gov_action_rationale(metadata) == ["Field 'body.title' should be a string (CIP-0108)"]
@@ -0,0 +1,82 @@
+from bot.rollback import ChainTracker
+
+
+def _tracker_with(*blocks: tuple[str, int]) -> ChainTracker:
+    tracker = ChainTracker(window_size=8)
+    for block_hash, block_no in blocks:
+        tracker.push(block_hash, block_no)
+        tracker.mark_processed(block_no)
+    return tracker
+
+
+class TestDetectRollback:
+    def test_extending_the_tip_is_not_a_rollback(self):
+        tracker = _tracker_with(("a98", 98), ("a99", 99))
+
+        assert tracker.detect_rollback("a100", "a99", 100) == []
+        assert tracker.heights_to_process(100) == [100]
+
+    def test_parent_inside_window_orphans_blocks_above_it(self):
+        tracker = _tracker_with(("a98", 98), ("a99", 99), ("a100", 100))
+
+        orphaned = tracker.detect_rollback("b99", "a98", 99)
+
+        assert orphaned == [("a99", 99), ("a100", 100)]
+        assert tracker.tip == ("a98", 98)
+        assert tracker.last_processed_block_no == 98
+        assert tracker.heights_to_process(99) == [99]
+
+    def test_unknown_parent_orphans_blocks_at_its_height(self):
+        tracker = _tracker_with(("a98", 98), ("a99", 99), ("a100", 100))
+
+        orphaned = tracker.detect_rollback("b101", "b100", 101)
+
+        assert orphaned == [("a100", 100)]
+        # Height 100 is replayed against the canonical chain before 101.
+        assert tracker.heights_to_process(101) == [100, 101]
+
+    def test_gap_from_missed_webhooks_is_not_a_rollback(self):
+        tracker = _tracker_with(("a98", 98))
+
+        assert tracker.detect_rollback("a102", "a101", 102) == []
+        assert tracker.heights_to_process(102) == [99, 100, 101, 102]
+
+    def test_duplicate_delivery_is_not_reprocessed(self):
+        tracker = _tracker_with(("a99", 99), ("a100", 100))
+
+        assert tracker.detect_rollback("a100", "a99", 100) == []
+        assert tracker.heights_to_process(100) == []
+
+    def test_confirmation_depth_absorbs_shallow_rollbacks(self):
+        tracker = ChainTracker(window_size=8)
+        for block_no in range(96, 101):
+            tracker.push(f"a{block_no}", block_no)
+        tracker.mark_processed(98)  # depth 2 at tip 100
+
+        tracker.detect_rollback("b99", "a98", 99)
+
+        assert tracker.heights_to_process(97) == []
+        assert tracker.heights_to_process(98) == []
+
+
+class TestSnapshot:
+    def test_round_trip(self):
+        tracker = _tracker_with(("a98", 98), ("a99", 99))
+        restored = ChainTracker(window_size=8)
+        restored.restore(tracker.snapshot())
+
+        assert restored.tip == ("a99", 99)
+        assert restored.last_processed_block_no == 99
+        assert restored.max_processed_block_no == 99
+
+
+class TestBehindWindow:
+    def test_processed_blocks_older_than_the_window_are_behind_it(self):
+        tracker = _tracker_with(*((f"a{n}", n) for n in range(100, 110)))
+
+        assert tracker.is_behind_window(101) is True
+        assert tracker.is_behind_window(102) is False  # still in the (8-block) window
+        assert tracker.is_behind_window(110) is False
+
+    def test_nothing_is_behind_a_fresh_tracker(self):
+        assert ChainTracker().is_behind_window(1) is False
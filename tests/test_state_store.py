@@ -1,33 +1,56 @@
 from __future__ import annotations
 
 from bot import state_store
+from bot.models import TreasuryDonationSummary
+
+
+class _FakeIncrement:
+    def __init__(self, value: int):
+        self.value = value
+
+
+def _deep_merge(existing: dict, payload: dict) -> dict:
+    """Mirror Firestore's merge=True semantics for nested maps and increments."""
+    merged = dict(existing)
+    for key, value in payload.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        elif isinstance(value, _FakeIncrement):
+            merged[key] = merged.get(key, 0) + value.value
+        else:
+            merged[key] = value
+    return merged
 
 
 class _FakeSnapshot:
-    def __init__(self, data: dict | None):
+    def __init__(self, data: dict | None, doc_id: str = ""):
         self._data = data
         self.exists = data is not None
+        self.id = doc_id
 
     def to_dict(self):
         return self._data
 
 
 class _FakeDocumentRef:
-    def __init__(self, collection_store: dict, doc_id: str):
-        self._collection_store = collection_store
+    def __init__(self, db_store: dict, collection_path: str, doc_id: str):
+        self._db_store = db_store
+        self._collection_store = db_store.setdefault(collection_path, {})
         self._doc_id = doc_id
+        self._path = f"{collection_path}/{doc_id}"
 
-    def get(self):
+    def collection(self, collection_name: str):
+        return _FakeCollectionRef(self._db_store, f"{self._path}/{collection_name}")
+
+    def get(self, transaction=None):
         return _FakeSnapshot(self._collection_store.get(self._doc_id))
 
     def set(self, payload, merge: bool = False):
         if not merge or self._doc_id not in self._collection_store:
-            self._collection_store[self._doc_id] = dict(payload)
+            self._collection_store[self._doc_id] = _deep_merge({}, payload)
             return
 
-        merged = dict(self._collection_store[self._doc_id])
-        merged.update(payload)
-        self._collection_store[self._doc_id] = merged
+        self._collection_store[self._doc_id] = _deep_merge(self._collection_store[self._doc_id], payload)
 
 
 class _FakeCollectionRef:
@@ -36,8 +59,30 @@ class _FakeCollectionRef:
         self._collection_name = collection_name
 
     def document(self, doc_id: str):
-        collection_store = self._db_store.setdefault(self._collection_name, {})
-        return _FakeDocumentRef(collection_store, doc_id)
+        return _FakeDocumentRef(self._db_store, self._collection_name, doc_id)
+
+    def stream(self):
+        return [_FakeSnapshot(data, doc_id) for doc_id, data in self._db_store.get(self._collection_name, {}).items()]
+
+    def order_by(self, field: str, direction: str = "ASCENDING"):
+        return _FakeQuery(self._db_store.get(self._collection_name, {}), field, direction == "DESCENDING")
+
+
+class _FakeQuery:
+    def __init__(self, collection_store: dict, field: str, descending: bool):
+        self._items = sorted(collection_store.items(), key=lambda item: item[1].get(field, 0), reverse=descending)
+
+    def limit(self, count: int):
+        self._items = self._items[:count]
+        return self
+
+    def stream(self):
+        return [_FakeSnapshot(data, doc_id) for doc_id, data in self._items]
+
+
+class _FakeTransaction:
+    def set(self, ref, payload, merge: bool = False):
+        ref.set(payload, merge=merge)
 
 
 class _FakeFirestoreClient:
@@ -47,14 +92,26 @@ class _FakeFirestoreClient:
     def collection(self, collection_name: str):
         return _FakeCollectionRef(self._store, collection_name)
 
+    def transaction(self):
+        return _FakeTransaction()
+
 
 class _FakeFirestoreModule:
     SERVER_TIMESTAMP = "SERVER_TS"
+    Increment = _FakeIncrement
+
+    @staticmethod
+    def transactional(func):
+        return func
+
+    class Query:
+        DESCENDING = "DESCENDING"
 
 
 def _reset_state_store(monkeypatch):
     monkeypatch.setattr(state_store, "_FIRESTORE_CLIENT", None)
     monkeypatch.setattr(state_store, "_FIRESTORE_UNAVAILABLE_LOGGED", False)
+    state_store.clear_action_tweet_id_cache()
 
 
 def test_save_and_get_action_tweet_id(monkeypatch):
@@ -79,18 +136,47 @@ def test_get_action_tweet_id_returns_none_for_missing_doc(monkeypatch):
     assert state_store.get_action_tweet_id("missing", 2) is None
 
 
+def test_action_tweet_id_is_served_from_cache_after_first_read(monkeypatch):
+    _reset_state_store(monkeypatch)
+    fake_client = _FakeFirestoreClient()
+    monkeypatch.setattr(state_store, "_get_firestore_client", lambda: fake_client)
+    fake_client.collection(state_store.GOV_ACTION_STATE_COLLECTION).document("abc123_0").set({"tweet_id": "42"})
+
+    assert state_store.get_action_tweet_id("abc123", 0) == "42"
+    monkeypatch.setattr(state_store, "_get_firestore_client", lambda: None)
+    assert state_store.get_action_tweet_id("abc123", 0) == "42"
+
+
+def test_prime_action_tweet_ids_loads_most_recent(monkeypatch):
+    _reset_state_store(monkeypatch)
+    fake_client = _FakeFirestoreClient()
+    monkeypatch.setattr(state_store, "_get_firestore_client", lambda: fake_client)
+    monkeypatch.setattr(state_store, "firestore", _FakeFirestoreModule())
+    actions = fake_client.collection(state_store.GOV_ACTION_STATE_COLLECTION)
+    actions.document("old_0").set({"tweet_id": "1", "last_updated_at": 1})
+    actions.document("new_0").set({"tweet_id": "3", "last_updated_at": 3})
+    actions.document("untweeted_0").set({"archived_action": True, "last_updated_at": 2})
+
+    assert state_store.prime_action_tweet_ids(limit=2) == 1
+
+    monkeypatch.setattr(state_store, "_get_firestore_client", lambda: None)
+    assert state_store.get_action_tweet_id("new", 0) == "3"
+    assert state_store.get_action_tweet_id("old", 0) is None
+
+
 def test_set_and_get_checkpoint(monkeypatch):
     _reset_state_store(monkeypatch)
     fake_client = _FakeFirestoreClient()
     monkeypatch.setattr(state_store, "_get_firestore_client", lambda: fake_client)
     monkeypatch.setattr(state_store, "firestore", _FakeFirestoreModule())
 
-    state_store.set_checkpoint("blockfrost_main", block_no=777, epoch_no=123)
+    state_store.set_checkpoint("blockfrost_main", block_no=777, epoch_no=123, block_hash="beef")
 
     checkpoint = state_store.get_checkpoint("blockfrost_main")
     assert checkpoint is not None
     assert checkpoint["last_block_no"] == 777
     assert checkpoint["last_epoch"] == 123
+    assert checkpoint["last_block_hash"] == "beef"
     assert checkpoint["updated_at"] == "SERVER_TS"
 
 
@@ -106,3 +192,84 @@ def test_mark_cc_vote_archived_writes_state(monkeypatch):
     assert doc["archived_vote"] is True
     assert doc["source_block"] == 42
     assert doc["last_updated_at"] == "SERVER_TS"
+
+
+def test_treasury_donation_accumulator_sums_blocks_idempotently(monkeypatch):
+    _reset_state_store(monkeypatch)
+    fake_client = _FakeFirestoreClient()
+    monkeypatch.setattr(state_store, "_get_firestore_client", lambda: fake_client)
+    monkeypatch.setattr(state_store, "firestore", _FakeFirestoreModule())
+
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 2, 3_000_000), block_no=10)
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 1, 1_500_000), block_no=11)
+    # A retried webhook for the same block must not double-count.
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 1, 1_500_000), block_no=11)
+
+    summary = state_store.get_epoch_treasury_donations(500)
+    assert summary == TreasuryDonationSummary(epoch_no=500, count=3, total_lovelace=4_500_000)
+    assert state_store.get_epoch_treasury_donations(501) is None
+
+
+def test_treasury_donation_accumulator_requires_full_epoch_coverage(monkeypatch):
+    _reset_state_store(monkeypatch)
+    fake_client = _FakeFirestoreClient()
+    monkeypatch.setattr(state_store, "_get_firestore_client", lambda: fake_client)
+    monkeypatch.setattr(state_store, "firestore", _FakeFirestoreModule())
+
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 2, 3_000_000), block_no=10)
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 1, 1_500_000), block_no=12)
+    assert state_store.get_epoch_treasury_donations(500, block_range=(10, 12)) is None
+
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 0, 0), block_no=11)
+    assert state_store.get_epoch_treasury_donations(500, block_range=(10, 12)) == TreasuryDonationSummary(
+        epoch_no=500, count=3, total_lovelace=4_500_000
+    )
+    assert state_store.get_epoch_treasury_donations(500, block_range=(9, 12)) is None
+
+    # A replayed height whose new block has no donations takes back the orphaned block's donations.
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 0, 0), block_no=12)
+    assert state_store.get_epoch_treasury_donations(500, block_range=(10, 12)) == TreasuryDonationSummary(
+        epoch_no=500, count=2, total_lovelace=3_000_000
+    )
+
+
+def test_treasury_donation_total_is_one_document_per_epoch(monkeypatch):
+    _reset_state_store(monkeypatch)
+    fake_client = _FakeFirestoreClient()
+    monkeypatch.setattr(state_store, "_get_firestore_client", lambda: fake_client)
+    monkeypatch.setattr(state_store, "firestore", _FakeFirestoreModule())
+
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 2, 3_000_000), block_no=10)
+    state_store.record_block_treasury_donations(TreasuryDonationSummary(500, 1, 1_000_000), block_no=11)
+    state_store.mark_epoch_summarised(500, "tweet-1")
+
+    epoch = fake_client.collection(state_store.TREASURY_DONATION_STATE_COLLECTION).document("500")
+    total = epoch.get().to_dict()
+    assert (total["count"], total["total_lovelace"], total["blocks"]) == (3, 4_000_000, 2)
+    blocks = epoch.collection(state_store.TREASURY_DONATION_BLOCKS_SUBCOLLECTION)
+    assert [doc.id for doc in blocks.stream()] == ["10", "11"]
+    marker = fake_client.collection(state_store.TREASURY_SUMMARY_STATE_COLLECTION).document("500").get().to_dict()
+    assert marker["summarised"] is True
+    assert marker["summary_tweet_id"] == "tweet-1"
+
+    monkeypatch.setattr(state_store, "_SUMMARISED_EPOCHS", set())
+    assert state_store.is_epoch_summarised(500) is True
+    assert state_store.is_epoch_summarised(501) is False
+
+
+def test_archived_flags_reflect_saved_state(monkeypatch):
+    _reset_state_store(monkeypatch)
+    fake_client = _FakeFirestoreClient()
+    monkeypatch.setattr(state_store, "_get_firestore_client", lambda: fake_client)
+    monkeypatch.setattr(state_store, "firestore", _FakeFirestoreModule())
+
+    assert state_store.is_action_archived("abc123", 0) is False
+    assert state_store.is_cc_vote_archived("abc123", 0, "voter", "vote_tx") is False
+
+    state_store.save_action_tweet_id("abc123", 0, "", source_block=1)
+    state_store.mark_cc_vote_archived("abc123", 0, "voter", source_block=2, vote_tx_hash="vote_tx")
+
+    assert state_store.is_action_archived("abc123", 0) is True
+    assert state_store.is_cc_vote_archived("abc123", 0, "voter", "vote_tx") is True
+    # The same voter voting again on the action in a later transaction is a new vote.
+    assert state_store.is_cc_vote_archived("abc123", 0, "voter", "later_vote_tx") is False
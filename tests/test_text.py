@@ -0,0 +1,112 @@
+import pytest
+
+from bot.twitter.text import (
+    MAX_WEIGHTED_LENGTH,
+    compile_template,
+    fits,
+    split_thread,
+    truncate,
+    weighted_length,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("hello", 5),
+        ("café", 4),
+        ("café", 4),  # NFC-normalised before counting
+        ("日本語", 6),
+        ("“quoted” — dash", 15),
+        ("👍", 2),
+        ("👍🏽", 2),
+        ("👨‍👩‍👧", 2),
+        ("🇯🇵", 2),
+        ("1️⃣", 2),
+        ("❤️", 2),
+        ("https://explorer.cardano.org/governance-action/" + "ab" * 32, 23),
+        ("see https://example.com/x.", 4 + 23 + 1),
+        ("see cardano.org", 4 + 23),
+        ("e.g. this", 9),
+    ],
+)
+def test_weighted_length(text, expected):
+    assert weighted_length(text) == expected
+
+
+def test_truncate_respects_weight_and_word_boundaries():
+    text = "Authors: Alice ✓, Bob Builder, Carol Danvers, Dave"
+
+    shortened = truncate(text, 30)
+
+    assert shortened == "Authors: Alice ✓, Bob…"
+    assert weighted_length(shortened) <= 30
+    assert truncate(text, 100) == text
+    assert truncate(text, 1) == ""
+
+
+def test_truncate_never_splits_urls_or_emoji():
+    assert truncate("x 👨‍👩‍👧 y", 4) == "x…"
+    url = "https://example.com/" + "a" * 50
+    assert truncate(f"go {url} now", 28) == f"go {url}…"  # the ellipsis itself weighs 2
+    assert truncate(f"go {url} now", 27) == "go…"
+
+
+def test_template_renders_like_str_format():
+    source = "Hi {name}\n{line}Total: {amount:,} ADA"
+    template = compile_template(source)
+
+    assert template.fields == ("name", "line", "amount")
+    assert template.render(name="A", line="x\n", amount=1234) == source.format(name="A", line="x\n", amount=1234)
+    assert compile_template(source) is template
+
+
+def test_template_rejects_conversions_and_attribute_fields():
+    with pytest.raises(ValueError):
+        compile_template("{name!r}")
+    with pytest.raises(ValueError):
+        compile_template("{action.title}")
+
+
+def test_fit_shrinks_fields_in_priority_order():
+    template = compile_template("{title}{authors}Link: {link}")
+    values = dict(title="T" * 100 + "\n", authors="Authors: " + "Name, " * 40 + "\n", link="https://x.io/1")
+
+    text = template.fit(shrink=("authors", "title"), limit=150, **values)
+
+    assert weighted_length(text) <= 150
+    assert text.startswith("T" * 100 + "\nAuthors: Name")
+    assert "…\nLink: https://x.io/1" in text
+
+
+def test_fit_drops_a_field_with_nothing_left():
+    template = compile_template("{a}{b}end")
+    text = template.fit(shrink=("a", "b"), limit=8, a="aaaaaaaaaa\n", b="bbbb\n")
+
+    assert text == "bbbb\nend"
+
+
+def test_fit_leaves_text_untouched_when_it_fits():
+    template = compile_template("{a} {b}")
+    assert template.fit(shrink=("a",), a="x", b="y") == "x y"
+
+
+def test_split_thread_breaks_on_lines_then_words():
+    text = "\n".join(f"Line {i}: " + "word " * 20 for i in range(10))
+
+    parts = split_thread(text)
+
+    assert len(parts) > 1
+    assert all(fits(part) for part in parts)
+    assert " ".join(" ".join(parts).split()) == " ".join(text.split())
+
+    words = ("word " * 200).strip()
+    assert all(fits(part, 50) for part in split_thread(words, 50))
+
+
+def test_split_thread_numbers_parts_within_limit():
+    parts = split_thread(("word " * 120).strip(), numbered=True)
+
+    assert [part.rsplit(" ", 1)[1] for part in parts] == ["(1/3)", "(2/3)", "(3/3)"]
+    assert all(weighted_length(part) <= MAX_WEIGHTED_LENGTH for part in parts)
+    assert split_thread("short") == ["short"]
@@ -0,0 +1,128 @@
+import json
+
+import pytest
+
+from bot import tracing
+from bot.tracing import Exporter, JsonLinesExporter, OtlpExporter
+
+
+class _Collect(Exporter):
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+@pytest.fixture
+def collector():
+    exporter = _Collect()
+    tracing.configure(exporter)
+    yield exporter
+    tracing.configure(None)
+
+
+def _run_trace():
+    with tracing.span("webhook", block_no=7):
+        with tracing.span("gov_action", index=0):
+            with tracing.span("fetch"):
+                pass
+        with tracing.span("cc_vote"):
+            pass
+
+
+def test_spans_nest_into_one_trace(collector):
+    _run_trace()
+    tracing.shutdown()
+
+    (spans,) = collector.traces
+    by_name = {s.name: s for s in spans}
+    assert [s.name for s in spans] == ["fetch", "gov_action", "cc_vote", "webhook"]
+    assert len({s.trace_id for s in spans}) == 1
+    assert by_name["webhook"].parent_id is None
+    assert by_name["gov_action"].parent_id == by_name["webhook"].span_id
+    assert by_name["fetch"].parent_id == by_name["gov_action"].span_id
+    assert by_name["webhook"].attributes == {"block_no": 7}
+    assert all(s.end_ns >= s.start_ns for s in spans)
+
+
+def test_errors_are_recorded(collector):
+    with pytest.raises(RuntimeError):
+        with tracing.span("webhook"):
+            with tracing.span("post"):
+                raise RuntimeError("X is down")
+    tracing.shutdown()
+
+    (spans,) = collector.traces
+    assert {s.name: s.error for s in spans} == {"post": "RuntimeError: X is down", "webhook": "RuntimeError: X is down"}
+
+
+def test_sampling_drops_whole_traces():
+    exporter = _Collect()
+    tracing.configure(exporter, sample_rate=0.0)
+    try:
+        _run_trace()
+        with tracing.span("webhook") as root:
+            assert not root.sampled
+            with tracing.span("fetch") as child:
+                assert not child.sampled
+    finally:
+        tracing.configure(None)
+    assert exporter.traces == []
+
+
+def test_disabled_without_exporter():
+    with tracing.span("webhook") as root:
+        assert not root.sampled
+        root.set(block_no=1)  # no-op
+    assert tracing.current_span().sampled is False
+
+
+@pytest.mark.asyncio
+async def test_spans_follow_awaits(collector):
+    async def _child():
+        with tracing.span("query"):
+            pass
+
+    with tracing.span("block"):
+        await _child()
+    tracing.shutdown()
+
+    (spans,) = collector.traces
+    assert [s.name for s in spans] == ["query", "block"]
+    assert spans[0].parent_id == spans[1].span_id
+
+
+def test_jsonl_exporter(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing.configure(JsonLinesExporter(path))
+    try:
+        _run_trace()
+    finally:
+        tracing.configure(None)
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["name"] for row in rows] == ["fetch", "gov_action", "cc_vote", "webhook"]
+    assert rows[-1]["attributes"] == {"block_no": 7}
+
+
+def test_otlp_payload(collector):
+    _run_trace()
+    tracing.shutdown()
+
+    payload = OtlpExporter("http://collector:4318/").payload(collector.traces[0])
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0]["value"] == {"stringValue": tracing.SERVICE_NAME}
+    spans = resource_spans["scopeSpans"][0]["spans"]
+    root = next(s for s in spans if s["name"] == "webhook")
+    assert "parentSpanId" not in root
+    assert root["attributes"] == [{"key": "block_no", "value": {"intValue": "7"}}]
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+
+
+def test_exporters_must_implement_export():
+    class _Incomplete(Exporter):
+        pass
+
+    with pytest.raises(TypeError):
+        _Incomplete()
@@ -1,5 +1,6 @@
 from dataclasses import replace
 
+import pytest
 from xdk.posts.models import CreateRequest
 
 from bot.config import TwitterConfig
@@ -108,3 +109,38 @@ class TestTwitterClient:
         assert body.reply is not None
         assert body.reply.in_reply_to_tweet_id == "123456789"
         assert body.reply.auto_populate_reply_metadata is True
+
+    def test_over_long_tweet_is_rejected_before_posting(self, monkeypatch):
+        fake_client = _FakeClient()
+        cfg = replace(twitter_client.config, tweet_posting_enabled=True)
+        monkeypatch.setattr(twitter_client, "config", cfg)
+        monkeypatch.setattr(twitter_client, "_get_client", lambda: fake_client)
+
+        with pytest.raises(twitter_client.TweetTooLongError):
+            twitter_client.post_tweet("日本" * 71)
+
+        assert fake_client.posts.calls == []
+
+    def test_post_thread_chains_replies(self, monkeypatch):
+        fake_client = _FakeClient()
+        cfg = replace(twitter_client.config, tweet_posting_enabled=True)
+        monkeypatch.setattr(twitter_client, "config", cfg)
+        monkeypatch.setattr(twitter_client, "_get_client", lambda: fake_client)
+
+        post_ids = twitter_client.post_thread(["one", "two", "three"])
+
+        assert post_ids == ["12345", "12345", "12345"]
+        first, *replies = fake_client.posts.calls
+        assert first.reply is None
+        assert [body.reply.in_reply_to_tweet_id for body in replies] == ["12345", "12345"]
+
+    def test_post_thread_checks_every_part_first(self, monkeypatch):
+        fake_client = _FakeClient()
+        cfg = replace(twitter_client.config, tweet_posting_enabled=True)
+        monkeypatch.setattr(twitter_client, "config", cfg)
+        monkeypatch.setattr(twitter_client, "_get_client", lambda: fake_client)
+
+        with pytest.raises(twitter_client.TweetTooLongError):
+            twitter_client.post_thread(["fine", "x" * 281])
+
+        assert fake_client.posts.calls == []
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from bot import main, warmup
+
+
+async def _ok():
+    return None
+
+
+async def _nothing_to_do():
+    return False
+
+
+async def _fail():
+    raise RuntimeError("boom")
+
+
+async def _hang():
+    await asyncio.sleep(10)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_records_each_step_outcome():
+    await warmup.warm_up(
+        {"db": _ok, "firestore": _nothing_to_do, "x_client": _fail, "tunnel": _hang},
+        timeout=0.05,
+    )
+
+    status = warmup.readiness()
+    assert status["ready"] is True
+    assert {name: step["status"] for name, step in status["steps"].items()} == {
+        "db": warmup.OK,
+        "firestore": warmup.SKIPPED,
+        "x_client": warmup.FAILED,
+        "tunnel": warmup.TIMED_OUT,
+    }
+    assert all(step["seconds"] is not None for step in status["steps"].values())
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_waits_for_warm_up():
+    release = asyncio.Event()
+
+    async def _blocked():
+        await release.wait()
+
+    task = asyncio.create_task(warmup.warm_up({"db": _blocked}, timeout=5))
+    await asyncio.sleep(0)
+
+    response = await main.handle_ready()
+    assert response.status_code == 503
+    assert json.loads(response.body)["steps"]["db"]["status"] == warmup.PENDING
+
+    release.set()
+    await task
+    response = await main.handle_ready()
+    assert response.status_code == 200
+    body = json.loads(response.body)
+    assert body["ready"] is True
+    assert body["steps"]["db"]["status"] == warmup.OK
+
+
+@pytest.mark.asyncio
+async def test_polling_starts_after_warm_up():
+    order = []
+
+    async def _warm():
+        await asyncio.sleep(0.01)
+        order.append("warm")
+
+    async def _poll():
+        order.append("poll")
+
+    warmup_task = asyncio.create_task(_warm())
+    await main._after_warm_up(warmup_task, _poll)
+
+    assert order == ["warm", "poll"]
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    monkeypatch.setattr(main, "_chain", main.ChainTracker())
+    monkeypatch.setattr(main, "_block_cache", main.BlockEpochCache())
+    yield main._chain
+    main._chain_restored.set()
+
+
+@pytest.mark.asyncio
+async def test_blocks_wait_for_the_checkpoint_restore(monkeypatch, chain):
+    release = threading.Event()
+    processed = []
+
+    def _slow_checkpoint(_name):
+        release.wait(5)
+        return {"recent_blocks": [{"hash": "h100", "block_no": 100}], "last_processed_block_no": 100}
+
+    async def _fake_process_height(block_no):
+        processed.append(block_no)
+
+    monkeypatch.setattr(main, "get_checkpoint", _slow_checkpoint)
+    monkeypatch.setattr(main, "_process_height", _fake_process_height)
+    monkeypatch.setattr(main, "set_checkpoint", lambda *_args, **_kwargs: None)
+
+    main._chain_restored.clear()
+    restore = asyncio.create_task(main._restore_chain_state())
+    block = asyncio.create_task(main._process_block({"height": 100, "hash": "h100", "previous_block": "h99"}))
+    await asyncio.sleep(0.01)
+    assert not block.done()
+
+    release.set()
+    await restore
+    await block
+    # Block 100 was already processed before the restart, so the restored cursor skips it.
+    assert processed == []
+
+
+@pytest.mark.asyncio
+async def test_restore_finishing_after_the_timeout_is_dropped(monkeypatch, chain):
+    release = threading.Event()
+    returned = threading.Event()
+
+    def _slow_checkpoint(_name):
+        release.wait(5)
+        returned.set()
+        return {"last_processed_block_no": 100, "max_processed_block_no": 100}
+
+    monkeypatch.setattr(main, "get_checkpoint", _slow_checkpoint)
+
+    main._chain_restored.clear()
+    await warmup.warm_up({"firestore": main._restore_chain_state}, timeout=0.05)
+    assert warmup.readiness()["steps"]["firestore"]["status"] == warmup.TIMED_OUT
+    assert main._chain_restored.is_set()
+
+    chain.mark_processed(150)
+    release.set()
+    await asyncio.to_thread(returned.wait, 5)
+    await asyncio.sleep(0.01)
+    assert chain.last_processed_block_no == 150
@@ -0,0 +1,153 @@
+import pytest
+
+from bot.archive.validate import validate_document
+from bot.lazy import LazyModule
+from bot.metadata import witness
+from bot.twitter.formatter import _authors_line
+
+pytest.importorskip("pyld")
+ed25519 = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ed25519")
+serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+
+_CONTEXT = {
+    "@language": "en-us",
+    "CIP100": "https://github.com/cardano-foundation/CIPs/blob/master/CIP-0100/README.md#",
+    "body": {"@id": "CIP100:body", "@context": {"comment": "CIP100:comment"}},
+}
+
+
+def _signed(*names: str, tamper: bool = False) -> dict:
+    doc = {
+        "@context": _CONTEXT,
+        "hashAlgorithm": "blake2b-256",
+        "body": {"comment": "Looks constitutional to me"},
+        "authors": [],
+    }
+    message = witness.canonical_body_hash(doc)
+    assert message is not None
+    for name in names:
+        key = ed25519.Ed25519PrivateKey.generate()
+        public = key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        doc["authors"].append(
+            {
+                "name": name,
+                "witness": {
+                    "witnessAlgorithm": "ed25519",
+                    "publicKey": public.hex(),
+                    "signature": key.sign(message).hex(),
+                },
+            }
+        )
+    if tamper:
+        doc["body"]["comment"] = "Edited after signing"
+    return doc
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    witness.clear_verification_cache()
+    yield
+    witness.clear_verification_cache()
+
+
+class TestVerifyAuthors:
+    def test_valid_signatures(self):
+        results = witness.verify_authors(_signed("Alice", "Bob"))
+        assert [(r.name, r.status) for r in results] == [("Alice", witness.VERIFIED), ("Bob", witness.VERIFIED)]
+
+    def test_tampered_body_is_invalid(self):
+        (result,) = witness.verify_authors(_signed("Alice", tamper=True))
+        assert result.status == witness.INVALID
+
+    def test_malformed_key_is_invalid(self):
+        doc = _signed("Alice")
+        doc["authors"][0]["witness"]["publicKey"] = "zz"
+        (result,) = witness.verify_authors(doc)
+        assert result.status == witness.INVALID
+
+    def test_cip_0008_is_unsupported(self):
+        doc = _signed("Alice")
+        doc["authors"][0]["witness"]["witnessAlgorithm"] = "CIP-0008"
+        (result,) = witness.verify_authors(doc)
+        assert result.status == witness.UNSUPPORTED
+
+    def test_without_cryptography_witnesses_are_unverifiable(self, monkeypatch):
+        doc = _signed("Alice")
+        monkeypatch.setattr(witness, "ed25519", LazyModule("cryptography_is_not_installed"))
+        (result,) = witness.verify_authors(doc)
+        assert result.status == witness.UNVERIFIABLE
+
+    def test_missing_witness_is_unsigned(self):
+        (result,) = witness.verify_authors({"@context": _CONTEXT, "body": {}, "authors": [{"name": "Alice"}]})
+        assert result.status == witness.UNSIGNED
+
+    def test_remote_context_is_not_fetched(self):
+        doc = _signed("Alice")
+        doc["@context"] = "https://example.com/remote-context.jsonld"
+        (result,) = witness.verify_authors(doc)
+        assert result.status == witness.UNVERIFIABLE
+
+    def test_no_authors(self):
+        assert witness.verify_authors(None) == ()
+        assert witness.verify_authors({"body": {}}) == ()
+
+    def test_canonicalises_once_per_document(self, monkeypatch):
+        doc = _signed("Alice", "Bob")
+        calls = []
+        original = witness.canonical_body_hash
+        monkeypatch.setattr(witness, "canonical_body_hash", lambda m: calls.append(1) or original(m))
+
+        first = witness.verify_authors(doc)
+        assert witness.verify_authors(dict(doc)) == first
+        assert len(calls) == 1
+
+
+def _key(doc: dict, index: int = 0) -> str:
+    return doc["authors"][index]["witness"]["publicKey"]
+
+
+class TestTrustedAuthors:
+    def test_signature_under_a_key_bound_to_the_name_is_trusted(self):
+        doc = _signed("Alice", "Bob")
+        assert witness.trusted_author_indexes(doc, {_key(doc, 1): "bob"}) == {1}
+
+    def test_self_signed_name_is_not_trusted(self):
+        doc = _signed("Alice")
+        assert witness.trusted_author_indexes(doc, {"00" * 32: "Alice"}) == set()
+
+    def test_bound_key_signing_under_another_name_is_not_trusted(self):
+        doc = _signed("Mallory")
+        assert witness.trusted_author_indexes(doc, {_key(doc): "Alice"}) == set()
+
+    def test_invalid_signature_under_a_bound_key_is_not_trusted(self):
+        doc = _signed("Alice", tamper=True)
+        assert witness.trusted_author_indexes(doc, {_key(doc): "Alice"}) == set()
+
+    def test_untrusted_documents_are_never_canonicalised(self, monkeypatch):
+        doc = _signed("Alice")
+        monkeypatch.setattr(witness, "canonical_body_hash", lambda _m: pytest.fail("canonicalised"))
+        assert witness.trusted_author_indexes(doc, {"00" * 32: "Alice"}) == set()
+        assert witness.trusted_author_indexes(doc, {}) == set()
+
+
+class TestWitnessConsumers:
+    def test_formatter_marks_authors_signed_with_their_profile_key(self, monkeypatch):
+        doc = _signed("Alice")
+        doc["authors"].append({"name": "Bob"})
+        monkeypatch.setattr("bot.twitter.formatter.trusted_witness_keys", lambda: {_key(doc): "Alice"})
+        assert _authors_line(doc) == "Authors: Alice ✓, Bob\n"
+
+    def test_formatter_marks_by_position_not_name(self, monkeypatch):
+        doc = _signed("Alice")
+        doc["authors"].append({"name": "Alice"})  # unsigned namesake
+        monkeypatch.setattr("bot.twitter.formatter.trusted_witness_keys", lambda: {_key(doc): "Alice"})
+        assert _authors_line(doc) == "Authors: Alice ✓, Alice\n"
+
+    def test_formatter_ignores_self_signed_authors(self, monkeypatch):
+        monkeypatch.setattr("bot.twitter.formatter.trusted_witness_keys", dict)
+        assert _authors_line(_signed("Alice")) == "Authors: Alice\n"
+
+    def test_bulk_validator_warns_on_invalid_witness(self):
+        codes = {f.code for f in validate_document("aa_0/v1", _signed("Alice", tamper=True))}
+        assert "witness_invalid" in codes
+        assert not {f.code for f in validate_document("aa_0/v1", _signed("Alice"))} & {"witness_invalid"}